@@ -0,0 +1,252 @@
+"""
+Scaling benchmarks on synthetic data.
+
+Times the backtester, every indicator in `features.py`, the metrics, both strategies and
+the model fit/forecast paths across bar counts and universe sizes, recording wall time
+(best of `--repeat` runs) and peak traced memory for each case. The ``startup`` cases time
+fresh interpreter processes, i.e. the cold-start cost of the package and CLI.
+
+    python benchmarks/run.py --profile quick --output baseline.json
+    python benchmarks/run.py --profile quick --compare baseline.json --threshold 0.25
+
+With ``--compare`` the exit status is 1 when any case is slower (or uses more memory)
+than the baseline by more than the threshold, so the script can gate a nightly job.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from quantfinlab import features, metrics
+from quantfinlab.backtest import apply_exits, backtest_panel, backtest_signals
+from quantfinlab.strategies.mean_reversion import mean_reversion
+from quantfinlab.strategies.momentum import momentum_long_only
+
+# bars: single-series sizes; assets: universe sizes for the panel cases, which are
+# skipped once bars * assets exceeds max_cells; model_bars: sizes for the model fits.
+PROFILES = {
+    "quick": dict(bars=[1_000, 10_000, 100_000], assets=[1, 100], max_cells=1_000_000,
+                  model_bars=[1_000]),
+    "full": dict(bars=[1_000, 10_000, 100_000, 1_000_000, 10_000_000],
+                 assets=[1, 100, 1_000, 5_000], max_cells=50_000_000,
+                 model_bars=[1_000, 10_000]),
+}
+
+Case = Tuple[str, Callable[[], object]]
+
+
+def synthetic_prices(n_bars: int, n_assets: int = 1, seed: int = 0) -> pd.DataFrame:
+    """Geometric random walks on a minute index (long enough for 1e7 bars)."""
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2000-01-03", periods=n_bars, freq="min")
+    steps = rng.normal(0.0, 0.01, (n_bars, n_assets))
+    steps[0] = 0.0
+    prices = 100.0 * np.exp(np.cumsum(steps, axis=0))
+    return pd.DataFrame(prices, index=idx, columns=[f"A{i}" for i in range(n_assets)])
+
+
+STARTUP = {
+    "startup.import_quantfinlab": ["-c", "import quantfinlab"],
+    "startup.cli_help": ["-m", "quantfinlab", "--help"],
+    "startup.backtest_imports": ["-c", "import quantfinlab.cli, quantfinlab.data, quantfinlab.backtest, "
+                                       "quantfinlab.strategies.momentum"],
+    "startup.sweep_imports": ["-c", "import quantfinlab.cli, quantfinlab.data, quantfinlab.sweep"],
+    "startup.lstm_imports": ["-c", "import quantfinlab.models.lstm"],
+}
+
+
+def startup_cases() -> Iterator[Case]:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(p for p in sys.path if p)}
+    for name, args in STARTUP.items():
+        cmd = [sys.executable, *args]
+        yield name, lambda cmd=cmd: subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL)
+
+
+def series_cases(n: int) -> Iterator[Case]:
+    price = synthetic_prices(n)["A0"]
+    ret = features.log_returns(price)
+    signal = momentum_long_only(price, lookback=50, vol_target=0.15)
+    bt = backtest_signals(price, signal)
+    tag = f"[bars={n}]"
+
+    yield f"features.log_returns{tag}", lambda: features.log_returns(price)
+    yield f"features.simple_returns{tag}", lambda: features.simple_returns(price)
+    yield f"features.sma{tag}", lambda: features.sma(price, 50)
+    yield f"features.ema{tag}", lambda: features.ema(price, 50)
+    yield f"features.rolling_vol{tag}", lambda: features.rolling_vol(ret, 20)
+    yield f"features.zscore{tag}", lambda: features.zscore(price, 20)
+    yield f"features.rsi{tag}", lambda: features.rsi(price, 14)
+    yield f"strategies.momentum_long_only{tag}", lambda: momentum_long_only(price, 50, 0.15)
+    yield f"strategies.mean_reversion{tag}", lambda: mean_reversion(price, 20, 1.0, 0.25)
+    yield f"backtest.backtest_signals{tag}", lambda: backtest_signals(price, signal)
+    yield f"backtest.summary{tag}", bt.summary
+    yield f"metrics.sharpe_ratio{tag}", lambda: metrics.sharpe_ratio(bt.returns)
+    yield f"metrics.sortino_ratio{tag}", lambda: metrics.sortino_ratio(bt.returns)
+    yield f"metrics.max_drawdown{tag}", lambda: metrics.max_drawdown(bt.equity_curve)
+    yield f"metrics.cagr{tag}", lambda: metrics.cagr(bt.equity_curve)
+
+
+def panel_cases(n: int, k: int) -> Iterator[Case]:
+    prices = synthetic_prices(n, k)
+    rng = np.random.default_rng(1)
+    weights = pd.DataFrame(rng.uniform(-1, 1, prices.shape) / k, index=prices.index,
+                           columns=prices.columns)
+    returns = prices.pct_change().fillna(0.0).to_numpy()
+    tag = f"[bars={n},assets={k}]"
+
+    yield f"backtest.backtest_panel{tag}", lambda: backtest_panel(prices, weights, allow_short=True)
+    yield f"backtest.apply_exits{tag}", lambda: apply_exits(prices, weights, 0.05, 0.1, 0.03)
+    yield f"metrics.summary_stats{tag}", lambda: metrics.summary_stats(returns)
+    yield f"metrics.rolling_stats{tag}", lambda: metrics.rolling_stats(returns, (21, 63, 252))
+
+
+def model_cases(n: int) -> Iterator[Case]:
+    ret = features.log_returns(synthetic_prices(n)["A0"])
+    tag = f"[bars={n}]"
+
+    def arima():
+        from quantfinlab.models.arima import ArimaForecaster
+
+        return ArimaForecaster(order=(1, 0, 1)).fit(ret).forecast(5)
+
+    def garch():
+        from quantfinlab.models.garch import GarchVolModel
+
+        return GarchVolModel().fit(ret).forecast_vol(5)
+
+    def lstm():
+        from quantfinlab.models.lstm import LSTMConfig, forecast_one, train_lstm
+
+        model, _ = train_lstm(ret, LSTMConfig(epochs=1, hidden_size=16))
+        return forecast_one(model, ret)
+
+    def lstm_walk_forward():
+        from quantfinlab.models.lstm import LSTMConfig, walk_forward_lstm
+
+        cfg = LSTMConfig(epochs=1, hidden_size=16, val_frac=0.2, finetune_epochs=1)
+        return walk_forward_lstm(ret, cfg, min_train=len(ret) // 2, refit_every=21)
+
+    yield f"models.arima_fit_forecast{tag}", arima
+    yield f"models.garch_fit_forecast{tag}", garch
+    yield f"models.lstm_train_forecast{tag}", lstm
+    yield f"models.lstm_walk_forward{tag}", lstm_walk_forward
+
+
+def build_cases(profile: dict) -> Iterator[Case]:
+    yield from startup_cases()
+    for n in profile["bars"]:
+        yield from series_cases(n)
+        for k in profile["assets"]:
+            if n * k <= profile["max_cells"]:
+                yield from panel_cases(n, k)
+    for n in profile["model_bars"]:
+        yield from model_cases(n)
+
+
+def measure(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Best-of-`repeat` wall time, then one traced run for the peak allocation."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(times), "peak_mb": peak / 2**20}
+
+
+def run(profile: str, repeat: int = 3, only: str = "") -> dict:
+    results: Dict[str, Dict[str, float]] = {}
+    for name, fn in build_cases(PROFILES[profile]):
+        if only and only not in name:
+            continue
+        try:
+            results[name] = measure(fn, repeat)
+        except ImportError as exc:  # optional model dependency not installed
+            print(f"{name:<60} skipped ({exc})")
+            continue
+        r = results[name]
+        print(f"{name:<60} {r['seconds'] * 1e3:>10.2f} ms {r['peak_mb']:>10.1f} MB")
+    return {
+        "meta": {
+            "profile": profile,
+            "repeat": repeat,
+            "created": dt.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_seconds: float = 1e-3) -> List[str]:
+    """
+    Cases whose time or peak memory grew by more than `threshold` (a fraction) against the
+    baseline. Timings under `min_seconds` in both runs are too noisy to judge and are skipped.
+    """
+    regressions = []
+    base = baseline["results"]
+    for name, now in current["results"].items():
+        old = base.get(name)
+        if old is None:
+            continue
+        if max(now["seconds"], old["seconds"]) >= min_seconds:
+            change = now["seconds"] / old["seconds"] - 1 if old["seconds"] else np.inf
+            if change > threshold:
+                regressions.append(f"{name}: time {old['seconds']:.4f}s -> {now['seconds']:.4f}s "
+                                   f"(+{change:.0%})")
+        if old["peak_mb"] > 0 and now["peak_mb"] / old["peak_mb"] - 1 > threshold:
+            regressions.append(f"{name}: peak {old['peak_mb']:.1f}MB -> {now['peak_mb']:.1f}MB")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", type=str, default="", help="run cases whose name contains this")
+    parser.add_argument("--output", type=str, default=None, help="write results as JSON")
+    parser.add_argument("--compare", type=str, default=None, help="baseline JSON to compare to")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed fractional slowdown before a case is flagged")
+    args = parser.parse_args(argv)
+
+    current = run(args.profile, repeat=args.repeat, only=args.only)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,25 @@
 """
 quantfinlab — compact financial data analysis & backtesting lab.
+
+Submodules are imported on first attribute access (PEP 562), so ``import quantfinlab``
+stays cheap and heavy dependencies (torch, statsmodels, arch, matplotlib, plotly) are only
+loaded by the code paths that use them.
 """
-__all__ = ["data", "features", "plotting", "backtest", "metrics", "models", "strategies"]
+import importlib
+
+__all__ = [
+    "data", "features", "plotting", "backtest", "metrics", "models", "strategies",
+    "store", "fetchers", "online", "sweep", "instrument", "cache", "live", "bootstrap", "risk",
+    "panel", "cli",
+]
 __version__ = "0.1.0"
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
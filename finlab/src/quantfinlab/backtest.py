@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import os
+import pathlib
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Sequence, Union
 
 import numpy as np
 import pandas as pd
 
-from .metrics import sharpe_ratio, sortino_ratio, max_drawdown, cagr, calmar_ratio, hit_ratio
+from .metrics import summary_stats
 
 
 @dataclass
@@ -17,14 +19,36 @@ class BacktestResult:
     costs: pd.Series
 
     def summary(self) -> dict:
-        return {
-            "CAGR": float(cagr(self.equity_curve)),
-            "Sharpe": float(sharpe_ratio(self.returns)),
-            "Sortino": float(sortino_ratio(self.returns)),
-            "MaxDrawdown": float(max_drawdown(self.equity_curve)),
-            "Calmar": float(calmar_ratio(self.returns, self.equity_curve)),
-            "HitRatio": float(hit_ratio(self.returns)),
-        }
+        stats = summary_stats(self.returns, self.equity_curve)
+        return {name: float(values[0]) for name, values in stats.items()}
+
+
+@dataclass
+class PanelBacktestResult(BacktestResult):
+    """
+    Portfolio-level `BacktestResult` plus the per-asset detail of a panel backtest.
+
+    `returns`, `equity_curve` and `costs` are portfolio Series; `positions` and
+    `asset_returns` are (dates x assets) DataFrames, or None when the backtest was run
+    with ``store_assets=False``.
+    """
+    asset_returns: Optional[pd.DataFrame]
+    gross_exposure: pd.Series
+    net_exposure: pd.Series
+    turnover: pd.Series
+    cost_rate: float = 0.0
+
+    def asset(self, name) -> BacktestResult:
+        """Single-asset view, as `backtest_signals` would report it for this column."""
+        if self.asset_returns is None:
+            raise RuntimeError("Per-asset results were not stored (store_assets=False).")
+        ret = self.asset_returns[name]
+        pos = self.positions[name]
+        cost = pos.diff().abs().fillna(pos.abs()) * self.cost_rate
+        return BacktestResult(returns=ret.rename("strategy_return"),
+                              equity_curve=(1 + ret).cumprod().rename("equity"),
+                              positions=pos.rename("position"),
+                              costs=cost.rename("cost"))
 
 
 def backtest_signals(
@@ -34,6 +58,9 @@ def backtest_signals(
     slippage_bps: float = 2.0,
     allow_short: bool = False,
     position_cap: float = 1.0,
+    stop_loss: Optional[float] = None,
+    take_profit: Optional[float] = None,
+    trailing_stop: Optional[float] = None,
 ) -> BacktestResult:
     """
     Vectorized backtest for a single asset and daily signals.
@@ -52,6 +79,8 @@ def backtest_signals(
         If False, negative signals are clipped to 0 (long-only).
     position_cap : float
         Cap absolute position size.
+    stop_loss, take_profit, trailing_stop : float, optional
+        Path-dependent exits as fractions of the entry price; see `apply_exits`.
 
     Returns
     -------
@@ -65,6 +94,8 @@ def backtest_signals(
         sig = sig.clip(lower=0.0, upper=position_cap)
     else:
         sig = sig.clip(lower=-position_cap, upper=position_cap)
+    if stop_loss is not None or take_profit is not None or trailing_stop is not None:
+        sig = apply_exits(price, sig, stop_loss, take_profit, trailing_stop)
 
     trades = sig.diff().abs().fillna(sig.abs())
     # Convert bps costs to decimal per trade
@@ -78,3 +109,420 @@ def backtest_signals(
                           equity_curve=equity.rename("equity"),
                           positions=sig.rename("position"),
                           costs=cost.rename("cost"))
+
+
+_PANEL_BLOCK_ELEMENTS = 1 << 21
+
+
+def _ffill_rows(a: np.ndarray, seed: np.ndarray) -> None:
+    # In-place forward fill down axis 0, using `seed` as the row before the block.
+    mask = np.isnan(a)
+    if not mask.any():
+        return
+    n, m = a.shape
+    src = np.where(mask, 0, np.arange(1, n + 1)[:, None])
+    np.maximum.accumulate(src, axis=0, out=src)
+    a[...] = np.vstack([seed[None, :], a])[src, np.arange(m)]
+
+
+Level = Optional[Union[float, Sequence[float], np.ndarray]]
+
+
+def _levels(level: Level, k: int) -> np.ndarray:
+    # One exit level per column; None / NaN switches the rule off for that column.
+    if level is None:
+        return np.full(k, np.nan)
+    arr = np.array([np.nan if v is None else v for v in np.atleast_1d(level)], dtype=np.float64)
+    arr = np.broadcast_to(arr, (k,))
+    if np.any(arr[~np.isnan(arr)] <= 0):
+        raise ValueError("Exit levels must be positive fractions, e.g. 0.05 for 5%.")
+    return arr
+
+
+def _segment_cummax(x: np.ndarray, age: np.ndarray) -> np.ndarray:
+    # Running max down axis 0 that restarts with every episode (`age` is each cell's row
+    # offset from its episode start). Doubling scan: after the step with shift s every
+    # cell covers the last 2s rows of its episode, so log2(longest episode) array passes.
+    out = x.copy()
+    span = int(age.max()) if age.size else 0
+    shift = 1
+    while shift <= span:
+        prev = np.where(age[shift:] >= shift, out[:-shift], -np.inf)
+        np.fmax(out[shift:], prev, out=out[shift:])
+        shift *= 2
+    return out
+
+
+def _exit_positions(price: np.ndarray, pos: np.ndarray, stop_loss: np.ndarray,
+                    take_profit: np.ndarray, trailing_stop: np.ndarray) -> np.ndarray:
+    # (dates x columns) forward-filled prices and held positions -> positions with exits.
+    side = np.sign(pos)
+    rows = np.arange(len(pos))[:, None]
+    starts = np.ones(pos.shape, dtype=bool)
+    starts[1:] = side[1:] != side[:-1]
+    first = np.where(starts, rows, 0)
+    np.maximum.accumulate(first, axis=0, out=first)
+    entry = np.take_along_axis(price, first, axis=0)
+    hit = np.zeros(pos.shape, dtype=bool)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        gain = side * (price / entry - 1)  # return of the open trade
+        if not np.isnan(stop_loss).all():
+            hit |= gain <= -stop_loss
+        if not np.isnan(take_profit).all():
+            hit |= gain >= take_profit
+        if not np.isnan(trailing_stop).all():
+            # best price since entry: the running max of price (long) or -price (short)
+            best = side * _segment_cummax(side * price, rows - first)
+            hit |= side * (price / best - 1) <= -trailing_stop
+    hit &= side != 0
+    # flat from the first hit of an episode until the episode ends
+    count = np.cumsum(hit, axis=0)
+    before = np.take_along_axis(count - hit, first, axis=0)
+    return np.where(count > before, 0.0, pos)
+
+
+def apply_exits(
+    price,
+    signal,
+    stop_loss: Level = None,
+    take_profit: Level = None,
+    trailing_stop: Level = None,
+):
+    """
+    Add stop-loss, take-profit and trailing-stop exits to a position signal.
+
+    A trade is a run of bars whose position has the same sign; its entry price is the
+    price on its first bar. On the first later bar where the trade's return reaches
+    ``-stop_loss`` or ``take_profit``, or the price falls `trailing_stop` below its best
+    level since entry (rises above it, for shorts), the position goes to 0 and stays
+    there until the signal itself changes sign or goes flat, which starts a new trade.
+    Like the signals, exits are decided on the bar's price and take effect from the
+    next bar's return; the exit trade pays the usual costs in the backtest.
+
+    No Python loop over bars: entry prices are forward-filled per trade and the running
+    best price comes from a segment-wise cumulative max over trades, so whole panels, and
+    grids of exit levels laid out as columns, are handled in a few array passes.
+
+    Parameters
+    ----------
+    price : pd.Series | pd.DataFrame | np.ndarray
+        Prices, 1-D or (dates x columns); NaNs are forward-filled.
+    signal : same shape (labels are aligned for pandas inputs)
+        Positions, forward-filled with leading NaNs as 0, as the backtests hold them.
+    stop_loss, take_profit, trailing_stop : float | sequence of float, optional
+        Exit levels as fractions (0.05 = 5%), one for all columns or one per column.
+        None (or NaN for a column) disables the rule.
+
+    Returns
+    -------
+    The positions, shaped like `signal` (float64).
+    """
+    if isinstance(signal, (pd.Series, pd.DataFrame)) and isinstance(price, type(signal)):
+        signal = signal.reindex(price.index) if isinstance(signal, pd.Series) \
+            else signal.reindex(index=price.index, columns=price.columns)
+    p = np.array(price, dtype=np.float64)
+    pos = np.array(signal, dtype=np.float64)
+    if p.shape != pos.shape or p.ndim not in (1, 2):
+        raise ValueError(f"price and signal must be 1-D or 2-D with equal shapes, got "
+                         f"{p.shape} and {pos.shape}.")
+    p, pos = p.reshape(len(p), -1), pos.reshape(len(pos), -1)
+    k = pos.shape[1]
+    _ffill_rows(p, np.full(k, np.nan))
+    _ffill_rows(pos, np.zeros(k))
+    pos = np.nan_to_num(pos)
+    out = _exit_positions(p, pos, _levels(stop_loss, k), _levels(take_profit, k),
+                          _levels(trailing_stop, k))
+    if isinstance(signal, pd.Series):
+        return pd.Series(out[:, 0], index=signal.index, name=signal.name)
+    if isinstance(signal, pd.DataFrame):
+        return pd.DataFrame(out, index=signal.index, columns=signal.columns)
+    return out[:, 0] if np.ndim(signal) == 1 else out
+
+
+def _panel_block(price: np.ndarray, weight: np.ndarray, last_price: np.ndarray,
+                 last_weight: np.ndarray, lo: float, hi: float, rate: float):
+    """
+    Backtest one block of rows. `price` and `weight` are private float64 copies that are
+    modified in place; `last_price`/`last_weight` carry the state of the row before.
+    Returns (weight, asset_ret, trades) for the block.
+    """
+    _ffill_rows(price, last_price)
+    _ffill_rows(weight, last_weight)
+    np.clip(weight, lo, hi, out=weight)
+
+    prev_price = np.vstack([last_price[None, :], price[:-1]])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret = price / prev_price - 1
+    ret[~np.isfinite(ret)] = 0.0
+
+    prev_weight = np.vstack([last_weight[None, :], weight[:-1]])
+    trades = np.abs(weight - prev_weight)
+    asset_ret = prev_weight * ret - trades * rate
+    return weight, asset_ret, trades
+
+
+def backtest_panel(
+    prices: Union[pd.DataFrame, np.ndarray],
+    weights: Union[pd.DataFrame, np.ndarray],
+    fee_bps: float = 1.0,
+    slippage_bps: float = 2.0,
+    allow_short: bool = False,
+    position_cap: float = 1.0,
+    store_assets: bool = True,
+    block_size: Optional[int] = None,
+    stop_loss: Level = None,
+    take_profit: Level = None,
+    trailing_stop: Level = None,
+) -> PanelBacktestResult:
+    """
+    Vectorized backtest for a (dates x assets) panel of prices and target weights.
+
+    Every asset follows the same rules as `backtest_signals`: weights are forward-filled,
+    clipped, applied to the next bar's simple return, and charged
+    ``|change in weight| * (fee_bps + slippage_bps) / 1e4``. The portfolio return is the
+    sum of the per-asset contributions, i.e. weights are fractions of portfolio equity.
+
+    Parameters
+    ----------
+    prices : pd.DataFrame | np.ndarray
+        (dates x assets) prices. NaNs are forward-filled; an asset earns 0 until its
+        first valid price.
+    weights : pd.DataFrame | np.ndarray
+        Target weights with the same shape (arrays) or labels (DataFrames, which are
+        aligned to `prices`). NaNs are forward-filled, leading NaNs treated as 0.
+    fee_bps, slippage_bps, allow_short, position_cap
+        As in `backtest_signals`; `position_cap` caps each asset's absolute weight.
+    store_assets : bool
+        Keep the (dates x assets) positions and per-asset returns. Set False to keep
+        memory at the inputs plus a few date-length vectors.
+    block_size : int, optional
+        Rows processed per block; defaults to roughly 2M cells per block.
+    stop_loss, take_profit, trailing_stop : float | sequence of float, optional
+        Path-dependent exits per asset (one level, or one per asset); see `apply_exits`.
+        Trades span blocks, so the exits are resolved on the full arrays first.
+
+    Returns
+    -------
+    PanelBacktestResult
+    """
+    if isinstance(prices, pd.DataFrame):
+        index, columns = prices.index, prices.columns
+        if isinstance(weights, pd.DataFrame):
+            weights = weights.reindex(index=index, columns=columns)
+        p_arr = prices.to_numpy(dtype=np.float64)
+    else:
+        p_arr = np.asarray(prices, dtype=np.float64)
+        index = pd.RangeIndex(p_arr.shape[0])
+        columns = pd.RangeIndex(p_arr.shape[1])
+    w_arr = weights.to_numpy(dtype=np.float64) if isinstance(weights, pd.DataFrame) \
+        else np.asarray(weights, dtype=np.float64)
+    if p_arr.ndim != 2 or p_arr.shape != w_arr.shape:
+        raise ValueError(f"prices and weights must be 2-D with equal shapes, got "
+                         f"{p_arr.shape} and {w_arr.shape}.")
+
+    n, m = p_arr.shape
+    if stop_loss is not None or take_profit is not None or trailing_stop is not None:
+        w_arr = apply_exits(p_arr, w_arr, stop_loss, take_profit, trailing_stop)
+    lo = -position_cap if allow_short else 0.0
+    rate = (fee_bps + slippage_bps) / 1e4
+    rows = block_size or max(1, _PANEL_BLOCK_ELEMENTS // max(m, 1))
+
+    port_ret = np.empty(n)
+    port_cost = np.empty(n)
+    gross = np.empty(n)
+    net = np.empty(n)
+    turnover = np.empty(n)
+    positions = np.empty((n, m)) if store_assets else None
+    asset_returns = np.empty((n, m)) if store_assets else None
+
+    last_price = np.full(m, np.nan)
+    last_weight = np.zeros(m)
+    for start in range(0, n, rows):
+        stop = min(start + rows, n)
+        p_blk, w_blk = p_arr[start:stop].copy(), w_arr[start:stop].copy()
+        w, r, trades = _panel_block(p_blk, w_blk, last_price, last_weight, lo, position_cap, rate)
+        port_ret[start:stop] = r.sum(axis=1)
+        turnover[start:stop] = trades.sum(axis=1)
+        port_cost[start:stop] = turnover[start:stop] * rate
+        gross[start:stop] = np.abs(w).sum(axis=1)
+        net[start:stop] = w.sum(axis=1)
+        if store_assets:
+            positions[start:stop] = w
+            asset_returns[start:stop] = r
+        last_price, last_weight = p_blk[-1].copy(), w[-1].copy()
+
+    equity = np.cumprod(1 + port_ret)
+    return PanelBacktestResult(
+        returns=pd.Series(port_ret, index=index, name="strategy_return"),
+        equity_curve=pd.Series(equity, index=index, name="equity"),
+        positions=None if positions is None else pd.DataFrame(positions, index=index, columns=columns),
+        costs=pd.Series(port_cost, index=index, name="cost"),
+        asset_returns=None if asset_returns is None
+        else pd.DataFrame(asset_returns, index=index, columns=columns),
+        gross_exposure=pd.Series(gross, index=index, name="gross_exposure"),
+        net_exposure=pd.Series(net, index=index, name="net_exposure"),
+        turnover=pd.Series(turnover, index=index, name="turnover"),
+        cost_rate=rate,
+    )
+
+
+@dataclass
+class ChunkedBacktestResult:
+    """
+    Output of `backtest_chunked`: plain arrays (or `.npy` memory maps when an output
+    directory was given) with one entry per processed bar.
+
+    `positions` is the signal actually held (1-D runs) or the (bars x assets) weights
+    when `store_assets` was set, otherwise None. `drawdown` is equity over its running
+    peak minus 1, so ``drawdown.min() == max_drawdown``.
+    """
+    returns: np.ndarray
+    equity_curve: np.ndarray
+    costs: np.ndarray
+    drawdown: np.ndarray
+    positions: Optional[np.ndarray]
+    max_drawdown: float
+
+    def summary(self) -> dict:
+        stats = summary_stats(self.returns, self.equity_curve)
+        return {name: float(values[0]) for name, values in stats.items()}
+
+
+def _signal_block(price: np.ndarray, sig: np.ndarray, last_price: float, last_sig: float,
+                  prev_pos: float, lo: float, hi: float, rate: float):
+    # backtest_signals on one block of already NaN-price-free rows; see backtest_chunked.
+    sig = sig.copy()
+    _ffill_rows(sig[:, None], np.array([last_sig]))
+    held = np.where(np.isnan(sig), 0.0, sig).clip(lo, hi)
+    prev_price = np.concatenate([[last_price], price[:-1]])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret = price / prev_price - 1
+    ret[np.isnan(ret)] = 0.0
+    prev = np.concatenate([[prev_pos], held[:-1]])
+    cost = np.abs(held - prev) * rate
+    return sig, held, prev * ret - cost, cost
+
+
+def _output(out_dir: Optional[pathlib.Path], name: str, shape) -> np.ndarray:
+    if out_dir is None:
+        return np.empty(shape)
+    return np.lib.format.open_memmap(out_dir / f"{name}.npy", mode="w+", dtype=np.float64,
+                                     shape=shape)
+
+
+def backtest_chunked(
+    prices: np.ndarray,
+    signals: np.ndarray,
+    fee_bps: float = 1.0,
+    slippage_bps: float = 2.0,
+    allow_short: bool = False,
+    position_cap: float = 1.0,
+    block_size: int = 1 << 16,
+    out_dir: Optional[Union[str, os.PathLike]] = None,
+    store_assets: bool = False,
+) -> ChunkedBacktestResult:
+    """
+    Out-of-core backtest that streams price and signal arrays through fixed-size blocks.
+
+    Inputs are only ever sliced one block at a time, so they can be `np.memmap`s (e.g.
+    `PriceStore.column`, or ``np.load(path, mmap_mode="r")``) far larger than memory.
+    The previous price, signal and position, the equity level and the drawdown peak are
+    carried across block boundaries, and equity is continued by multiplying from the
+    carried level, so the results are bit-identical to the in-memory engines:
+
+    - 1-D inputs follow `backtest_signals` (bars with a NaN price are dropped first);
+    - 2-D (bars x assets) inputs follow `backtest_panel`, with `signals` as weights.
+
+    Parameters
+    ----------
+    prices, signals : np.ndarray
+        Equal-length 1-D arrays, or equal-shape 2-D arrays.
+    fee_bps, slippage_bps, allow_short, position_cap
+        As in `backtest_signals`.
+    block_size : int
+        Bars per block; working memory is a few block-sized temporaries per asset.
+    out_dir : str | PathLike, optional
+        Write the outputs as ``returns.npy``, ``equity.npy``, ``costs.npy``,
+        ``drawdown.npy`` (and ``positions.npy``) memory maps in this directory instead of
+        keeping them in memory.
+    store_assets : bool
+        2-D only: also keep the (bars x assets) weights.
+
+    Returns
+    -------
+    ChunkedBacktestResult
+    """
+    if np.ndim(prices) not in (1, 2) or np.shape(prices) != np.shape(signals):
+        raise ValueError(f"prices and signals must be 1-D or 2-D with equal shapes, got "
+                         f"{np.shape(prices)} and {np.shape(signals)}.")
+    panel = np.ndim(prices) == 2
+    n = len(prices)
+    lo = -position_cap if allow_short else 0.0
+    rate = (fee_bps + slippage_bps) / 1e4
+    out_path = None
+    if out_dir is not None:
+        out_path = pathlib.Path(out_dir)
+        out_path.mkdir(parents=True, exist_ok=True)
+
+    if panel:
+        rows, m = n, prices.shape[1]
+    else:
+        rows = sum(int(np.count_nonzero(~np.isnan(prices[i:i + block_size])))
+                   for i in range(0, n, block_size))
+    returns = _output(out_path, "returns", (rows,))
+    equity = _output(out_path, "equity", (rows,))
+    costs = _output(out_path, "costs", (rows,))
+    drawdown = _output(out_path, "drawdown", (rows,))
+    positions = None
+    if not panel:
+        positions = _output(out_path, "positions", (rows,))
+    elif store_assets:
+        positions = _output(out_path, "positions", (rows, m))
+
+    if panel:
+        last_price, last_weight = np.full(m, np.nan), np.zeros(m)
+    else:
+        last_price, last_sig, prev_pos = np.nan, np.nan, 0.0
+    level = np.ones(1)
+    peak = -np.inf
+    max_dd = np.nan
+    at = 0
+    for start in range(0, n, block_size):
+        p_blk = np.array(prices[start:start + block_size], dtype=np.float64)
+        s_blk = np.array(signals[start:start + block_size], dtype=np.float64)
+        if panel:
+            w, r, trades = _panel_block(p_blk, s_blk, last_price, last_weight, lo, position_cap, rate)
+            ret, cost = r.sum(axis=1), trades.sum(axis=1) * rate
+            held = w
+            last_price, last_weight = p_blk[-1].copy(), w[-1].copy()
+        else:
+            keep = ~np.isnan(p_blk)
+            p_blk, s_blk = p_blk[keep], s_blk[keep]
+            if not len(p_blk):
+                continue
+            s_ff, held, ret, cost = _signal_block(p_blk, s_blk, last_price, last_sig, prev_pos,
+                                                  lo, position_cap, rate)
+            last_price, last_sig, prev_pos = p_blk[-1], s_ff[-1], held[-1]
+
+        k = len(ret)
+        eq = np.cumprod(np.concatenate([level, 1 + ret]))[1:]
+        level = eq[-1:]
+        run_peak = np.maximum.accumulate(np.maximum(eq, peak))
+        peak = run_peak[-1]
+        dd = eq / run_peak - 1.0
+        max_dd = np.fmin(max_dd, dd.min())
+
+        returns[at:at + k] = ret
+        equity[at:at + k] = eq
+        costs[at:at + k] = cost
+        drawdown[at:at + k] = dd
+        if positions is not None:
+            positions[at:at + k] = held
+        at += k
+
+    for arr in (returns, equity, costs, drawdown, positions):
+        if isinstance(arr, np.memmap):
+            arr.flush()
+    return ChunkedBacktestResult(returns=returns, equity_curve=equity, costs=costs,
+                                 drawdown=drawdown, positions=positions,
+                                 max_drawdown=float(max_dd))
@@ -0,0 +1,211 @@
+"""
+Bootstrap confidence intervals for backtest metrics.
+
+Resamples are drawn as index arrays (i.i.d., moving-block or stationary bootstrap), the
+returns are gathered for a whole chunk of resamples at once, and every `summary_stats`
+metric is evaluated for all of them in one vectorized pass. Chunks are sized to a memory
+cap, carry their own child seed (so results do not depend on `n_jobs`) and can run on a
+process pool. Several strategies (columns) are resampled with the same indices, which
+keeps their dependence intact.
+"""
+from __future__ import annotations
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .metrics import SUMMARY_METRICS, summary_stats
+
+METHODS = ("stationary", "block", "iid")
+
+
+def bootstrap_indices(
+    n: int,
+    n_samples: int,
+    method: str = "stationary",
+    block_size: float = 20,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    (n_samples, n) array of resampled positions in ``range(n)``.
+
+    - ``"iid"``: independent draws;
+    - ``"block"``: circular moving blocks of exactly `block_size` bars;
+    - ``"stationary"``: Politis-Romano stationary bootstrap, i.e. circular blocks with
+      geometric lengths of mean `block_size`.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    if method == "iid":
+        return rng.integers(0, n, size=(n_samples, n))
+    if method == "block":
+        b = max(1, int(block_size))
+        starts = rng.integers(0, n, size=(n_samples, -(-n // b)))
+        idx = (starts[:, :, None] + np.arange(b)) % n
+        return idx.reshape(n_samples, -1)[:, :n]
+    if method == "stationary":
+        new = rng.random((n_samples, n)) < 1.0 / block_size
+        new[:, 0] = True
+        pos = np.arange(n)
+        block_start = np.where(new, pos, 0)
+        np.maximum.accumulate(block_start, axis=1, out=block_start)
+        starts = rng.integers(0, n, size=(n_samples, n))
+        first = np.take_along_axis(starts, block_start, axis=1)
+        return (first + (pos - block_start)) % n
+    raise ValueError(f"Unknown bootstrap method {method!r}; use one of {METHODS}.")
+
+
+def _chunk_stats(returns: np.ndarray, n_samples: int, seed: np.random.SeedSequence,
+                 method: str, block_size: float, rf: float, trading_days: int) -> np.ndarray:
+    # -> (len(SUMMARY_METRICS), n_samples, n_strategies)
+    n, k = returns.shape
+    idx = bootstrap_indices(n, n_samples, method, block_size, np.random.default_rng(seed))
+    sampled = returns[idx.T]  # (n, n_samples, k)
+    stats = summary_stats(sampled.reshape(n, n_samples * k), rf=rf, trading_days=trading_days)
+    return np.stack([stats[m].reshape(n_samples, k) for m in SUMMARY_METRICS])
+
+
+def probabilistic_sharpe(
+    returns: Union[pd.Series, pd.DataFrame, np.ndarray],
+    sr_benchmark: float = 0.0,
+    trading_days: int = 252,
+) -> Union[float, np.ndarray]:
+    """
+    Probabilistic Sharpe ratio (Bailey & Lopez de Prado): the probability that the true
+    Sharpe ratio exceeds `sr_benchmark` (annualized), given the sample Sharpe, its length,
+    skewness and kurtosis. Works column-wise on 2-D input.
+    """
+    r = np.asarray(returns, dtype=np.float64)
+    squeeze = r.ndim == 1
+    r = r.reshape(len(r), -1)
+    out = np.full(r.shape[1], np.nan)
+    for j in range(r.shape[1]):
+        x = r[:, j][~np.isnan(r[:, j])]
+        if len(x) < 3 or x.std(ddof=1) == 0:
+            continue
+        sr = x.mean() / x.std(ddof=1)
+        dev = x - x.mean()
+        m2 = np.mean(dev**2)
+        skew = np.mean(dev**3) / m2**1.5
+        kurt = np.mean(dev**4) / m2**2
+        denom = 1 - skew * sr + (kurt - 1) / 4 * sr**2
+        if denom <= 0:
+            continue
+        z = (sr - sr_benchmark / np.sqrt(trading_days)) * math.sqrt(len(x) - 1) / math.sqrt(denom)
+        out[j] = 0.5 * (1 + math.erf(z / math.sqrt(2)))
+    return float(out[0]) if squeeze else out
+
+
+@dataclass
+class BootstrapResult:
+    """
+    Bootstrap distribution of every `SUMMARY_METRICS` metric.
+
+    `samples` maps metric -> (n_samples, n_strategies) array; `point` maps metric -> the
+    full-sample value per strategy; `psr` is the probabilistic Sharpe per strategy.
+    """
+    names: List
+    samples: Dict[str, np.ndarray]
+    point: Dict[str, np.ndarray]
+    psr: np.ndarray
+    method: str
+    block_size: float
+
+    def ci(self, alpha: float = 0.05) -> pd.DataFrame:
+        """
+        Percentile intervals: one row per (strategy, metric) with the point estimate,
+        bootstrap mean and std, and the ``alpha/2`` / ``1 - alpha/2`` quantiles.
+        """
+        rows = []
+        for j, name in enumerate(self.names):
+            for m in SUMMARY_METRICS:
+                s = self.samples[m][:, j]
+                lo, hi = np.nanquantile(s, [alpha / 2, 1 - alpha / 2]) if np.isfinite(s).any() \
+                    else (np.nan, np.nan)
+                rows.append((name, m, self.point[m][j], np.nanmean(s), np.nanstd(s, ddof=1), lo, hi))
+        df = pd.DataFrame(rows, columns=["strategy", "metric", "point", "mean", "std", "lower", "upper"])
+        return df.set_index(["strategy", "metric"])
+
+
+def bootstrap_metrics(
+    returns: Union[pd.Series, pd.DataFrame, np.ndarray],
+    n_samples: int = 2000,
+    method: str = "stationary",
+    block_size: float = 20,
+    seed: Optional[int] = None,
+    rf: float = 0.0,
+    trading_days: int = 252,
+    max_memory: int = 256 * 2**20,
+    n_jobs: int = 1,
+) -> BootstrapResult:
+    """
+    Bootstrap the `BacktestResult.summary` metrics of one or many return series.
+
+    Parameters
+    ----------
+    returns : pd.Series | pd.DataFrame | np.ndarray
+        Periodic strategy returns; columns of a 2-D input are strategies resampled
+        jointly. Rows with a NaN in any column are dropped.
+    n_samples : int
+        Number of resamples.
+    method : {"stationary", "block", "iid"}
+    block_size : float
+        Mean (stationary) or fixed (block) block length in bars.
+    seed : int, optional
+        Makes the resamples reproducible. Results do not depend on `n_jobs`, but they do
+        depend on `max_memory`, which sets the chunking.
+    rf, trading_days
+        As in `summary_stats`.
+    max_memory : int
+        Approximate bytes of working memory per chunk of resamples.
+    n_jobs : int
+        Worker processes for the chunks (1 = in-process, -1 = all cores).
+
+    Returns
+    -------
+    BootstrapResult
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown bootstrap method {method!r}; use one of {METHODS}.")
+    if isinstance(returns, pd.DataFrame):
+        names = list(returns.columns)
+    elif isinstance(returns, pd.Series):
+        names = [returns.name if returns.name is not None else "strategy"]
+    else:
+        names = None
+    r = np.asarray(returns, dtype=np.float64)
+    r = r.reshape(len(r), -1)
+    r = r[~np.isnan(r).any(axis=1)]
+    n, k = r.shape
+    names = names if names is not None else list(range(k))
+    if n < 2:
+        raise ValueError("Need at least two return observations to bootstrap.")
+
+    # gathered block + a handful of same-sized temporaries inside summary_stats
+    per_sample = n * k * 8 * 8
+    chunk = int(max(1, min(n_samples, max_memory // per_sample)))
+    sizes = [min(chunk, n_samples - i) for i in range(0, n_samples, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = (method, block_size, rf, trading_days)
+    if n_jobs == 1 or len(sizes) == 1:
+        parts = [_chunk_stats(r, s, ss, *args) for s, ss in zip(sizes, seeds)]
+    else:
+        workers = os.cpu_count() if n_jobs < 0 else n_jobs
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_chunk_stats, r, s, ss, *args) for s, ss in zip(sizes, seeds)]
+            parts = [f.result() for f in futures]
+    stacked = np.concatenate(parts, axis=1)
+
+    point = summary_stats(r, rf=rf, trading_days=trading_days)
+    return BootstrapResult(
+        names=names,
+        samples={m: stacked[i] for i, m in enumerate(SUMMARY_METRICS)},
+        point={m: point[m] for m in SUMMARY_METRICS},
+        psr=np.atleast_1d(probabilistic_sharpe(r, trading_days=trading_days)),
+        method=method,
+        block_size=block_size,
+    )
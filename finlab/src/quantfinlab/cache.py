@@ -0,0 +1,268 @@
+"""
+Content-addressed memoization for feature and strategy computations.
+
+Functions decorated with `memoize` are keyed on a 128-bit hash (xxHash3 when the optional
+`xxhash` package is installed, BLAKE2b otherwise) of their arguments'
+contents (array bytes, index, name and dtype for pandas objects; repr for scalars) plus
+the function's qualified name, so identical inputs hit the cache even when they are
+different objects. The key also covers the function's source and the quantfinlab
+version, so entries on disk are not served after the code changes. Caching is opt-in::
+
+    from quantfinlab import cache
+
+    cache.enable(max_bytes=512 * 2**20, disk_dir="feature_cache")
+    ...
+    cache.stats()       # hits, misses, disk hits, evictions, bytes held
+    cache.invalidate("quantfinlab.features.sma")
+    cache.clear()
+
+The memory tier is an LRU bounded by the approximate size of the stored values; with
+`disk_dir` set, results are also pickled there and survive across sessions. Cached
+values are returned as copies, so callers may modify them freely. While disabled, a
+decorated function costs one flag check per call.
+"""
+from __future__ import annotations
+
+import hashlib
+import inspect
+import os
+import pathlib
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+import numpy as np
+import pandas as pd
+
+from . import __version__, instrument
+
+try:  # optional, several times faster than blake2b on large arrays
+    import xxhash
+except ImportError:
+    xxhash = None
+
+F = TypeVar("F", bound=Callable)
+
+Key = Tuple[str, str]
+
+
+def _update(h, obj: Any) -> None:
+    if isinstance(obj, (pd.Series, pd.DataFrame)):
+        h.update(type(obj).__name__.encode())
+        _update(h, obj.index)
+        _update(h, obj.columns if isinstance(obj, pd.DataFrame) else obj.name)
+        _update(h, obj.to_numpy())
+    elif isinstance(obj, pd.RangeIndex):
+        h.update(f"RangeIndex{obj.start},{obj.stop},{obj.step}{obj.name!r}".encode())
+    elif isinstance(obj, pd.Index):
+        h.update(f"Index{obj.dtype}{obj.name!r}{obj.nlevels}".encode())
+        if isinstance(obj, pd.DatetimeIndex) and obj.freq is not None and len(obj):
+            # a regular index is fully determined by its start, frequency and length
+            h.update(f"{obj[0]}|{obj.freqstr}|{len(obj)}".encode())
+        elif isinstance(obj, pd.DatetimeIndex):
+            _update(h, obj.asi8)
+        elif isinstance(obj, pd.MultiIndex) or obj.dtype == object or not hasattr(obj.dtype, "kind"):
+            _update(h, pd.util.hash_pandas_object(obj, index=False).to_numpy())
+        else:
+            _update(h, obj.to_numpy())
+    elif isinstance(obj, np.ndarray):
+        h.update(f"ndarray{obj.dtype}{obj.shape}".encode())
+        if obj.dtype == object:
+            h.update(pickle.dumps(obj.tolist()))
+        else:
+            h.update(memoryview(np.ascontiguousarray(obj)).cast("B"))
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}{len(obj)}".encode())
+        for item in obj:
+            _update(h, item)
+    elif isinstance(obj, dict):
+        h.update(f"dict{len(obj)}".encode())
+        for k in sorted(obj, key=repr):
+            _update(h, k)
+            _update(h, obj[k])
+    else:
+        h.update(f"{type(obj).__name__}:{obj!r}".encode())
+
+
+def content_hash(*objs: Any) -> str:
+    """Hex 128-bit digest of the contents of `objs`."""
+    h = xxhash.xxh3_128() if xxhash is not None else hashlib.blake2b(digest_size=16)
+    for obj in objs:
+        _update(h, obj)
+    return h.hexdigest()
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        return int(np.sum(value.memory_usage(index=True)))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, tuple):
+        return sum(_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, (pd.Series, pd.DataFrame, np.ndarray)):
+        return value.copy()
+    if isinstance(value, tuple):
+        return tuple(_copy(v) for v in value)
+    return value
+
+
+class MemoCache:
+    """
+    Two-tier result cache: an in-memory LRU capped at `max_bytes`, and an optional
+    pickle directory. Thread-safe.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 2**20, disk_dir: Optional[str | os.PathLike] = None):
+        self.max_bytes = int(max_bytes)
+        self.disk_dir = pathlib.Path(disk_dir) if disk_dir is not None else None
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self._entries: "OrderedDict[Key, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = dict(hits=0, misses=0, disk_hits=0, evictions=0)
+
+    def _path(self, key: Key) -> pathlib.Path:
+        return self.disk_dir / f"{key[0]}-{key[1]}.pkl"
+
+    def get(self, key: Key) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                instrument.incr("cache.hits")
+                return True, entry[0]
+        if self.disk_dir is not None:
+            try:
+                with open(self._path(key), "rb") as f:
+                    value = pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                pass
+            else:
+                self._remember(key, value)
+                with self._lock:
+                    self._stats["disk_hits"] += 1
+                instrument.incr("cache.disk_hits")
+                return True, value
+        with self._lock:
+            self._stats["misses"] += 1
+        instrument.incr("cache.misses")
+        return False, None
+
+    def put(self, key: Key, value: Any) -> None:
+        self._remember(key, value)
+        if self.disk_dir is not None:
+            path = self._path(key)
+            tmp = path.with_suffix(f".tmp{threading.get_ident()}")
+            with open(tmp, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+
+    def _remember(self, key: Key, value: Any) -> None:
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self._stats["evictions"] += 1
+
+    def invalidate(self, name: Optional[str] = None) -> int:
+        """
+        Drop the entries of the function with qualified name `name` (all entries when
+        None) from both tiers. Returns the number of in-memory entries removed.
+        """
+        with self._lock:
+            keys = [k for k in self._entries if name is None or k[0] == name]
+            for k in keys:
+                self._bytes -= self._entries.pop(k)[1]
+        if self.disk_dir is not None:
+            for path in self.disk_dir.glob(f"{name or '*'}-*.pkl"):
+                path.unlink(missing_ok=True)
+        return len(keys)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), bytes=self._bytes)
+
+
+_cache: Optional[MemoCache] = None
+
+
+def enable(max_bytes: int = 256 * 2**20, disk_dir: Optional[str | os.PathLike] = None) -> MemoCache:
+    """Turn memoization on with a fresh cache (dropping any previous in-memory tier)."""
+    global _cache
+    _cache = MemoCache(max_bytes=max_bytes, disk_dir=disk_dir)
+    return _cache
+
+
+def disable() -> None:
+    global _cache
+    _cache = None
+
+
+def is_enabled() -> bool:
+    return _cache is not None
+
+
+def stats() -> Dict[str, int]:
+    """Counters of the active cache (empty dict when disabled)."""
+    return _cache.stats() if _cache is not None else {}
+
+
+def invalidate(fn: Optional[Callable | str] = None) -> int:
+    """Drop cached results of `fn` (a memoized function or its qualified name), or all."""
+    if _cache is None:
+        return 0
+    name = getattr(fn, "__memo_name__", fn)
+    return _cache.invalidate(name)
+
+
+def clear() -> None:
+    """Drop every cached result, in memory and on disk."""
+    invalidate(None)
+
+
+def memoize(fn: F) -> F:
+    """
+    Cache `fn`'s results by argument contents while `enable()` is in effect. Arguments
+    are bound to the signature first, so positional and keyword calls share entries.
+    """
+    name = f"{fn.__module__}.{fn.__qualname__}"
+    signature = inspect.signature(fn)
+    try:
+        source = inspect.getsource(fn)
+    except (OSError, TypeError):  # no source file, e.g. defined in a REPL
+        source = getattr(getattr(fn, "__code__", None), "co_code", b"")
+    code = content_hash(__version__, source)
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        cache = _cache
+        if cache is None:
+            return fn(*args, **kwargs)
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (name, content_hash(code, bound.arguments))
+        hit, value = cache.get(key)
+        if not hit:
+            value = fn(*args, **kwargs)
+            cache.put(key, value)
+        return _copy(value)
+
+    wrapper.__memo_name__ = name  # type: ignore[attr-defined]
+    return wrapper  # type: ignore[return-value]
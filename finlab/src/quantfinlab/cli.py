@@ -0,0 +1,244 @@
+"""
+Command-line interface: ``quantfinlab <command> ...`` (or ``python -m quantfinlab``).
+
+Commands
+--------
+fetch      sync tickers into the local price store
+backtest   run a strategy on one ticker and print its summary
+sweep      evaluate a strategy parameter grid
+forecast   fit ARIMA, GARCH or LSTM on log returns and forecast
+report     write headless PNG/HTML reports for a strategy
+
+Every command imports its dependencies when it runs, so e.g. ``backtest`` never loads
+torch, statsmodels, arch, matplotlib or plotly. ``--timing`` prints the command's wall
+time and which heavy dependencies it loaded; ``benchmarks/run.py --only startup`` measures
+cold-start time of whole processes.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from typing import List, Optional
+
+STRATEGIES = ("momentum", "mean_reversion")
+
+
+def _floats(text: str) -> List[float]:
+    return [float(v) for v in text.split(",") if v]
+
+
+def _ints(text: str) -> List[int]:
+    return [int(v) for v in text.split(",") if v]
+
+
+def _load_price(args):
+    from .data import get_price_data, to_close_series
+    from .fetchers import CSVFetcher
+
+    fetcher = CSVFetcher(args.csv_dir) if args.csv_dir else None
+    data = get_price_data(args.ticker, start=args.start, end=args.end, interval=args.interval,
+                          cache_dir=args.cache_dir, fetcher=fetcher)
+    return to_close_series(data, args.ticker)
+
+
+def _signal(args, price):
+    if args.strategy == "momentum":
+        from .strategies.momentum import momentum_long_only
+
+        return momentum_long_only(price, lookback=args.lookback, vol_target=args.vol_target)
+    from .strategies.mean_reversion import mean_reversion
+
+    return mean_reversion(price, window=args.window, entry_z=args.entry_z, exit_z=args.exit_z)
+
+
+def _backtest(args, price):
+    from .backtest import backtest_signals
+
+    allow_short = args.strategy == "mean_reversion" if args.allow_short is None else args.allow_short
+    return backtest_signals(price, _signal(args, price), fee_bps=args.fee_bps,
+                            slippage_bps=args.slippage_bps, allow_short=allow_short,
+                            stop_loss=args.stop_loss, take_profit=args.take_profit,
+                            trailing_stop=args.trailing_stop)
+
+
+def cmd_fetch(args) -> int:
+    from .data import get_price_data
+    from .fetchers import CSVFetcher
+
+    tickers = list(dict.fromkeys(args.tickers))  # a repeated ticker is fetched once
+    fetcher = CSVFetcher(args.csv_dir) if args.csv_dir else None
+    data = get_price_data(tickers, start=args.start, end=args.end, interval=args.interval,
+                          cache_dir=args.cache_dir, fetcher=fetcher)
+    loaded = data.columns.get_level_values(0).unique()
+    for t in loaded:
+        rows = data[t].dropna(how="all")
+        print(f"{t}: {len(rows)} bars {rows.index[0]} .. {rows.index[-1]}")
+    for t, err in data.attrs.get("failed", {}).items():
+        print(f"{t}: failed ({err})", file=sys.stderr)
+    return 0 if len(loaded) == len(tickers) else 1
+
+
+def cmd_backtest(args) -> int:
+    summary = _backtest(args, _load_price(args)).summary()
+    if args.json:
+        print(json.dumps(summary))
+    else:
+        for k, v in summary.items():
+            print(f"{k:>12}: {v:.4f}")
+    return 0
+
+
+def cmd_sweep(args) -> int:
+    from . import sweep
+
+    price = _load_price(args)
+    kw = dict(fee_bps=args.fee_bps, slippage_bps=args.slippage_bps, n_jobs=args.n_jobs)
+    if args.allow_short is not None:
+        kw["allow_short"] = args.allow_short
+    if args.strategy == "momentum":
+        table = sweep.sweep_momentum(price, _ints(args.lookbacks), _floats(args.vol_targets), **kw)
+    else:
+        table = sweep.sweep_mean_reversion(price, _ints(args.windows), _floats(args.entry_zs),
+                                           _floats(args.exit_zs), **kw)
+    table = table.sort_values(args.sort_by, ascending=False)
+    if args.output:
+        table.to_csv(args.output, index=False)
+    print(table.head(args.top).to_string(index=False))
+    return 0
+
+
+def cmd_forecast(args) -> int:
+    from .features import log_returns
+
+    ret = log_returns(_load_price(args))
+    if args.model == "arima":
+        from .models.arima import ArimaForecaster
+
+        model = ArimaForecaster(order="auto" if args.order == "auto" else tuple(_ints(args.order)))
+        fc = model.fit(ret).forecast(args.steps)
+        out = {"model": "arima", "order": list(model.order), "log_return": [float(v) for v in fc]}
+    elif args.model == "garch":
+        from .models.garch import GarchVolModel
+
+        out = {"model": "garch", "annualized_vol": GarchVolModel().fit(ret).forecast_vol(args.steps)}
+    else:
+        from .models.lstm import LSTMConfig, forecast_one, train_lstm
+
+        model, _ = train_lstm(ret, LSTMConfig(epochs=args.epochs))
+        out = {"model": "lstm", "log_return": forecast_one(model, ret)}
+    print(json.dumps(out))
+    return 0
+
+
+def cmd_report(args) -> int:
+    from .plotting import render_report
+
+    price = _load_price(args)
+    bt = _backtest(args, price)
+    name = f"{args.ticker}_{args.strategy}"
+    for path in render_report(name, bt.equity_curve, args.out_dir, price, bt.positions,
+                              max_points=args.max_points):
+        print(path)
+    return 0
+
+
+def _add_data_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--start", default="2015-01-01")
+    p.add_argument("--end", default=None)
+    p.add_argument("--interval", default="1d")
+    p.add_argument("--cache-dir", default="data_cache")
+    p.add_argument("--csv-dir", default=None, help="read {ticker}.csv files instead of Yahoo")
+
+
+def _add_strategy_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--strategy", choices=STRATEGIES, default="momentum")
+    p.add_argument("--lookback", type=int, default=50)
+    p.add_argument("--vol-target", type=float, default=0.15)
+    p.add_argument("--window", type=int, default=20)
+    p.add_argument("--entry-z", type=float, default=1.0)
+    p.add_argument("--exit-z", type=float, default=0.25)
+    p.add_argument("--stop-loss", type=float, default=None, help="e.g. 0.05 for a 5%% stop")
+    p.add_argument("--take-profit", type=float, default=None)
+    p.add_argument("--trailing-stop", type=float, default=None)
+    _add_cost_args(p)
+
+
+def _add_cost_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--fee-bps", type=float, default=1.0)
+    p.add_argument("--slippage-bps", type=float, default=2.0)
+    p.add_argument("--allow-short", action=argparse.BooleanOptionalAction, default=None,
+                   help="default: shorts for mean_reversion only")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="quantfinlab", description="quant-finlab command line")
+    parser.add_argument("--timing", action="store_true",
+                        help="report wall time and heavy dependencies loaded by the command")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("fetch", help="sync tickers into the local price store")
+    p.add_argument("tickers", nargs="+")
+    _add_data_args(p)
+    p.set_defaults(func=cmd_fetch)
+
+    p = sub.add_parser("backtest", help="backtest a strategy on one ticker")
+    p.add_argument("ticker")
+    _add_data_args(p)
+    _add_strategy_args(p)
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_backtest)
+
+    p = sub.add_parser("sweep", help="evaluate a strategy parameter grid")
+    p.add_argument("ticker")
+    _add_data_args(p)
+    p.add_argument("--strategy", choices=STRATEGIES, default="momentum")
+    p.add_argument("--lookbacks", default="20,50,100,200")
+    p.add_argument("--vol-targets", default="0.1,0.15,0.2")
+    p.add_argument("--windows", default="10,20,40")
+    p.add_argument("--entry-zs", default="1.0,1.5,2.0")
+    p.add_argument("--exit-zs", default="0.0,0.25,0.5")
+    _add_cost_args(p)
+    p.add_argument("--n-jobs", type=int, default=1)
+    p.add_argument("--sort-by", default="Sharpe")
+    p.add_argument("--top", type=int, default=10)
+    p.add_argument("--output", default=None, help="write the full table as CSV")
+    p.set_defaults(func=cmd_sweep)
+
+    p = sub.add_parser("forecast", help="fit a model on log returns and forecast")
+    p.add_argument("ticker")
+    _add_data_args(p)
+    p.add_argument("--model", choices=("arima", "garch", "lstm"), default="arima")
+    p.add_argument("--order", default="1,0,1", help="ARIMA order p,d,q, or 'auto' to select it")
+    p.add_argument("--steps", type=int, default=1, help="horizon (ARIMA, GARCH)")
+    p.add_argument("--epochs", type=int, default=3, help="LSTM epochs")
+    p.set_defaults(func=cmd_forecast)
+
+    p = sub.add_parser("report", help="write PNG/HTML reports for a strategy")
+    p.add_argument("ticker")
+    _add_data_args(p)
+    _add_strategy_args(p)
+    p.add_argument("--out-dir", default="reports")
+    p.add_argument("--max-points", type=int, default=2000)
+    p.set_defaults(func=cmd_report)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if not args.timing:
+        return args.func(args)
+    before = set(sys.modules)
+    t0 = time.perf_counter()
+    code = args.func(args)
+    elapsed = time.perf_counter() - t0
+    heavy = sorted(m for m in set(sys.modules) - before
+                   if m in ("torch", "statsmodels", "arch", "matplotlib", "plotly", "yfinance"))
+    print(f"[{args.command}: {elapsed:.3f}s total, heavy modules loaded: {heavy or 'none'}]",
+          file=sys.stderr)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
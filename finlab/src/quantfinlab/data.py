@@ -2,9 +2,17 @@ from __future__ import annotations
 
 import os
 import pathlib
-from typing import Iterable, List, Optional
+import warnings
+from functools import reduce
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
 import pandas as pd
-import yfinance as yf
+
+from . import instrument
+from .fetchers import Fetcher, YahooFetcher, run_concurrently, with_retry
+from .panel import PricePanel
+from .store import _DTYPE, _INDEX_DTYPE, PriceStore
 
 
 def _ensure_cache_dir(path: str | os.PathLike) -> pathlib.Path:
@@ -13,6 +21,7 @@ def _ensure_cache_dir(path: str | os.PathLike) -> pathlib.Path:
     return p
 
 
+@instrument.timed("data.get_price_data")
 def get_price_data(
     tickers: Iterable[str] | str,
     start: str = "2015-01-01",
@@ -20,9 +29,13 @@ def get_price_data(
     interval: str = "1d",
     cache_dir: str | os.PathLike = "data_cache",
     force_download: bool = False,
+    fetcher: Optional[Fetcher] = None,
+    max_workers: int = 8,
+    retries: int = 3,
+    backoff: float = 0.5,
 ) -> pd.DataFrame:
     """
-    Download OHLCV price data using yfinance.
+    Download OHLCV price data using yfinance (or any other `Fetcher`).
     Returns a DataFrame with columns MultiIndex (Ticker, [Open, High, Low, Close, Adj Close, Volume]).
 
     Parameters
@@ -34,42 +47,135 @@ def get_price_data(
     interval : str
         "1d", "1h", etc.
     cache_dir : str
-        Directory to cache CSVs.
+        Directory holding the columnar price store (see `quantfinlab.store.PriceStore`).
     force_download : bool
-        If True, ignore cache and pull fresh data.
+        If True, discard the stored history for each ticker and pull the range fresh.
+    fetcher : Fetcher, optional
+        Data source; defaults to `quantfinlab.fetchers.YahooFetcher`. A local
+        `quantfinlab.fetchers.CSVFetcher` can stand in for it.
+    max_workers : int
+        Size of the thread pool that syncs tickers concurrently.
+    retries, backoff : int, float
+        Per-ticker retry count and initial backoff in seconds (doubled on every retry).
 
     Notes
     -----
+    The store keeps one binary file set per ticker and interval. A request only downloads
+    the part of [start, end) that has not been fetched before, and serves the rest from
+    memory-mapped columns. With `end=None` the range runs up to (excluding) today, so the
+    still-forming bar is never cached. A fetch that came back empty, and the part of a
+    recent one after its last bar, count as not fetched and are requested again.
+
+    Tickers that still fail after their retries, or that have no bars in the range, are
+    left out of the result and reported with a warning and in ``data.attrs["failed"]``
+    (ticker -> error message). A ValueError is raised only if every ticker fails.
+
+    With `quantfinlab.instrument` enabled, records the ``data.get_price_data`` and
+    ``data.fetch`` spans and the ``data.cache_hits`` / ``data.cache_misses`` (per ticker),
+    ``data.fetched_ranges`` and ``data.bytes_read`` (bytes of the fetched frames plus the
+    index and column slices read from the store) counters.
+
     Yahoo! Finance has occasional data gaps. This is educational. Verify before production use.
     """
-    if isinstance(tickers, str):
-        tickers = [tickers]
-    tickers = list(tickers)
-    cache_dir = _ensure_cache_dir(cache_dir)
-
-    frames = []
-    for t in tickers:
-        cache_file = cache_dir / f"{t}_{interval}_{start}_{end or 'latest'}.csv"
-        if cache_file.exists() and not force_download:
-            df = pd.read_csv(cache_file, parse_dates=["Date"]).set_index("Date")
-        else:
-            df = yf.download(t, start=start, end=end, interval=interval, auto_adjust=False, progress=False)
-            if df.empty:
-                raise ValueError(f"No data returned for ticker {t}.")
-            df.to_csv(cache_file, index=True)
-        df.columns = pd.MultiIndex.from_product([[t], df.columns])
-        frames.append(df)
-
-    data = pd.concat(frames, axis=1).sort_index()
+    frames, failures = _sync(tickers, start, end, interval, cache_dir, force_download, fetcher,
+                             max_workers, retries, backoff)
+    data = _assemble(frames)
     # Forward-fill missing values for continuity (still log gaps accordingly).
     data = data.ffill()
+    data.attrs["failed"] = {t: str(e) for t, e in failures.items()}
     return data
 
 
-def to_close_series(data: pd.DataFrame, ticker: str) -> pd.Series:
+@instrument.timed("data.get_price_panel")
+def get_price_panel(
+    tickers: Iterable[str] | str,
+    start: str = "2015-01-01",
+    end: Optional[str] = None,
+    interval: str = "1d",
+    cache_dir: str | os.PathLike = "data_cache",
+    dtype=np.float64,
+    ffill: bool = True,
+    force_download: bool = False,
+    fetcher: Optional[Fetcher] = None,
+    max_workers: int = 8,
+    retries: int = 3,
+    backoff: float = 0.5,
+) -> PricePanel:
+    """
+    `get_price_data` returning a `quantfinlab.panel.PricePanel` instead of a wide
+    DataFrame: one (field x date x ticker) array, optionally float32 (`dtype`), built
+    straight from the store without the intermediate frame. With `ffill`, gaps are
+    forward-filled and the filled values recorded in the panel's mask. Failures are
+    handled as in `get_price_data` and listed in ``panel.failed``.
+    """
+    frames, failures = _sync(tickers, start, end, interval, cache_dir, force_download, fetcher,
+                             max_workers, retries, backoff)
+    panel = PricePanel.from_frames(frames, dtype=dtype, ffill=ffill)
+    panel.failed = {t: str(e) for t, e in failures.items()}
+    return panel
+
+
+def _sync(tickers, start, end, interval, cache_dir, force_download, fetcher, max_workers,
+          retries, backoff):
+    # Bring every ticker's store up to date for [start, end) and read it back. Returns
+    # the frames in request order and the failures.
+    if isinstance(tickers, str):
+        tickers = [tickers]
+    tickers = list(dict.fromkeys(tickers))  # two syncs of one ticker would race on its files
+    store = PriceStore(_ensure_cache_dir(cache_dir))
+    lo = pd.Timestamp(start)
+    hi = pd.Timestamp(end) if end is not None else pd.Timestamp.today().normalize()
+
+    fetcher = fetcher if fetcher is not None else YahooFetcher()
+
+    def sync(t: str) -> pd.DataFrame:
+        if force_download:
+            store.delete(t, interval)
+        gaps = store.missing(t, interval, lo, hi)
+        instrument.incr("data.cache_misses" if gaps else "data.cache_hits")
+        for a, b in gaps:
+            with instrument.span("data.fetch"):
+                df = with_retry(lambda: fetcher.fetch(t, a, b, interval), retries=retries, backoff=backoff)
+            instrument.incr("data.fetched_ranges")
+            instrument.incr("data.bytes_read", int(df.memory_usage(index=True).sum()))
+            store.merge(t, interval, df, a, b)
+        df = store.read(t, interval, lo, hi)
+        instrument.incr("data.bytes_read",
+                        len(df) * (_INDEX_DTYPE.itemsize + df.shape[1] * _DTYPE.itemsize))
+        if df.empty:
+            raise ValueError(f"No data returned for ticker {t}.")
+        return df
+
+    frames, failures = run_concurrently(sync, tickers, max_workers=max_workers)
+    if not frames:
+        errors = "; ".join(f"{t}: {e}" for t, e in failures.items())
+        raise ValueError(f"No data returned for any ticker ({errors}).")
+    if failures:
+        warnings.warn(f"Skipped {len(failures)} ticker(s) that failed to load: {sorted(failures)}")
+    return {t: frames[t] for t in tickers if t in frames}, failures
+
+
+def _assemble(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    # Build the wide (Ticker, Field) frame with one allocation instead of a MultiIndex per
+    # ticker followed by pd.concat.
+    index = reduce(lambda a, b: a.union(b), (df.index for df in frames.values())).sort_values()
+    columns = [(t, c) for t, df in frames.items() for c in df.columns]
+    values = np.full((len(index), len(columns)), np.nan)
+    j = 0
+    for df in frames.values():
+        rows = index.get_indexer(df.index)
+        values[rows, j:j + df.shape[1]] = df.to_numpy(dtype=float)
+        j += df.shape[1]
+    return pd.DataFrame(values, index=index, columns=pd.MultiIndex.from_tuples(columns))
+
+
+def to_close_series(data: pd.DataFrame | PricePanel, ticker: str) -> pd.Series:
     """
-    Convenience: extract Close for a single ticker from the multiindex columns.
+    Convenience: extract Close for a single ticker from the multiindex columns (or, for a
+    `PricePanel`, as a view without copying).
     """
+    if isinstance(data, PricePanel):
+        return data.close(ticker)
     if isinstance(data.columns, pd.MultiIndex):
         return data[ticker]["Adj Close"].rename(ticker) if "Adj Close" in data[ticker].columns else data[ticker]["Close"].rename(ticker)
     # If single-index columns (already single ticker)
@@ -3,7 +3,10 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 
+from .cache import memoize
 
+
+@memoize
 def log_returns(price: pd.Series, fillna: bool = True) -> pd.Series:
     r = np.log(price).diff()
     if fillna:
@@ -11,23 +14,28 @@ def log_returns(price: pd.Series, fillna: bool = True) -> pd.Series:
     return r.rename("log_ret")
 
 
+@memoize
 def simple_returns(price: pd.Series) -> pd.Series:
     return price.pct_change().fillna(0.0).rename("ret")
 
 
+@memoize
 def sma(price: pd.Series, window: int) -> pd.Series:
     return price.rolling(window).mean().rename(f"SMA_{window}")
 
 
+@memoize
 def ema(price: pd.Series, window: int) -> pd.Series:
     return price.ewm(span=window, adjust=False).mean().rename(f"EMA_{window}")
 
 
+@memoize
 def rolling_vol(ret: pd.Series, window: int = 20, trading_days: int = 252) -> pd.Series:
     vol = ret.rolling(window).std() * np.sqrt(trading_days)
     return vol.rename(f"VOL_{window}")
 
 
+@memoize
 def zscore(x: pd.Series, window: int) -> pd.Series:
     mu = x.rolling(window).mean()
     sd = x.rolling(window).std().replace(0, np.nan)
@@ -35,6 +43,7 @@ def zscore(x: pd.Series, window: int) -> pd.Series:
     return z.rename(f"Z_{window}")
 
 
+@memoize
 def rsi(price: pd.Series, window: int = 14) -> pd.Series:
     # Standard RSI implementation
     delta = price.diff()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import os
+import pathlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Protocol, Tuple, TypeVar, runtime_checkable
+
+import pandas as pd
+
+T = TypeVar("T")
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+_DAILY_SUFFIXES = ("d", "wk", "mo")
+
+
+@runtime_checkable
+class Fetcher(Protocol):
+    """
+    Anything that can return OHLCV bars for one ticker over a half-open [start, end) range.
+
+    Implementations must be safe to call from several threads at once. An empty frame
+    means "no bars in this range"; transient failures should raise so they can be retried.
+    """
+
+    def fetch(self, ticker: str, start: pd.Timestamp, end: pd.Timestamp, interval: str) -> pd.DataFrame:
+        ...
+
+
+class YahooFetcher:
+    """
+    Fetch bars from Yahoo! Finance through `yfinance.Ticker.history`.
+
+    `Ticker.history` is used instead of `yf.download` because the latter keeps its results
+    in module-level state and is not safe to call concurrently.
+    """
+
+    def __init__(self, timeout: float = 10.0):
+        self.timeout = timeout
+
+    def fetch(self, ticker: str, start: pd.Timestamp, end: pd.Timestamp, interval: str) -> pd.DataFrame:
+        import yfinance as yf
+
+        df = yf.Ticker(ticker).history(
+            start=start,
+            end=end,
+            interval=interval,
+            auto_adjust=False,
+            actions=False,
+            timeout=self.timeout,
+            raise_errors=True,
+        )
+        if df is None or df.empty:
+            return pd.DataFrame(columns=PRICE_COLUMNS)
+        if interval.endswith(_DAILY_SUFFIXES) and df.index.tz is not None:
+            # Keep daily bars on naive dates, as yf.download does.
+            df.index = df.index.tz_localize(None)
+        df.index.name = "Date" if interval.endswith(_DAILY_SUFFIXES) else "Datetime"
+        return df[[c for c in PRICE_COLUMNS if c in df.columns]]
+
+
+class CSVFetcher:
+    """
+    Local file-backed stand-in for a remote source.
+
+    Reads `{root}/{ticker}.csv` (any layout `pd.read_csv` understands with the datetime in
+    the first column), caches the parsed file and serves slices of it. Useful for tests,
+    offline research and replaying vendor dumps through the same pipeline.
+    """
+
+    def __init__(self, root: str | os.PathLike, pattern: str = "{ticker}.csv"):
+        self.root = pathlib.Path(root)
+        self.pattern = pattern
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, ticker: str) -> pd.DataFrame:
+        with self._lock:
+            df = self._frames.get(ticker)
+        if df is None:
+            path = self.root / self.pattern.format(ticker=ticker)
+            if not path.exists():
+                raise FileNotFoundError(f"No local data file for {ticker}: {path}")
+            df = pd.read_csv(path, index_col=0, parse_dates=[0]).sort_index()
+            with self._lock:
+                self._frames[ticker] = df
+        return df
+
+    def fetch(self, ticker: str, start: pd.Timestamp, end: pd.Timestamp, interval: str) -> pd.DataFrame:
+        df = self._load(ticker)
+        return df[(df.index >= start) & (df.index < end)]
+
+
+def with_retry(
+    fn: Callable[[], T],
+    retries: int = 3,
+    backoff: float = 0.5,
+    sleep: Callable[[float], None] = time.sleep,
+) -> T:
+    """
+    Call `fn`, retrying up to `retries` extra times with exponential backoff
+    (backoff, 2*backoff, 4*backoff, ...) when it raises. The last error is re-raised.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return fn()
+        except Exception:
+            if attempt == retries:
+                raise
+            sleep(backoff * 2**attempt)
+    raise AssertionError("unreachable")
+
+
+def run_concurrently(
+    task: Callable[[str], T],
+    keys: Iterable[str],
+    max_workers: int = 8,
+) -> Tuple[Dict[str, T], Dict[str, Exception]]:
+    """
+    Run `task(key)` for every key on a bounded thread pool.
+
+    Returns ``(results, failures)``; a failing key never aborts the others. Repeated keys
+    run once.
+    """
+    keys = list(dict.fromkeys(keys))
+    results: Dict[str, T] = {}
+    failures: Dict[str, Exception] = {}
+    if not keys:
+        return results, failures
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(keys)))) as pool:
+        futures = {k: pool.submit(task, k) for k in keys}
+        for k, fut in futures.items():
+            try:
+                results[k] = fut.result()
+            except Exception as exc:  # collected, reported by the caller
+                failures[k] = exc
+    return results, failures
+
@@ -0,0 +1,215 @@
+"""
+Lightweight pipeline instrumentation: timed spans, counters and peak-RSS sampling.
+
+Disabled by default. While disabled, `span` returns a shared no-op context manager and
+`incr` / `gauge` return after a single flag check, so the hooks in the library cost
+nothing measurable. Enable around a run and export the collected numbers::
+
+    from quantfinlab import instrument
+
+    instrument.enable()
+    with instrument.span("backtest"):
+        ...
+    instrument.write_json("profile.json")
+    print(instrument.to_prometheus())
+
+All updates are thread-safe (`get_price_data` syncs tickers on a thread pool).
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from functools import wraps
+from typing import Callable, Dict, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+try:  # POSIX only
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+_enabled = False
+_lock = threading.Lock()
+_spans: Dict[str, Dict[str, float]] = {}
+_counters: Dict[str, float] = {}
+_gauges: Dict[str, float] = {}
+
+
+def enable(on: bool = True) -> None:
+    """Turn collection on (or off with ``on=False``). Collected values are kept."""
+    global _enabled
+    _enabled = bool(on)
+
+
+def disable() -> None:
+    enable(False)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    """Drop everything collected so far."""
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+        _gauges.clear()
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process, or None where `resource` is unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        rss = peak_rss_bytes()
+        with _lock:
+            s = _spans.get(self.name)
+            if s is None:
+                s = _spans[self.name] = {"count": 0, "total_seconds": 0.0,
+                                         "min_seconds": elapsed, "max_seconds": elapsed}
+            s["count"] += 1
+            s["total_seconds"] += elapsed
+            s["min_seconds"] = min(s["min_seconds"], elapsed)
+            s["max_seconds"] = max(s["max_seconds"], elapsed)
+            if rss is not None:
+                s["peak_rss_bytes"] = rss
+                _gauges["peak_rss_bytes"] = max(_gauges.get("peak_rss_bytes", 0), rss)
+        return False
+
+
+def span(name: str):
+    """Context manager timing the enclosed block under `name` (count, total, min, max, RSS)."""
+    return _Span(name) if _enabled else _NULL_SPAN
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorator form of `span`; the enabled flag is checked on every call."""
+    def decorate(fn: F) -> F:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorate
+
+
+def incr(name: str, value: float = 1) -> None:
+    """Add `value` to counter `name`."""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def gauge(name: str, value: float) -> None:
+    """Set gauge `name` to `value`."""
+    if not _enabled:
+        return
+    with _lock:
+        _gauges[name] = value
+
+
+def sample_memory() -> None:
+    """Record the current peak RSS as the ``peak_rss_bytes`` gauge."""
+    if not _enabled:
+        return
+    rss = peak_rss_bytes()
+    if rss is not None:
+        with _lock:
+            _gauges["peak_rss_bytes"] = max(_gauges.get("peak_rss_bytes", 0), rss)
+
+
+def snapshot() -> dict:
+    """Copy of everything collected: ``{"spans": ..., "counters": ..., "gauges": ...}``."""
+    with _lock:
+        return {
+            "pid": os.getpid(),
+            "time": time.time(),
+            "spans": {k: dict(v) for k, v in _spans.items()},
+            "counters": dict(_counters),
+            "gauges": dict(_gauges),
+        }
+
+
+def to_json(indent: int = 2) -> str:
+    return json.dumps(snapshot(), indent=indent, sort_keys=True)
+
+
+def write_json(path: str | os.PathLike) -> None:
+    with open(path, "w") as f:
+        f.write(to_json())
+
+
+def _metric(name: str) -> str:
+    return "quantfinlab_" + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus() -> str:
+    """
+    Prometheus text exposition format: spans as a ``quantfinlab_span_seconds`` summary
+    (``_sum`` / ``_count``, labelled by span), counters as ``*_total`` and gauges as-is.
+    """
+    snap = snapshot()
+    lines = []
+    if snap["spans"]:
+        lines.append("# TYPE quantfinlab_span_seconds summary")
+        for name, s in sorted(snap["spans"].items()):
+            label = f'{{span="{_label(name)}"}}'
+            lines.append(f"quantfinlab_span_seconds_sum{label} {s['total_seconds']!r}")
+            lines.append(f"quantfinlab_span_seconds_count{label} {s['count']}")
+        lines.append("# TYPE quantfinlab_span_max_seconds gauge")
+        for name, s in sorted(snap["spans"].items()):
+            lines.append(f'quantfinlab_span_max_seconds{{span="{_label(name)}"}} {s["max_seconds"]!r}')
+    for name, v in sorted(snap["counters"].items()):
+        metric = _metric(name) + "_total"
+        lines += [f"# TYPE {metric} counter", f"{metric} {v!r}"]
+    for name, v in sorted(snap["gauges"].items()):
+        metric = _metric(name)
+        lines += [f"# TYPE {metric} gauge", f"{metric} {v!r}"]
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str | os.PathLike) -> None:
+    with open(path, "w") as f:
+        f.write(to_prometheus())
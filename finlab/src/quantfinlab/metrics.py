@@ -1,63 +1,417 @@
 from __future__ import annotations
 
+from typing import Dict, Iterable, Optional, Sequence, Union
+
 import numpy as np
 import pandas as pd
 
+SUMMARY_METRICS = ["CAGR", "Sharpe", "Sortino", "MaxDrawdown", "Calmar", "HitRatio"]
+ROLLING_METRICS = SUMMARY_METRICS + ["Vol"]
+
+
+def _as_2d(x) -> np.ndarray:
+    # Columns are independent series; a 1-D input is a single column.
+    arr = np.asarray(x, dtype=np.float64)
+    return arr.reshape(-1, 1) if arr.ndim == 1 else arr
+
+
+# ---------------------------------------------------------------------------
+# Column-wise kernels on raw (dates x columns) arrays. NaNs are skipped per column,
+# like the dropna() in the scalar functions below.
+# ---------------------------------------------------------------------------
+
+def _moments(r: np.ndarray):
+    """Count, mean and sample std (ddof=1) of each column, skipping NaNs."""
+    valid = ~np.isnan(r)
+    dense = bool(valid.all())
+    n = np.full(r.shape[1], r.shape[0]) if dense else valid.sum(axis=0)
+    rz = r if dense else np.where(valid, r, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = rz.sum(axis=0) / n
+        dev = r - mean if dense else np.where(valid, r - mean, 0.0)
+        std = np.sqrt((dev * dev).sum(axis=0) / (n - 1))
+    std[n < 2] = np.nan
+    return n, mean, std, rz
+
+
+def _downside_std(rz: np.ndarray) -> np.ndarray:
+    # Sample std of the negative returns: sum((r - m)^2) over them is sum(r^2) - k*m^2.
+    neg = np.minimum(rz, 0.0)
+    k = np.count_nonzero(neg, axis=0)
+    s1 = neg.sum(axis=0)
+    np.multiply(neg, neg, out=neg)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = s1 / k
+        var = np.maximum(neg.sum(axis=0) - k * mean * mean, 0.0) / (k - 1)
+    return np.where(k > 1, np.sqrt(var), np.nan)
+
+
+def _cagr(eq: np.ndarray, trading_days: int) -> np.ndarray:
+    valid = ~np.isnan(eq)
+    n = valid.sum(axis=0)
+    cols = np.arange(eq.shape[1])
+    first = eq[np.argmax(valid, axis=0), cols] if len(eq) else np.full(eq.shape[1], np.nan)
+    last = eq[len(eq) - 1 - np.argmax(valid[::-1], axis=0), cols] if len(eq) else first
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        total_return = last / first - 1.0
+        out = (1 + total_return) ** (1 / (n / trading_days)) - 1
+    return np.where(n > 0, out, np.nan)
+
+
+def _max_drawdown(eq: np.ndarray) -> np.ndarray:
+    if len(eq) == 0:
+        return np.full(eq.shape[1], np.nan)
+    if not np.isnan(eq).any():
+        ratio = np.maximum.accumulate(eq, axis=0)
+        np.divide(eq, ratio, out=ratio)
+        return ratio.min(axis=0) - 1.0
+    peak = np.fmax.accumulate(eq, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dd = eq / peak - 1.0
+    all_nan = np.isnan(dd).all(axis=0)
+    return np.where(all_nan, np.nan, np.nanmin(np.where(all_nan, 0.0, dd), axis=0))
 
-def _to_series(x) -> pd.Series:
-    if isinstance(x, pd.Series):
-        return x
-    return pd.Series(x)
 
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where((den == 0) | np.isnan(den), np.nan, num / den)
+
+
+def summary_stats(
+    returns,
+    equity_curve=None,
+    rf: float = 0.0,
+    trading_days: int = 252,
+) -> Dict[str, np.ndarray]:
+    """
+    All `BacktestResult.summary` statistics for every column of a return matrix at once.
+
+    Parameters
+    ----------
+    returns : array-like
+        (dates x columns) periodic returns, e.g. many strategies or assets; 1-D is one column.
+    equity_curve : array-like, optional
+        Matching equity curves. Defaults to ``cumprod(1 + returns)`` with NaN returns as 0.
+    rf : float
+        Annual risk-free rate for Sharpe and Sortino.
+    trading_days : int
+        Periods per year.
+
+    Returns
+    -------
+    dict
+        Metric name (see `SUMMARY_METRICS`) -> array with one value per column. Each value
+        equals what the scalar function of the same name returns for that column.
+    """
+    r = _as_2d(returns)
+    if equity_curve is None:
+        eq = np.cumprod(1 + np.nan_to_num(r, nan=0.0), axis=0)
+    else:
+        eq = _as_2d(equity_curve)
+
+    n, mean, std, rz = _moments(r)
+    excess = (mean - rf / trading_days) * trading_days
+    root = np.sqrt(trading_days)
+    mdd = _max_drawdown(eq)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        hit = np.where(n > 0, (rz > 0).sum(axis=0) / n, np.nan)
+    return {
+        "CAGR": _cagr(eq, trading_days),
+        "Sharpe": _ratio(excess, std * root),
+        "Sortino": _ratio(excess, _downside_std(rz) * root),
+        "MaxDrawdown": mdd,
+        "Calmar": _ratio(mean * trading_days, np.abs(mdd)),
+        "HitRatio": hit,
+    }
+
+
+def summary_table(
+    returns,
+    equity_curve=None,
+    rf: float = 0.0,
+    trading_days: int = 252,
+) -> pd.DataFrame:
+    """
+    `summary_stats` as a DataFrame with one row per column of `returns` (labels are kept
+    when `returns` is a DataFrame) and one column per metric.
+    """
+    stats = summary_stats(returns, equity_curve, rf=rf, trading_days=trading_days)
+    index = returns.columns if isinstance(returns, pd.DataFrame) else None
+    return pd.DataFrame(stats, index=index, columns=SUMMARY_METRICS)
+
+
+# ---------------------------------------------------------------------------
+# Scalar metrics: thin wrappers over the kernels above.
+# ---------------------------------------------------------------------------
 
 def cagr(equity_curve: pd.Series, trading_days: int = 252) -> float:
-    equity_curve = _to_series(equity_curve).dropna()
-    if equity_curve.empty:
-        return np.nan
-    total_return = equity_curve.iloc[-1] / equity_curve.iloc[0] - 1.0
-    years = len(equity_curve) / trading_days
-    if years <= 0:
-        return np.nan
-    return (1 + total_return) ** (1 / years) - 1
+    return _cagr(_as_2d(equity_curve), trading_days)[0]
 
 
 def annualized_vol(returns: pd.Series, trading_days: int = 252) -> float:
-    r = _to_series(returns).dropna()
-    return r.std() * np.sqrt(trading_days)
+    return _moments(_as_2d(returns))[2][0] * np.sqrt(trading_days)
 
 
 def sharpe_ratio(returns: pd.Series, rf: float = 0.0, trading_days: int = 252) -> float:
-    r = _to_series(returns).dropna()
-    excess = r - rf / trading_days
-    denom = excess.std()
-    return np.nan if denom == 0 or np.isnan(denom) else (excess.mean() * trading_days) / (denom * np.sqrt(trading_days))
+    _, mean, std, _ = _moments(_as_2d(returns))
+    return _ratio((mean - rf / trading_days) * trading_days, std * np.sqrt(trading_days))[0]
 
 
 def sortino_ratio(returns: pd.Series, rf: float = 0.0, trading_days: int = 252) -> float:
-    r = _to_series(returns).dropna()
-    downside = r[r < 0]
-    dd_std = downside.std()
-    if dd_std == 0 or np.isnan(dd_std):
-        return np.nan
-    annual_return = (r.mean() - rf / trading_days) * trading_days
-    return annual_return / (dd_std * np.sqrt(trading_days))
+    _, mean, _, rz = _moments(_as_2d(returns))
+    dd_std = _downside_std(rz)
+    return _ratio((mean - rf / trading_days) * trading_days, dd_std * np.sqrt(trading_days))[0]
 
 
 def max_drawdown(equity_curve: pd.Series) -> float:
-    ec = _to_series(equity_curve).dropna()
-    peak = ec.cummax()
-    dd = (ec / peak - 1.0)
-    return dd.min() if not dd.empty else np.nan
+    return _max_drawdown(_as_2d(equity_curve))[0]
 
 
 def calmar_ratio(returns: pd.Series, equity_curve: pd.Series, trading_days: int = 252) -> float:
-    annual_ret = returns.mean() * trading_days
-    mdd = abs(max_drawdown(equity_curve))
-    return np.nan if mdd == 0 or np.isnan(mdd) else annual_ret / mdd
+    _, mean, _, _ = _moments(_as_2d(returns))
+    mdd = np.abs(_max_drawdown(_as_2d(equity_curve)))
+    return _ratio(mean * trading_days, mdd)[0]
 
 
 def hit_ratio(returns: pd.Series) -> float:
-    r = _to_series(returns).dropna()
-    if len(r) == 0:
-        return np.nan
-    return (r > 0).mean()
+    n, _, _, rz = _moments(_as_2d(returns))
+    return (rz > 0).sum(axis=0)[0] / n[0] if n[0] > 0 else np.nan
+
+
+# ---------------------------------------------------------------------------
+# Rolling metrics. Window sums come from one cumulative sum per quantity (differences
+# of two rows), and the rolling max drawdown from running max/min scans over blocks of
+# `window` rows, so every metric costs O(n) per column regardless of the window length.
+# ---------------------------------------------------------------------------
+
+def _window_sums(c: np.ndarray, window: int) -> np.ndarray:
+    # c is a cumulative sum with a leading zero row; row t of the result sums rows
+    # max(0, t - window + 1) .. t of the original.
+    out = c[1:].copy()
+    if window < len(out):  # a longer window never drops a row
+        out[window:] -= c[1:len(c) - window]
+    return out
+
+
+def _rolling_max_drawdown(eq: np.ndarray, window: int) -> np.ndarray:
+    # Split the rows into blocks of `window`. A window ending at t either is a prefix of
+    # t's block or joins a suffix (from s) of the previous block to a prefix (to t) of
+    # t's block; its drawdown is the worst of the suffix's, the prefix's and the trough
+    # of the prefix against the peak of the suffix. Prefix scans run forward, suffix
+    # scans backward, all blocks at once. NaNs are skipped as in `_max_drawdown`.
+    n, k = eq.shape
+    nb = -(-n // window)
+    e = np.full((nb * window, k), np.nan)
+    e[:n] = eq
+    e = e.reshape(nb, window, k)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        peak = np.fmax.accumulate(e, axis=1)
+        prefix_dd = np.fmin.accumulate(e / peak, axis=1)
+        prefix_low = np.fmin.accumulate(e, axis=1)
+        rev = e[:, ::-1]
+        low_after = np.fmin.accumulate(rev, axis=1)  # min from each row to the block end
+        suffix_dd = np.fmin.accumulate(low_after / rev, axis=1)[:, ::-1]
+        suffix_peak = np.fmax.accumulate(rev, axis=1)[:, ::-1]
+    prefix_dd, prefix_low = prefix_dd.reshape(-1, k)[:n], prefix_low.reshape(-1, k)[:n]
+    suffix_dd, suffix_peak = suffix_dd.reshape(-1, k), suffix_peak.reshape(-1, k)
+
+    out = prefix_dd
+    t = np.arange(window, n)
+    t = t[t % window != window - 1]  # otherwise the window is exactly t's block
+    if len(t):
+        s = t - window + 1
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cross = prefix_low[t] / suffix_peak[s]
+        out[t] = np.fmin(np.fmin(out[t], suffix_dd[s]), cross)
+    return out - 1.0
+
+
+def rolling_stats(
+    returns,
+    windows: Union[int, Iterable[int]] = 63,
+    equity_curve=None,
+    rf: float = 0.0,
+    trading_days: int = 252,
+    min_periods: Optional[int] = None,
+    metrics: Optional[Sequence[str]] = None,
+) -> Dict[int, Dict[str, np.ndarray]]:
+    """
+    `summary_stats` over trailing windows, for every row and column of a return matrix.
+
+    Row t for window w holds what `summary_stats` returns for rows ``t - w + 1 .. t``,
+    plus ``"Vol"`` (annualized volatility). All metrics take O(n) time per column and
+    window: sums come from cumulative sums and the max drawdown from block-wise running
+    extremes, never from a per-window loop. The cumulative sums are shared by all the
+    windows of one call.
+
+    Parameters
+    ----------
+    returns : array-like
+        (dates x columns) periodic returns; 1-D is one column.
+    windows : int or iterable of int
+        Window lengths in rows.
+    equity_curve : array-like, optional
+        As in `summary_stats`. CAGR uses the first and last equity value of each window.
+    rf, trading_days : float, int
+        As in `summary_stats`.
+    min_periods : int, optional
+        Non-NaN returns a window needs for a value (default: the window length);
+        rows with fewer are NaN.
+    metrics : sequence of str, optional
+        Subset of `ROLLING_METRICS` to compute (default: all).
+
+    Returns
+    -------
+    dict
+        Window -> {metric name -> (dates x columns) array}.
+    """
+    r = _as_2d(returns)
+    if equity_curve is None:
+        eq = np.cumprod(1 + np.nan_to_num(r, nan=0.0), axis=0)
+    else:
+        eq = _as_2d(equity_curve)
+    windows = [int(windows)] if np.isscalar(windows) else [int(w) for w in windows]
+    metrics = list(ROLLING_METRICS if metrics is None else metrics)
+    unknown = set(metrics) - set(ROLLING_METRICS)
+    if unknown:
+        raise ValueError(f"Unknown metrics {sorted(unknown)}; choose from {ROLLING_METRICS}.")
+    if any(w < 1 for w in windows):
+        raise ValueError("Windows must be positive.")
+
+    valid = ~np.isnan(r)
+    rz = np.where(valid, r, 0.0)
+    # Centre on the column mean before summing squares so long cumulative sums do not
+    # swamp the window variances (the variance is shift-invariant).
+    with np.errstate(invalid="ignore"):
+        centre = np.nan_to_num(np.nanmean(np.where(valid, r, np.nan), axis=0)) if len(r) else 0.0
+    d = np.where(valid, r - centre, 0.0)
+    neg = np.minimum(rz, 0.0)
+
+    def cumsum(x):
+        c = np.zeros((len(x) + 1, x.shape[1]))
+        np.cumsum(x, axis=0, out=c[1:])
+        return c
+
+    need = set(metrics)
+    sums = {"n": cumsum(valid.astype(np.float64))}
+    if need & {"Sharpe", "Sortino", "Calmar", "Vol"}:
+        sums["d"], sums["d2"] = cumsum(d), cumsum(d * d)
+    if "Sortino" in need:
+        sums["neg_n"], sums["neg"], sums["neg2"] = cumsum((neg < 0).astype(np.float64)), \
+            cumsum(neg), cumsum(neg * neg)
+    if "HitRatio" in need:
+        sums["pos"] = cumsum((rz > 0).astype(np.float64))
+
+    root = np.sqrt(trading_days)
+    out: Dict[int, Dict[str, np.ndarray]] = {}
+    for w in windows:
+        n = _window_sums(sums["n"], w)
+        missing = n < max(1 if min_periods is None else min_periods, 1)
+        if min_periods is None:
+            missing |= np.arange(len(r))[:, None] < w - 1
+        res: Dict[str, np.ndarray] = {}
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if "d" in sums:
+                s1, s2 = _window_sums(sums["d"], w), _window_sums(sums["d2"], w)
+                mean = s1 / n + centre
+                std = np.sqrt(np.maximum(s2 - s1 * s1 / n, 0.0) / (n - 1))
+                std[n < 2] = np.nan
+                excess = (mean - rf / trading_days) * trading_days
+                if "Sharpe" in need:
+                    res["Sharpe"] = _ratio(excess, std * root)
+                if "Vol" in need:
+                    res["Vol"] = std * root
+            if "Sortino" in need:
+                k = _window_sums(sums["neg_n"], w)
+                m1, m2 = _window_sums(sums["neg"], w), _window_sums(sums["neg2"], w)
+                var = np.maximum(m2 - m1 * m1 / k, 0.0) / (k - 1)
+                res["Sortino"] = _ratio(excess, np.where(k > 1, np.sqrt(var), np.nan) * root)
+            if "HitRatio" in need:
+                res["HitRatio"] = _window_sums(sums["pos"], w) / n
+            if "CAGR" in need:
+                first = np.full_like(eq, np.nan)
+                if w <= len(eq):
+                    first[w - 1:] = eq[:len(eq) - w + 1]
+                first[:w - 1] = eq[:1]
+                span = np.minimum(np.arange(1, len(eq) + 1), w)[:, None]
+                res["CAGR"] = (eq / first) ** (trading_days / span) - 1
+            if need & {"MaxDrawdown", "Calmar"}:
+                mdd = _rolling_max_drawdown(eq, w)
+                if "MaxDrawdown" in need:
+                    res["MaxDrawdown"] = mdd
+                if "Calmar" in need:
+                    res["Calmar"] = _ratio(mean * trading_days, np.abs(mdd))
+        for v in res.values():
+            v[missing] = np.nan
+        out[w] = {m: res[m] for m in metrics}
+    return out
+
+
+def rolling_table(
+    returns,
+    windows: Union[int, Iterable[int]] = (21, 63, 252),
+    equity_curve=None,
+    rf: float = 0.0,
+    trading_days: int = 252,
+    min_periods: Optional[int] = None,
+    metrics: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    `rolling_stats` as one DataFrame on the index of `returns`, with (window, metric)
+    columns for a Series or 1-D input and (window, metric, column) columns otherwise.
+    """
+    stats = rolling_stats(returns, windows, equity_curve, rf=rf, trading_days=trading_days,
+                          min_periods=min_periods, metrics=metrics)
+    index = returns.index if isinstance(returns, (pd.Series, pd.DataFrame)) else None
+    single = np.ndim(returns) == 1
+    names = returns.columns if isinstance(returns, pd.DataFrame) else None
+    blocks, keys = [], []
+    for w, res in stats.items():
+        for m, v in res.items():
+            blocks.append(v)
+            if single:
+                keys.append((w, m))
+            else:
+                labels = names if names is not None else range(v.shape[1])
+                keys.extend((w, m, c) for c in labels)
+    values = np.concatenate(blocks, axis=1) if blocks else np.empty((len(_as_2d(returns)), 0))
+    columns = pd.MultiIndex.from_tuples(
+        keys, names=["window", "metric"] if single else ["window", "metric", "column"])
+    return pd.DataFrame(values, index=index, columns=columns)
+
+
+def _rolling(metric: str, x, window: int, **kw):
+    # One rolling metric shaped like its input (Series, DataFrame or array).
+    v = rolling_stats(x, window, metrics=[metric], **kw)[window][metric]
+    if isinstance(x, pd.Series):
+        return pd.Series(v[:, 0], index=x.index, name=x.name)
+    if isinstance(x, pd.DataFrame):
+        return pd.DataFrame(v, index=x.index, columns=x.columns)
+    return v[:, 0] if np.ndim(x) == 1 else v
+
+
+def rolling_sharpe(returns, window: int = 63, rf: float = 0.0, trading_days: int = 252,
+                   min_periods: Optional[int] = None):
+    return _rolling("Sharpe", returns, window, rf=rf, trading_days=trading_days,
+                    min_periods=min_periods)
+
+
+def rolling_vol(returns, window: int = 63, trading_days: int = 252,
+                min_periods: Optional[int] = None):
+    return _rolling("Vol", returns, window, trading_days=trading_days, min_periods=min_periods)
+
+
+def rolling_hit_ratio(returns, window: int = 63, min_periods: Optional[int] = None):
+    return _rolling("HitRatio", returns, window, min_periods=min_periods)
+
+
+def rolling_max_drawdown(equity_curve, window: int = 252):
+    """Worst peak-to-trough loss within each trailing `window` of an equity curve."""
+    eq = _as_2d(equity_curve)
+    v = _rolling_max_drawdown(eq, window)
+    v[:window - 1] = np.nan
+    if isinstance(equity_curve, pd.Series):
+        return pd.Series(v[:, 0], index=equity_curve.index, name=equity_curve.name)
+    if isinstance(equity_curve, pd.DataFrame):
+        return pd.DataFrame(v, index=equity_curve.index, columns=equity_curve.columns)
+    return v[:, 0] if np.ndim(equity_curve) == 1 else v
@@ -1 +1,38 @@
-__all__ = ["arima", "garch", "lstm"]
+"""
+Forecasting models. The model classes and functions can be imported from here directly;
+each backing module (and its statsmodels / arch / torch dependency) is loaded on first use.
+"""
+import importlib
+
+_FACADE = {
+    "ArimaForecaster": "arima",
+    "walk_forward_many": "arima",
+    "select_order": "arima",
+    "select_orders": "arima",
+    "GarchVolModel": "garch",
+    "GarchFilter": "garch",
+    "garch_variance_path": "garch",
+    "LSTMConfig": "lstm",
+    "LSTMForecaster": "lstm",
+    "train_lstm": "lstm",
+    "forecast_one": "lstm",
+    "forecast_many": "lstm",
+    "walk_forward_lstm": "lstm",
+    "walk_forward_lstm_many": "lstm",
+    "save_checkpoint": "lstm",
+    "load_checkpoint": "lstm",
+}
+
+__all__ = ["arima", "garch", "lstm", *_FACADE]
+
+
+def __getattr__(name):
+    if name in ("arima", "garch", "lstm"):
+        return importlib.import_module(f"{__name__}.{name}")
+    if name in _FACADE:
+        return getattr(importlib.import_module(f"{__name__}.{_FACADE[name]}"), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
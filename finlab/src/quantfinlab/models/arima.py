@@ -1,24 +1,54 @@
 from __future__ import annotations
 
-from typing import Tuple, Optional
+import os
+import signal
+import threading
+import warnings
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from typing import Dict, List, Mapping, Tuple, Optional
 
 import numpy as np
 import pandas as pd
+import statsmodels
 from statsmodels.tsa.arima.model import ARIMA
 
+from .. import __version__, instrument
+from ..cache import MemoCache, content_hash
+
+Order = Tuple[int, int, int]
+
 
 class ArimaForecaster:
-    def __init__(self, order=(1, 0, 1)):
+    """
+    ARIMA on a single series. ``order="auto"`` picks (p, d, q) with `select_order` (keyword
+    arguments such as ``max_p`` or ``criterion`` are passed through) every time the model
+    is fit; the result is kept in `selection`.
+    """
+
+    def __init__(self, order=(1, 0, 1), **select_kw):
+        self.auto = isinstance(order, str) and order == "auto"
         self.order = order
+        self.select_kw = select_kw
+        self.selection: Optional[OrderSelection] = None
         self._model = None
         self._fit = None
 
+    def _select(self, y: pd.Series) -> None:
+        if self.auto:
+            self.selection = select_order(y, **self.select_kw)
+            self.order = self.selection.order
+
     def fit(self, y: pd.Series):
         y = pd.Series(y).dropna()
+        self._select(y)
         if len(y) < sum(self.order) + 3:
             raise ValueError("Not enough data to fit ARIMA.")
         self._model = ARIMA(y, order=self.order, enforce_stationarity=False, enforce_invertibility=False)
-        self._fit = self._model.fit()
+        with instrument.span("models.arima.fit"):
+            self._fit = self._model.fit()
+        instrument.incr("models.arima.fit_iterations", int(self._fit.mle_retvals.get("iterations", 0)))
         return self
 
     def forecast(self, steps: int = 1) -> pd.Series:
@@ -31,3 +61,422 @@ class ArimaForecaster:
 
     def forecast_one(self) -> float:
         return float(self.forecast(steps=1).iloc[0])
+
+    def walk_forward(
+        self,
+        y: pd.Series,
+        min_train: int = 100,
+        window: Optional[int] = None,
+        refit_every: int = 1,
+        n_jobs: int = 1,
+    ) -> pd.Series:
+        """
+        Out-of-sample one-step-ahead forecasts: the value at date t is forecast from data
+        strictly before t.
+
+        Parameters
+        ----------
+        y : pd.Series
+            Series to forecast (e.g. log returns). NaNs are dropped.
+        min_train : int
+            Observations used for the first fit; forecasts start at position `min_train`.
+        window : int, optional
+            Rolling window length. None uses an expanding window.
+        refit_every : int
+            Re-estimate parameters every `refit_every` steps. Each refit is warm-started
+            from the previous parameters; in between, the new observations are filtered
+            with the current parameters instead of refitting.
+        n_jobs : int
+            Split the forecast range into `n_jobs` contiguous segments run in separate
+            processes (-1 = all cores). Each segment starts with a cold fit, so results
+            can differ slightly from a serial run.
+
+        With ``order="auto"`` the order is selected once, on the first `min_train`
+        observations only.
+
+        Returns
+        -------
+        pd.Series of forecasts indexed like `y[min_train:]`.
+        """
+        y = pd.Series(y).dropna()
+        self._select(y.iloc[:min_train])
+        if len(y) <= min_train or min_train < sum(self.order) + 3:
+            raise ValueError("Not enough data for walk-forward ARIMA.")
+        values = y.to_numpy(dtype=np.float64)
+        scale = _scale(values[:min_train])
+        bounds = np.linspace(min_train, len(values), max(1, _n_workers(n_jobs)) + 1).astype(int)
+        segments = [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+        args = (values, self.order, window, refit_every, scale)
+        if len(segments) == 1:
+            parts = [_walk_forward_segment(*args, *segments[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=len(segments)) as pool:
+                futures = [pool.submit(_walk_forward_segment, *args, a, b) for a, b in segments]
+                parts = [f.result() for f in futures]
+        return pd.Series(np.concatenate(parts), index=y.index[min_train:], name="arima_forecast")
+
+
+def _n_workers(n_jobs: int) -> int:
+    return (os.cpu_count() or 1) if n_jobs < 0 else n_jobs
+
+
+def _scale(x: np.ndarray) -> float:
+    # Fits run on the series divided by a fixed scale: likelihood optimization on raw
+    # daily returns (std ~0.01) often stops early, and a fixed scale keeps warm-start
+    # parameters comparable from one refit to the next.
+    sd = float(np.std(x))
+    return sd if sd > 0 and np.isfinite(sd) else 1.0
+
+
+def _walk_forward_segment(values: np.ndarray, order, window: Optional[int], refit_every: int,
+                          scale: float, start: int, stop: int) -> np.ndarray:
+    x = values / scale
+    out = np.empty(stop - start)
+    res = None
+    params = None
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for k, t in enumerate(range(start, stop)):
+            lo = 0 if window is None else max(0, t - window)
+            if res is None or k % refit_every == 0:
+                model = ARIMA(x[lo:t], order=order, enforce_stationarity=False,
+                              enforce_invertibility=False)
+                res = model.fit(start_params=params)
+                params = res.params
+            elif window is None:
+                res = res.extend(x[t - 1:t])
+            else:
+                res = res.apply(x[lo:t])
+            out[k] = res.forecast(1)[0]
+    return out * scale
+
+
+def walk_forward_many(
+    series: Mapping[str, pd.Series],
+    order=(1, 0, 1),
+    min_train: int = 100,
+    window: Optional[int] = None,
+    refit_every: int = 1,
+    n_jobs: int = -1,
+) -> pd.DataFrame:
+    """
+    `ArimaForecaster.walk_forward` for many tickers, one ticker per worker process.
+
+    Returns a DataFrame of forecasts with one column per ticker.
+    """
+    names = list(series)
+    kw = dict(min_train=min_train, window=window, refit_every=refit_every)
+    if _n_workers(n_jobs) == 1 or len(names) <= 1:
+        cols = [ArimaForecaster(order).walk_forward(series[k], **kw) for k in names]
+    else:
+        with ProcessPoolExecutor(max_workers=_n_workers(n_jobs)) as pool:
+            futures = [pool.submit(ArimaForecaster(order).walk_forward, series[k], **kw)
+                       for k in names]
+            cols = [f.result() for f in futures]
+    return pd.concat([c.rename(k) for k, c in zip(names, cols)], axis=1)
+
+
+# ---------------------------------------------------------------------------
+# Automatic order selection
+# ---------------------------------------------------------------------------
+
+CRITERIA = ("aic", "bic")
+
+# Information criteria per (data, order), shared by every selection in the process. Swap
+# in ``MemoCache(disk_dir=...)`` to keep them across sessions; keys include the library
+# versions, so an upgrade refits instead of reusing old criteria.
+FIT_CACHE = MemoCache(max_bytes=32 * 2**20)
+_FIT_KEY = f"{__name__}.fit"
+_FIT_VERSION = f"quantfinlab {__version__}, statsmodels {statsmodels.__version__}"
+
+
+@dataclass
+class OrderSelection:
+    """Outcome of `select_order`."""
+    order: Order
+    criterion: str
+    score: float
+    scores: Dict[Order, float]  # criterion of every candidate tried (inf: failed fit)
+    n_fits: int                 # fits actually run, i.e. not served from `FIT_CACHE`
+    n_timeouts: int
+
+
+class _FitTimeout(BaseException):
+    # Not an Exception, so statsmodels' own `except Exception` handlers cannot swallow it.
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise _FitTimeout
+
+
+def _fit_criteria(x: np.ndarray, order: Order, timeout: Optional[float]) -> Optional[Tuple[float, float]]:
+    # (aic, bic) of one fit; (inf, inf) when it fails, None when it runs out of time. The
+    # timeout uses SIGALRM, so it only applies on the main thread (always the case in
+    # pool workers).
+    alarm = bool(timeout) and hasattr(signal, "setitimer") \
+        and threading.current_thread() is threading.main_thread()
+    if alarm:
+        previous = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            res = ARIMA(x, order=order, enforce_stationarity=False,
+                        enforce_invertibility=False).fit()
+        aic, bic = float(res.aic), float(res.bic)
+    except _FitTimeout:
+        return None
+    except Exception:  # any failed fit just loses the comparison
+        return np.inf, np.inf
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    return (aic if np.isfinite(aic) else np.inf), (bic if np.isfinite(bic) else np.inf)
+
+
+def _n_diffs(x: np.ndarray, max_d: int, alpha: float = 0.05) -> int:
+    # Difference while the augmented Dickey-Fuller test cannot reject a unit root.
+    from statsmodels.tsa.stattools import adfuller
+
+    d = 0
+    while d < max_d:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            pvalue = adfuller(x, autolag="AIC")[1]
+        if pvalue < alpha:
+            break
+        x = np.diff(x)
+        d += 1
+    return d
+
+
+def _candidates(best: Order, max_p: int, max_q: int) -> List[Order]:
+    p, d, q = best
+    steps = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (1, 1), (-1, 1), (1, -1))
+    return [(p + dp, d, q + dq) for dp, dq in steps if 0 <= p + dp <= max_p and 0 <= q + dq <= max_q]
+
+
+def _search(
+    x: np.ndarray,
+    d: int,
+    known: Dict[Order, Tuple[float, float]],
+    max_p: int,
+    max_q: int,
+    criterion: str,
+    stepwise: bool,
+    timeout: Optional[float],
+    pool: Optional[Executor] = None,
+) -> Tuple[Dict[Order, Optional[Tuple[float, float]]], Order]:
+    """
+    Grid or Hyndman-Khandakar stepwise search over (p, q) for a fixed d. `known` holds
+    criteria that need no fit; each round's new candidates are fit together, on `pool`
+    when given. Returns every result (None = timed out) and the best order.
+    """
+    col = CRITERIA.index(criterion)
+    results: Dict[Order, Optional[Tuple[float, float]]] = {}
+
+    def evaluate(orders):
+        todo = [o for o in dict.fromkeys(orders) if o not in results and o not in known]
+        results.update({o: known[o] for o in orders if o in known})
+        if pool is None or len(todo) <= 1:
+            fits = [_fit_criteria(x, o, timeout) for o in todo]
+        else:
+            fits = list(pool.map(_fit_criteria, repeat(x), todo, repeat(timeout)))
+        results.update(zip(todo, fits))
+
+    def score(o):
+        r = results.get(o)
+        return np.inf if r is None else r[col]
+
+    if not stepwise:
+        evaluate(_grid(d, max_p, max_q))
+        return results, min(results, key=score)
+    evaluate([(min(2, max_p), d, min(2, max_q)), (0, d, 0), (min(1, max_p), d, 0), (0, d, min(1, max_q))])
+    best = min(results, key=score)
+    while True:
+        evaluate(_candidates(best, max_p, max_q))
+        step = min(results, key=score)
+        if score(step) >= score(best):
+            return results, best
+        best = step
+
+
+def _prepare(y, max_p: int, max_d: int, max_q: int) -> Tuple[np.ndarray, str]:
+    values = pd.Series(y).dropna().to_numpy(dtype=np.float64)
+    if len(values) < max_p + max_d + max_q + 3:
+        raise ValueError("Not enough data to select an ARIMA order.")
+    return values / _scale(values), content_hash(_FIT_VERSION, values)
+
+
+def _lookup(fit_cache: MemoCache, data_key: str, orders) -> Dict[Order, Tuple[float, float]]:
+    known = {}
+    for o in orders:
+        hit, value = fit_cache.get((_FIT_KEY, content_hash(data_key, o)))
+        if hit:
+            known[o] = value
+    return known
+
+
+def _store(fit_cache: MemoCache, data_key: str, results, known) -> Tuple[int, int]:
+    fits = timeouts = 0
+    for o, r in results.items():
+        if o in known:
+            continue
+        if r is None:
+            timeouts += 1
+        else:
+            fits += 1
+            fit_cache.put((_FIT_KEY, content_hash(data_key, o)), r)
+    if timeouts:
+        instrument.incr("models.arima.fit_timeouts", timeouts)
+    instrument.incr("models.arima.order_fits", fits + timeouts)
+    return fits + timeouts, timeouts
+
+
+def _grid(d: int, max_p: int, max_q: int) -> List[Order]:
+    return [(p, d, q) for p in range(max_p + 1) for q in range(max_q + 1)]
+
+
+def _selection(results, criterion: str, best: Order, n_fits: int, n_timeouts: int) -> OrderSelection:
+    col = CRITERIA.index(criterion)
+    scores = {o: (np.inf if r is None else r[col]) for o, r in results.items()}
+    if not np.isfinite(scores[best]):
+        raise ValueError("No candidate ARIMA order could be fit.")
+    return OrderSelection(best, criterion, scores[best], scores, n_fits, n_timeouts)
+
+
+def select_order(
+    y: pd.Series,
+    max_p: int = 3,
+    max_d: int = 1,
+    max_q: int = 3,
+    criterion: str = "aic",
+    stepwise: bool = True,
+    n_jobs: int = 1,
+    timeout: Optional[float] = None,
+    fit_cache: Optional[MemoCache] = None,
+) -> OrderSelection:
+    """
+    Choose an ARIMA (p, d, q) for `y` by information criterion.
+
+    d is the number of differences after which an augmented Dickey-Fuller test rejects a
+    unit root (at most `max_d`); p and q are then searched up to `max_p` / `max_q`,
+    either stepwise (Hyndman-Khandakar: start from four small models and move to the
+    best neighbour, +-1 in p and/or q, until nothing improves) or over the full grid.
+
+    Parameters
+    ----------
+    y : pd.Series
+        Series to model (e.g. log returns). NaNs are dropped.
+    max_p, max_d, max_q : int
+    criterion : {"aic", "bic"}
+    stepwise : bool
+        False fits every (p, q) on the grid.
+    n_jobs : int
+        Worker processes for the candidate fits of each step (1 = in-process, -1 = all cores).
+    timeout : float, optional
+        Seconds allowed per fit; fits that run longer count as failed and are not cached.
+    fit_cache : MemoCache, optional
+        Where the criteria of finished fits are kept, keyed on a hash of the data and the
+        order (default: the process-wide `FIT_CACHE`), so repeating a selection, or
+        switching between AIC and BIC, refits nothing.
+
+    Returns
+    -------
+    OrderSelection
+    """
+    if criterion not in CRITERIA:
+        raise ValueError(f"Unknown criterion {criterion!r}; use one of {CRITERIA}.")
+    fit_cache = FIT_CACHE if fit_cache is None else fit_cache
+    x, data_key = _prepare(y, max_p, max_d, max_q)
+    hit, d = fit_cache.get((_FIT_KEY, content_hash(data_key, "d", max_d)))
+    if not hit:
+        d = _n_diffs(x, max_d)
+        fit_cache.put((_FIT_KEY, content_hash(data_key, "d", max_d)), d)
+    known = _lookup(fit_cache, data_key, _grid(d, max_p, max_q))
+    with instrument.span("models.arima.select_order"):
+        if _n_workers(n_jobs) == 1:
+            results, best = _search(x, d, known, max_p, max_q, criterion, stepwise, timeout)
+        else:
+            with ProcessPoolExecutor(max_workers=_n_workers(n_jobs)) as pool:
+                results, best = _search(x, d, known, max_p, max_q, criterion, stepwise, timeout, pool)
+    return _selection(results, criterion, best, *_store(fit_cache, data_key, results, known))
+
+
+def _select_job(x, d, known, max_p, max_d, max_q, criterion, stepwise, timeout):
+    try:
+        if d is None:
+            d = _n_diffs(x, max_d)
+        results, best = _search(x, d, known, max_p, max_q, criterion, stepwise, timeout)
+        return d, results, best, None
+    except Exception as exc:  # one bad series must not sink the batch
+        return d, {}, None, exc
+
+
+def select_orders(
+    series: Mapping[str, pd.Series],
+    max_p: int = 3,
+    max_d: int = 1,
+    max_q: int = 3,
+    criterion: str = "aic",
+    stepwise: bool = True,
+    n_jobs: int = -1,
+    timeout: Optional[float] = 30.0,
+    fit_cache: Optional[MemoCache] = None,
+) -> pd.DataFrame:
+    """
+    `select_order` for a whole universe: each ticker's search runs serially inside one
+    worker process, tickers are spread over `n_jobs` workers, and every fit is limited to
+    `timeout` seconds. Criteria already in `fit_cache` are reused and new ones added.
+
+    Returns
+    -------
+    pd.DataFrame
+        Indexed by ticker with columns p, d, q, the criterion, ``n_fits`` and
+        ``n_timeouts``. Tickers whose selection failed are left out and listed with their
+        error in ``.attrs["failed"]``.
+    """
+    if criterion not in CRITERIA:
+        raise ValueError(f"Unknown criterion {criterion!r}; use one of {CRITERIA}.")
+    fit_cache = FIT_CACHE if fit_cache is None else fit_cache
+    names, jobs, keys, failed = [], [], [], {}
+    for name, y in series.items():
+        try:
+            x, data_key = _prepare(y, max_p, max_d, max_q)
+        except ValueError as exc:
+            failed[name] = exc
+            continue
+        hit, d = fit_cache.get((_FIT_KEY, content_hash(data_key, "d", max_d)))
+        known = _lookup(fit_cache, data_key, _grid(d, max_p, max_q)) if hit else {}
+        names.append(name)
+        keys.append(data_key)
+        jobs.append((x, d if hit else None, known, max_p, max_d, max_q, criterion, stepwise, timeout))
+
+    with instrument.span("models.arima.select_orders"):
+        workers = _n_workers(n_jobs)
+        if workers == 1 or len(jobs) <= 1:
+            outs = [_select_job(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunk = max(1, len(jobs) // (4 * workers))
+                outs = list(pool.map(_select_job, *zip(*jobs), chunksize=chunk))
+
+    rows = {}
+    for name, data_key, job, (d, results, best, exc) in zip(names, keys, jobs, outs):
+        if exc is None:
+            fit_cache.put((_FIT_KEY, content_hash(data_key, "d", max_d)), d)
+            counts = _store(fit_cache, data_key, results, job[2])
+            try:
+                sel = _selection(results, criterion, best, *counts)
+            except ValueError as err:
+                exc = err
+        if exc is not None:
+            failed[name] = exc
+            continue
+        rows[name] = (*sel.order, sel.score, sel.n_fits, sel.n_timeouts)
+    out = pd.DataFrame.from_dict(rows, orient="index",
+                                 columns=["p", "d", "q", criterion, "n_fits", "n_timeouts"])
+    out.attrs["failed"] = failed
+    return out
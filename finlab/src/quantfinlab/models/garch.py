@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import weakref
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Tuple, Union
+
 import numpy as np
 import pandas as pd
 from arch import arch_model
 
+from .. import instrument
+
+ArrayLike = Union[float, np.ndarray]
+
 
 class GarchVolModel:
     """
@@ -19,7 +28,9 @@ class GarchVolModel:
         if len(r) < 50:
             raise ValueError("Need at least ~50 observations for GARCH(1,1).")
         am = arch_model(r * 100, mean="Zero", vol="GARCH", p=1, q=1, dist="normal")
-        self._fit = am.fit(disp="off")
+        with instrument.span("models.garch.fit"):
+            self._fit = am.fit(disp="off")
+        instrument.incr("models.garch.fit_iterations", int(self._fit.optimization_result.nit))
         return self
 
     def forecast_vol(self, horizon: int = 1, trading_days: int = 252) -> float:
@@ -30,3 +41,215 @@ class GarchVolModel:
         daily_var = f.variance.values[-1, -1] / (100**2)  # undo scaling
         daily_std = np.sqrt(daily_var)
         return float(daily_std * np.sqrt(trading_days))
+
+    def params(self) -> Tuple[float, float, float]:
+        """(omega, alpha, beta) in decimal-return units (the fit itself runs on returns * 100)."""
+        if self._fit is None:
+            raise RuntimeError("Call fit() first.")
+        p = self._fit.params
+        return float(p["omega"]) / 100**2, float(p["alpha[1]"]), float(p["beta[1]"])
+
+    def next_variance(self) -> float:
+        """Conditional daily variance of the next, not yet observed, return."""
+        if self._fit is None:
+            raise RuntimeError("Call fit() first.")
+        return float(self._fit.forecast(horizon=1).variance.values[-1, 0]) / 100**2
+
+
+def garch_variance_path(
+    returns: np.ndarray,
+    omega: ArrayLike,
+    alpha: ArrayLike,
+    beta: ArrayLike,
+    sigma2_0: Optional[ArrayLike] = None,
+) -> np.ndarray:
+    """
+    Filter a (dates x series) panel of returns through GARCH(1,1) recursions at once.
+
+    Row t of the result is the conditional variance of ``returns[t]`` given the returns
+    before it: ``s2[t] = omega + alpha * r[t-1]**2 + beta * s2[t-1]``, with ``s2[0]``
+    equal to `sigma2_0` (default: each column's sample variance). Parameters may be
+    scalars or per-series arrays, in decimal-return units. The result has one extra row:
+    the variance of the next, not yet observed, return.
+    """
+    r = np.asarray(returns, dtype=np.float64)
+    squeeze = r.ndim == 1
+    r = r.reshape(len(r), -1)
+    n, m = r.shape
+    omega, alpha, beta = (np.broadcast_to(np.asarray(x, dtype=np.float64), (m,))
+                          for x in (omega, alpha, beta))
+    if sigma2_0 is None:
+        sigma2_0 = np.nanvar(r, axis=0) if n > 1 else np.zeros(m)
+    out = np.empty((n + 1, m))
+    out[0] = sigma2_0
+    r2 = r * r
+    for t in range(n):
+        out[t + 1] = omega + alpha * r2[t] + beta * out[t]
+    return out[:, 0] if squeeze else out
+
+
+class GarchFilter:
+    """
+    Streaming GARCH(1,1) variance filter for one or many return series.
+
+    Holds the conditional variance of the next return and updates it in O(1) per new
+    return, without refitting. Parameters are per series and can be re-estimated on a
+    schedule by a background thread: every `refit_every` updates, the last `refit_window`
+    returns are refit with `GarchVolModel`, and once that finishes the new parameters are
+    swapped in and the buffered returns re-filtered with them. The refit thread is stopped
+    by `close` (or by leaving a ``with GarchFilter(...)`` block), and at the latest when
+    the filter is garbage-collected.
+
+    Parameters
+    ----------
+    omega, alpha, beta : float | np.ndarray
+        GARCH(1,1) parameters in decimal-return units (see `GarchVolModel.params`).
+    sigma2 : float | np.ndarray
+        Conditional variance of the next return.
+    trading_days : int
+        Annualization factor for the vol outputs.
+    refit_every : int, optional
+        Updates between scheduled background refits; None disables refitting.
+    refit_window : int
+        Number of most recent returns kept for refits.
+    """
+
+    def __init__(
+        self,
+        omega: ArrayLike,
+        alpha: ArrayLike,
+        beta: ArrayLike,
+        sigma2: ArrayLike,
+        trading_days: int = 252,
+        refit_every: Optional[int] = None,
+        refit_window: int = 1000,
+    ):
+        self.sigma2 = np.atleast_1d(np.asarray(sigma2, dtype=np.float64)).copy()
+        m = len(self.sigma2)
+        self.omega, self.alpha, self.beta = (
+            np.broadcast_to(np.asarray(x, dtype=np.float64), (m,)).copy() for x in (omega, alpha, beta)
+        )
+        self._scalar = np.ndim(sigma2) == 0
+        self.trading_days = trading_days
+        self.refit_every = refit_every
+        self._history: deque = deque(maxlen=refit_window)
+        self._since_refit = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Optional[Future] = None
+        self._finalizer: Optional[weakref.finalize] = None
+
+    def __enter__(self) -> "GarchFilter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @classmethod
+    def from_model(cls, model: GarchVolModel, **kwargs) -> "GarchFilter":
+        """Start from a fitted `GarchVolModel`, at the end of its sample."""
+        omega, alpha, beta = model.params()
+        return cls(omega, alpha, beta, model.next_variance(), **kwargs)
+
+    @classmethod
+    def from_returns(cls, returns: Union[pd.Series, pd.DataFrame], **kwargs) -> "GarchFilter":
+        """Fit each series (column) once and start filtering after its last return."""
+        frame = returns.to_frame() if isinstance(returns, pd.Series) else returns
+        models = [GarchVolModel().fit(frame[c]) for c in frame.columns]
+        params = np.array([m.params() for m in models])
+        sigma2 = np.array([m.next_variance() for m in models])
+        if isinstance(returns, pd.Series):
+            sigma2 = sigma2[0]
+        f = cls(params[:, 0], params[:, 1], params[:, 2], sigma2, **kwargs)
+        for row in frame.dropna().to_numpy()[-f._history.maxlen:]:
+            f._history.append(row)
+        return f
+
+    # ------------------------------------------------------------------ update
+    def update(self, r: ArrayLike) -> ArrayLike:
+        """Feed the latest return(s); returns the conditional variance of the next one."""
+        self._swap_refit()
+        r = np.asarray(r, dtype=np.float64).reshape(-1)
+        self.sigma2 = self.omega + self.alpha * r * r + self.beta * self.sigma2
+        if self.refit_every:
+            self._history.append(r)
+            self._since_refit += 1
+            if self._since_refit >= self.refit_every and self._pending is None:
+                self._since_refit = 0
+                self._schedule_refit()
+        return self._out(self.sigma2)
+
+    @property
+    def variance(self) -> ArrayLike:
+        return self._out(self.sigma2)
+
+    # ---------------------------------------------------------------- forecast
+    def forecast_variance(self, horizon: int = 1) -> np.ndarray:
+        """
+        Per-step daily variance forecasts for steps 1..horizon, shape (horizon,) or
+        (horizon, series), from the closed-form GARCH(1,1) recursion.
+        """
+        h = np.arange(horizon, dtype=np.float64)[:, None]
+        p = self.alpha + self.beta
+        decay = p ** h
+        with np.errstate(divide="ignore", invalid="ignore"):
+            geo = np.where(np.isclose(p, 1.0), h, (1 - decay) / (1 - p))
+        out = self.omega * geo + decay * self.sigma2
+        return out[:, 0] if self._scalar else out
+
+    def forecast_vol(self, horizon: int = 1) -> ArrayLike:
+        """Annualized vol of the step-`horizon` variance, as `GarchVolModel.forecast_vol`."""
+        v = self.forecast_variance(horizon)[-1]
+        return self._out(np.sqrt(np.atleast_1d(v) * self.trading_days))
+
+    def term_structure(self, horizon: int = 21) -> np.ndarray:
+        """Annualized vol of the average variance over the next 1..horizon steps."""
+        v = self.forecast_variance(horizon)
+        steps = np.arange(1, horizon + 1).reshape((-1,) + (1,) * (v.ndim - 1))
+        return np.sqrt(np.cumsum(v, axis=0) / steps * self.trading_days)
+
+    # ------------------------------------------------------------------- refit
+    def _schedule_refit(self) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+            # must not reference self, or the filter could never be collected
+            self._finalizer = weakref.finalize(self, self._executor.shutdown, wait=False)
+        history = np.array(self._history)
+        self._pending = self._executor.submit(_refit_params, history, self.omega.copy(),
+                                              self.alpha.copy(), self.beta.copy())
+
+    def _swap_refit(self) -> None:
+        if self._pending is None or not self._pending.done():
+            return
+        fut, self._pending = self._pending, None
+        self.omega, self.alpha, self.beta = fut.result()
+        # Re-filter the buffer (which includes returns seen since the refit started)
+        # so the state is consistent with the new parameters.
+        history = np.array(self._history)
+        self.sigma2 = garch_variance_path(history, self.omega, self.alpha, self.beta)[-1]
+
+    def wait_for_refit(self) -> None:
+        """Block until a running background refit finishes and apply it."""
+        if self._pending is not None:
+            self._pending.result()
+            self._swap_refit()
+
+    def close(self) -> None:
+        """Stop the refit thread, waiting for a running refit (which is not applied)."""
+        if self._executor is not None:
+            self._finalizer.detach()
+            self._executor.shutdown(wait=True)
+            self._executor, self._finalizer, self._pending = None, None, None
+
+    def _out(self, x: np.ndarray) -> ArrayLike:
+        return float(x[0]) if self._scalar else x.copy()
+
+
+def _refit_params(history: np.ndarray, omega: np.ndarray, alpha: np.ndarray,
+                  beta: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Series whose refit fails keep their previous parameters.
+    for j in range(history.shape[1]):
+        try:
+            omega[j], alpha[j], beta[j] = GarchVolModel().fit(history[:, j]).params()
+        except Exception:
+            continue
+    return omega, alpha, beta
@@ -1,40 +1,112 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Tuple
+import copy
+import multiprocessing
+import os
+import pathlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, Mapping, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
 import torch
 from torch import nn
-from torch.utils.data import Dataset, DataLoader
+from torch.utils.data import BatchSampler, DataLoader, Dataset, RandomSampler, SubsetRandomSampler
+
+from .. import instrument
+from ..cache import content_hash
+
+SeriesInput = Union[pd.Series, Mapping[str, pd.Series]]
 
 
 class _SeqDataset(Dataset):
-    def __init__(self, series: pd.Series, lookback: int = 20):
-        x = series.values.astype(np.float32)
-        self.X, self.y = [], []
-        for i in range(lookback, len(x)):
-            self.X.append(x[i - lookback:i])
-            self.y.append(x[i])
-        self.X = np.stack(self.X) if self.X else np.zeros((0, lookback), dtype=np.float32)
-        self.y = np.array(self.y, dtype=np.float32)
+    """
+    Lookback windows over one or many series without materializing them.
+
+    All series are concatenated into one float32 buffer and the windows are a strided
+    `sliding_window_view` of it, so memory stays at one copy of the data whatever the
+    lookback. Items are (window, target, series id) for window starts that do not cross a
+    series boundary. Index with an array of positions (see `_loader`) to gather a whole
+    batch in one copy instead of building and stacking per-item tensors.
+    """
+
+    def __init__(self, series: Union[pd.Series, Sequence[pd.Series]], lookback: int = 20):
+        if isinstance(series, pd.Series):
+            series = [series]
+        arrays = [np.asarray(s, dtype=np.float32) for s in series]
+        self.lookback = lookback
+        self.buffer = np.concatenate(arrays) if arrays else np.zeros(0, dtype=np.float32)
+        if len(self.buffer) >= lookback:
+            self.windows = np.lib.stride_tricks.sliding_window_view(self.buffer, lookback)
+        else:
+            self.windows = np.zeros((0, lookback), dtype=np.float32)
+        starts, ids, offset = [], [], 0
+        for k, a in enumerate(arrays):
+            n = max(len(a) - lookback, 0)
+            starts.append(np.arange(offset, offset + n))
+            ids.append(np.full(n, k))
+            offset += len(a)
+        self.starts = np.concatenate(starts) if starts else np.zeros(0, dtype=np.int64)
+        self.series_id = np.concatenate(ids) if ids else np.zeros(0, dtype=np.int64)
 
     def __len__(self):
-        return len(self.y)
+        return len(self.starts)
 
     def __getitem__(self, idx):
-        return torch.tensor(self.X[idx]).unsqueeze(-1), torch.tensor(self.y[idx])
+        idx = np.asarray(idx)
+        s = self.starts[idx]
+        x = torch.from_numpy(np.array(self.windows[s])).unsqueeze(-1)
+        y = torch.from_numpy(np.array(self.buffer[s + self.lookback]))
+        return x, y, torch.from_numpy(np.array(self.series_id[idx]))
+
+
+    def split(self, tail_frac: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Item positions for training and for the held-out last `tail_frac` of each series."""
+        pos = np.arange(len(self))
+        if tail_frac <= 0 or not len(pos):
+            return pos, pos[:0]
+        # items of one series are contiguous, so rank within the series from its end
+        last = np.r_[np.nonzero(np.diff(self.series_id))[0], len(pos) - 1]
+        count = np.diff(np.r_[-1, last])
+        from_end = np.repeat(last, count) - pos
+        held = from_end < np.repeat(np.ceil(count * tail_frac), count)
+        return pos[~held], pos[held]
+
+
+def _loader(ds: _SeqDataset, batch_size: int, shuffle: bool = True,
+            indices: Optional[np.ndarray] = None) -> DataLoader:
+    # The sampler yields index lists, so each batch is a single fancy-indexing gather.
+    if indices is not None:
+        sampler = SubsetRandomSampler(indices.tolist())
+    else:
+        sampler = RandomSampler(ds) if shuffle else range(len(ds))
+    return DataLoader(ds, sampler=BatchSampler(sampler, batch_size, drop_last=False),
+                      batch_size=None)
 
 
 class LSTMForecaster(nn.Module):
-    def __init__(self, input_size: int = 1, hidden_size: int = 32, num_layers: int = 1):
+    """
+    LSTM one-step forecaster. With `num_series` > 0, a learned `embed_dim` embedding of the
+    series id is appended to every input step, so one model can be trained on many tickers.
+    """
+
+    def __init__(self, input_size: int = 1, hidden_size: int = 32, num_layers: int = 1,
+                 num_series: int = 0, embed_dim: int = 4):
         super().__init__()
-        self.lstm = nn.LSTM(input_size=input_size, hidden_size=hidden_size, num_layers=num_layers, batch_first=True)
+        self.embed = nn.Embedding(num_series, embed_dim) if num_series > 0 else None
+        lstm_input = input_size + (embed_dim if self.embed is not None else 0)
+        self.lstm = nn.LSTM(input_size=lstm_input, hidden_size=hidden_size, num_layers=num_layers, batch_first=True)
         self.fc = nn.Linear(hidden_size, 1)
+        self.series_index: Dict[str, int] = {}
 
-    def forward(self, x):
+    def forward(self, x, series_id: Optional[torch.Tensor] = None):
         # x: (batch, seq, features)
+        if self.embed is not None:
+            if series_id is None:
+                raise ValueError("This model was trained on several series; pass series_id.")
+            e = self.embed(series_id).unsqueeze(1).expand(-1, x.shape[1], -1)
+            x = torch.cat([x, e], dim=-1)
         out, _ = self.lstm(x)
         out = out[:, -1, :]  # last step
         out = self.fc(out)
@@ -49,26 +121,98 @@ class LSTMConfig:
     lr: float = 1e-3
     epochs: int = 5
     batch_size: int = 32
+    embed_dim: int = 4  # series-id embedding size when training on several series
+    # Early stopping: hold out the last `val_frac` of each series' windows and stop after
+    # `patience` epochs without a validation improvement, keeping the best weights.
+    # 0 trains for exactly `epochs` on everything.
+    val_frac: float = 0.0
+    patience: int = 3
+    finetune_epochs: int = 3  # per walk-forward refit (see `walk_forward_lstm`)
 
 
-def train_lstm(series: pd.Series, cfg: LSTMConfig = LSTMConfig()) -> Tuple[LSTMForecaster, float]:
-    ds = _SeqDataset(series.dropna(), lookback=cfg.lookback)
-    if len(ds) < 50:
+def _train(
+    series: SeriesInput,
+    cfg: LSTMConfig,
+    model: Optional[LSTMForecaster] = None,
+    opt: Optional[torch.optim.Optimizer] = None,
+    epochs: Optional[int] = None,
+    min_items: int = 50,
+) -> Tuple[LSTMForecaster, torch.optim.Optimizer, float, int]:
+    # Fit `model` (a new one when None) in place with `opt` (a new Adam when None). Also
+    # returns how many trailing items were held out for early stopping and not trained on.
+    multi = not isinstance(series, pd.Series)
+    names = list(series) if multi else []
+    ds = _SeqDataset([series[k].dropna() for k in names] if multi else series.dropna(),
+                     lookback=cfg.lookback)
+    if len(ds) < min_items:
         raise ValueError("Not enough data to train LSTM.")
-    model = LSTMForecaster(input_size=1, hidden_size=cfg.hidden_size, num_layers=cfg.num_layers)
-    opt = torch.optim.Adam(model.parameters(), lr=cfg.lr)
+    if model is None:
+        model = LSTMForecaster(input_size=1, hidden_size=cfg.hidden_size,
+                               num_layers=cfg.num_layers, num_series=len(names),
+                               embed_dim=cfg.embed_dim)
+        model.series_index = {k: i for i, k in enumerate(names)}
+    elif model.series_index != {k: i for i, k in enumerate(names)}:
+        raise ValueError("Warm start needs the same series, in the same order, as the model.")
+    if opt is None:
+        opt = torch.optim.Adam(model.parameters(), lr=cfg.lr)
     loss_fn = nn.MSELoss()
+    epochs = cfg.epochs if epochs is None else epochs
 
-    loader = DataLoader(ds, batch_size=cfg.batch_size, shuffle=True)
+    train_idx, val_idx = ds.split(cfg.val_frac)
+    if not len(train_idx):
+        train_idx, val_idx = val_idx, train_idx
+    loader = _loader(ds, cfg.batch_size, indices=train_idx if len(val_idx) else None)
+    best, best_state, stale, ran = np.inf, None, 0, 0
     model.train()
-    for _ in range(cfg.epochs):
-        for xb, yb in loader:
-            opt.zero_grad()
-            pred = model(xb)
-            loss = loss_fn(pred, yb)
-            loss.backward()
-            opt.step()
-    return model, float(loss.item())
+    with instrument.span("models.lstm.train"):
+        for _ in range(epochs):
+            ran += 1
+            for xb, yb, sb in loader:
+                opt.zero_grad()
+                pred = model(xb, sb if multi else None)
+                loss = loss_fn(pred, yb)
+                loss.backward()
+                opt.step()
+            if not len(val_idx):
+                continue
+            model.eval()
+            with torch.no_grad():
+                xv, yv, sv = ds[val_idx]
+                val = float(loss_fn(model(xv, sv if multi else None), yv))
+            model.train()
+            if val < best:
+                best, stale = val, 0
+                best_state = {k: v.detach().clone() for k, v in model.state_dict().items()}
+            else:
+                stale += 1
+                if stale >= cfg.patience:
+                    instrument.incr("models.lstm.early_stops")
+                    break
+    if best_state is not None:
+        model.load_state_dict(best_state)
+    instrument.incr("models.lstm.epochs", ran)
+    instrument.incr("models.lstm.steps", ran * len(loader))
+    return model, opt, best if best_state is not None else float(loss.item()), len(val_idx)
+
+
+def train_lstm(
+    series: SeriesInput,
+    cfg: LSTMConfig = LSTMConfig(),
+    init: Optional[LSTMForecaster] = None,
+) -> Tuple[LSTMForecaster, float]:
+    """
+    Train an `LSTMForecaster` on one series, or on a {name: series} mapping of many
+    series at once (mixed batches, with a series-id embedding; the name -> id mapping is
+    kept in `model.series_index`).
+
+    With ``cfg.val_frac > 0`` the tail of each series is held out for early stopping and
+    the returned loss is the best validation loss; otherwise it is the last batch's
+    training loss. `init` warm-starts from a copy of an already trained model (same
+    architecture and series) instead of random weights.
+    """
+    model = copy.deepcopy(init) if init is not None else None
+    model, _, loss, _ = _train(series, cfg, model)
+    return model, loss
 
 
 def forecast_one(model: LSTMForecaster, recent_series: pd.Series, lookback: int = 20) -> float:
@@ -77,3 +221,261 @@ def forecast_one(model: LSTMForecaster, recent_series: pd.Series, lookback: int
     with torch.no_grad():
         yhat = model(x).item()
     return float(yhat)
+
+
+def forecast_many(
+    model: LSTMForecaster,
+    recent: Union[pd.DataFrame, Mapping[str, pd.Series]],
+    lookback: int = 20,
+    batch_size: Optional[int] = None,
+) -> pd.Series:
+    """
+    One-step forecasts for a whole universe in batched forward passes.
+
+    Parameters
+    ----------
+    model : LSTMForecaster
+    recent : pd.DataFrame | Mapping[str, pd.Series]
+        Recent history per name (DataFrame columns or mapping values); NaNs are dropped
+        and the last `lookback` values of each are used.
+    lookback : int
+    batch_size : int, optional
+        Names per forward pass; None runs the whole universe in one pass.
+
+    Returns
+    -------
+    pd.Series of forecasts indexed by name.
+    """
+    names = list(recent.columns if isinstance(recent, pd.DataFrame) else recent)
+    windows = np.empty((len(names), lookback), dtype=np.float32)
+    for i, k in enumerate(names):
+        v = np.asarray(recent[k].dropna(), dtype=np.float32)
+        if len(v) < lookback:
+            raise ValueError(f"Need at least {lookback} values for {k}.")
+        windows[i] = v[-lookback:]
+    ids = None
+    if model.embed is not None:
+        missing = [k for k in names if k not in model.series_index]
+        if missing:
+            raise KeyError(f"Series not seen in training: {missing}")
+        ids = torch.tensor([model.series_index[k] for k in names])
+
+    x = torch.from_numpy(windows).unsqueeze(-1)
+    step = batch_size or max(len(names), 1)
+    model.eval()
+    out = []
+    with torch.no_grad():
+        for i in range(0, len(names), step):
+            out.append(model(x[i:i + step], None if ids is None else ids[i:i + step]))
+    preds = torch.cat(out).numpy() if out else np.zeros(0, dtype=np.float32)
+    return pd.Series(preds.astype(np.float64), index=names, name="lstm_forecast")
+
+
+# ---------------------------------------------------------------------------
+# Checkpoints and walk-forward retraining
+# ---------------------------------------------------------------------------
+
+def save_checkpoint(path, model: LSTMForecaster,
+                    optimizer: Optional[torch.optim.Optimizer] = None, **meta) -> None:
+    """
+    Write `model` (architecture and weights), the optimizer state and any `meta` values
+    (numbers, strings, tensors, lists/dicts of those) with ``torch.save``. The file is
+    replaced atomically, so a run killed mid-write keeps the previous checkpoint.
+    """
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    arch = dict(input_size=model.lstm.input_size - (model.embed.embedding_dim if model.embed else 0),
+                hidden_size=model.lstm.hidden_size, num_layers=model.lstm.num_layers,
+                num_series=model.embed.num_embeddings if model.embed else 0,
+                embed_dim=model.embed.embedding_dim if model.embed else 4)
+    state = {"arch": arch, "model": model.state_dict(), "series_index": model.series_index,
+             "optimizer": optimizer.state_dict() if optimizer is not None else None,
+             "meta": meta}
+    tmp = path.with_name(path.name + ".tmp")
+    torch.save(state, tmp)
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path) -> Tuple[LSTMForecaster, Optional[dict], dict]:
+    """Read a `save_checkpoint` file: (model, optimizer state dict or None, meta)."""
+    state = torch.load(path, weights_only=True)
+    model = LSTMForecaster(**state["arch"])
+    model.load_state_dict(state["model"])
+    model.series_index = dict(state["series_index"])
+    return model, state["optimizer"], state["meta"]
+
+
+def _predict_range(model: LSTMForecaster, values: np.ndarray, start: int, stop: int,
+                   lookback: int) -> np.ndarray:
+    # Forecasts for positions start..stop-1, each from the `lookback` values before it.
+    windows = np.lib.stride_tricks.sliding_window_view(values[start - lookback:stop - 1], lookback)
+    model.eval()
+    with torch.no_grad():
+        return model(torch.from_numpy(np.array(windows)).unsqueeze(-1)).numpy()
+
+
+def walk_forward_lstm(
+    y: pd.Series,
+    cfg: LSTMConfig = LSTMConfig(),
+    min_train: int = 500,
+    refit_every: int = 21,
+    checkpoint: Optional[Union[str, os.PathLike]] = None,
+    seed: Optional[int] = None,
+) -> pd.Series:
+    """
+    Out-of-sample one-step LSTM forecasts with periodic warm-started refits.
+
+    The first model is trained on ``y[:min_train]`` as `train_lstm` would. It then
+    forecasts the next `refit_every` values, each from data strictly before it, and is
+    fine-tuned for ``cfg.finetune_epochs`` on just those new values (with `lookback`
+    values of context) before forecasting the next block: the previous weights and Adam
+    state carry over, so a refit costs a few passes over one block instead of full
+    training on everything so far. ``cfg.val_frac`` / ``cfg.patience`` early-stop the
+    initial fit and every refit on the tail of its data; that held-out tail is added to
+    the next refit's new values, so every observation is eventually trained on.
+
+    Parameters
+    ----------
+    y : pd.Series
+        Series to forecast (e.g. log returns). NaNs are dropped.
+    cfg : LSTMConfig
+    min_train : int
+        Observations for the initial fit; forecasts start at position `min_train`.
+    refit_every : int
+        Observations between refits (21 ~ monthly on daily bars).
+    checkpoint : str | PathLike, optional
+        File for the model, optimizer, RNG state and forecasts so far, rewritten after
+        every refit. A later call with the same data prefix, `cfg`, `min_train` and
+        `refit_every` resumes from it and returns the same forecasts as an uninterrupted
+        run; otherwise it is ignored and overwritten.
+    seed : int, optional
+        ``torch.manual_seed`` for the run, for reproducible forecasts.
+
+    Returns
+    -------
+    pd.Series of forecasts indexed like `y[min_train:]`.
+    """
+    y = pd.Series(y).dropna()
+    values = y.to_numpy(dtype=np.float32)
+    n, lookback = len(values), cfg.lookback
+    if n <= min_train or min_train < lookback + 50:
+        raise ValueError("Not enough data for walk-forward LSTM.")
+    if refit_every < 1:
+        raise ValueError("refit_every must be at least 1.")
+    settings = dict(config=asdict(cfg), min_train=min_train, refit_every=refit_every)
+    preds = np.full(n - min_train, np.nan, dtype=np.float32)
+
+    resumed = None
+    if checkpoint is not None and os.path.exists(checkpoint):
+        model, opt_state, meta = load_checkpoint(checkpoint)
+        pos = int(meta.get("position", 0))
+        if (meta.get("settings") == settings and min_train <= pos <= n
+                and meta.get("data") == content_hash(values[:pos])):
+            resumed = model, opt_state, pos, meta
+    if resumed is None:
+        if seed is not None:
+            torch.manual_seed(seed)
+        model, opt, _, held = _train(y.iloc[:min_train], cfg)
+        pos = min_train
+        fresh = pos - held  # first observation not trained on yet
+    else:
+        model, opt_state, pos, meta = resumed
+        fresh = int(meta.get("fresh", pos))
+        opt = torch.optim.Adam(model.parameters(), lr=cfg.lr)
+        if opt_state is not None:
+            opt.load_state_dict(opt_state)
+        preds[:pos - min_train] = meta["forecasts"].numpy()
+        torch.set_rng_state(meta["rng"])
+        instrument.incr("models.lstm.resumes")
+
+    with instrument.span("models.lstm.walk_forward"):
+        while pos < n:
+            if checkpoint is not None:
+                save_checkpoint(checkpoint, model, opt, position=pos, fresh=fresh,
+                                settings=settings,
+                                data=content_hash(values[:pos]), rng=torch.get_rng_state(),
+                                forecasts=torch.from_numpy(preds[:pos - min_train].copy()))
+            stop = min(pos + refit_every, n)
+            preds[pos - min_train:stop - min_train] = _predict_range(model, values, pos, stop,
+                                                                     lookback)
+            if stop < n:
+                recent = y.iloc[fresh - lookback:stop]
+                model, opt, _, held = _train(recent, cfg, model, opt,
+                                             epochs=cfg.finetune_epochs, min_items=1)
+                fresh = stop - held
+                instrument.incr("models.lstm.refits")
+            pos = stop
+    return pd.Series(preds.astype(np.float64), index=y.index[min_train:], name="lstm_forecast")
+
+
+def _init_worker(threads: int) -> None:
+    torch.set_num_threads(threads)
+
+
+def _walk_forward_job(y, kw):
+    try:
+        return walk_forward_lstm(y, **kw), None
+    except Exception as exc:  # one bad series must not sink the batch
+        return None, exc
+
+
+def walk_forward_lstm_many(
+    series: Mapping[str, pd.Series],
+    cfg: LSTMConfig = LSTMConfig(),
+    min_train: int = 500,
+    refit_every: int = 21,
+    checkpoint_dir: Optional[Union[str, os.PathLike]] = None,
+    seed: Optional[int] = None,
+    n_jobs: int = -1,
+    threads_per_worker: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    `walk_forward_lstm` for many tickers, each trained independently in a pool of
+    worker processes.
+
+    Every worker limits torch to `threads_per_worker` intra-op threads (default: the
+    cores divided among the workers), so the processes do not oversubscribe the CPU;
+    small LSTMs run faster as one single-threaded model per core than as one model using
+    all cores. Workers are spawned rather than forked, which is safe with torch's thread
+    pools. With `checkpoint_dir`, each ticker checkpoints to ``<checkpoint_dir>/<name>.pt``,
+    so an interrupted universe run resumes where every ticker left off. With `seed`,
+    results do not depend on `n_jobs`.
+
+    Returns
+    -------
+    pd.DataFrame of forecasts with one column per ticker. Tickers that failed are left
+    out and listed with their error in ``.attrs["failed"]``.
+    """
+    names = list(series)
+    workers = min(os.cpu_count() or 1, len(names)) if n_jobs < 0 else min(n_jobs, len(names))
+    workers = max(workers, 1)
+    threads = threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+    jobs = []
+    for k in names:
+        kw = dict(cfg=cfg, min_train=min_train, refit_every=refit_every, seed=seed,
+                  checkpoint=None if checkpoint_dir is None
+                  else pathlib.Path(checkpoint_dir) / f"{k}.pt")
+        jobs.append((series[k], kw))
+    with instrument.span("models.lstm.walk_forward_many"):
+        if workers == 1:
+            before = torch.get_num_threads()
+            if threads_per_worker:
+                torch.set_num_threads(threads_per_worker)
+            try:
+                outs = [_walk_forward_job(*job) for job in jobs]
+            finally:
+                torch.set_num_threads(before)
+        else:
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                     initializer=_init_worker, initargs=(threads,)) as pool:
+                outs = list(pool.map(_walk_forward_job, *zip(*jobs)))
+    cols, failed = [], {}
+    for k, (pred, exc) in zip(names, outs):
+        if exc is None:
+            cols.append(pred.rename(k))
+        else:
+            failed[k] = exc
+    out = pd.concat(cols, axis=1) if cols else pd.DataFrame()
+    out.attrs["failed"] = failed
+    return out
@@ -0,0 +1,248 @@
+"""
+Online (incremental) counterparts of the indicators in `features.py`.
+
+Every indicator keeps O(window) state at most and updates in O(1) per bar. All of them
+work on one series or on a vector of symbols at once: construct with ``n_series=N`` (or
+seed from a DataFrame / 2-D array) and pass an array of N new values per tick. After the
+same history they agree with the batch functions to floating-point tolerance.
+
+Inputs are assumed finite; forward-fill or drop missing bars before updating.
+"""
+from __future__ import annotations
+
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+ArrayLike = Union[float, np.ndarray]
+History = Union[pd.Series, pd.DataFrame, np.ndarray]
+
+
+def _as_2d(history: History) -> np.ndarray:
+    arr = np.asarray(history, dtype=np.float64)
+    return arr.reshape(len(arr), -1)
+
+
+class _Online:
+    def __init__(self, n_series: Optional[int] = None):
+        self._scalar = n_series is None
+        self.n = 1 if n_series is None else int(n_series)
+        self._reset()
+
+    def _reset(self) -> None:
+        raise NotImplementedError
+
+    def _in(self, x: ArrayLike) -> np.ndarray:
+        arr = np.asarray(x, dtype=np.float64).reshape(-1)
+        if arr.shape != (self.n,):
+            raise ValueError(f"Expected {self.n} value(s) per update, got {arr.shape[0]}.")
+        return arr
+
+    def _out(self, v: np.ndarray) -> ArrayLike:
+        return float(v[0]) if self._scalar else v.copy()
+
+    def seed(self, history: History) -> "_Online":
+        """Reset and load state from a history (Series: one series, DataFrame/2-D: many)."""
+        self._scalar = np.ndim(history) == 1
+        self.n = 1 if self._scalar else np.shape(history)[1]
+        self._reset()
+        self._seed(_as_2d(history))
+        return self
+
+    def _seed(self, hist: np.ndarray) -> None:
+        for row in hist:
+            self._update(row)
+
+    def update(self, x: ArrayLike) -> ArrayLike:
+        """Add one bar (a scalar, or one value per series) and return the new value."""
+        return self._out(self._update(self._in(x)))
+
+    def _update(self, x: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    @property
+    def value(self) -> ArrayLike:
+        return self._out(self._value())
+
+    def _value(self) -> np.ndarray:
+        raise NotImplementedError
+
+
+class RingBuffer:
+    """Fixed-size (window, n) buffer; `push` returns the row that falls out, or None."""
+
+    def __init__(self, window: int, n: int):
+        self.data = np.zeros((window, n))
+        self.window = window
+        self.pos = 0
+        self.count = 0
+
+    def push(self, x: np.ndarray) -> Optional[np.ndarray]:
+        old = self.data[self.pos].copy() if self.count == self.window else None
+        self.data[self.pos] = x
+        self.pos = (self.pos + 1) % self.window
+        self.count = min(self.count + 1, self.window)
+        return old
+
+    def values(self) -> np.ndarray:
+        """Buffered rows in arrival order."""
+        if self.count < self.window:
+            return self.data[:self.count]
+        return np.roll(self.data, -self.pos, axis=0)
+
+
+class RollingMoments(_Online):
+    """
+    Running mean and sample variance over the last `window` values.
+
+    Uses Welford's update extended to sliding windows (add the new value and remove the
+    evicted one in a single step), which avoids the cancellation of plain sums of squares.
+    The state is recomputed exactly from the buffer every ``64 * window`` updates so that
+    rounding cannot accumulate without bound.
+    """
+
+    def __init__(self, window: int, n_series: Optional[int] = None):
+        self.window = int(window)
+        super().__init__(n_series)
+
+    def _reset(self) -> None:
+        self.buffer = RingBuffer(self.window, self.n)
+        self.mean = np.zeros(self.n)
+        self.m2 = np.zeros(self.n)
+        self._updates = 0
+
+    def _seed(self, hist: np.ndarray) -> None:
+        for row in hist[-self.window:]:
+            self.buffer.push(row)
+        self._resync()
+
+    def _resync(self) -> None:
+        vals = self.buffer.values()
+        if len(vals):
+            self.mean = vals.mean(axis=0)
+            self.m2 = ((vals - self.mean) ** 2).sum(axis=0)
+
+    def _update(self, x: np.ndarray) -> np.ndarray:
+        old = self.buffer.push(x)
+        if old is None:
+            delta = x - self.mean
+            self.mean = self.mean + delta / self.buffer.count
+            self.m2 = self.m2 + delta * (x - self.mean)
+        else:
+            new_mean = self.mean + (x - old) / self.window
+            self.m2 = self.m2 + (x - old) * (x - new_mean + old - self.mean)
+            self.mean = new_mean
+        self._updates += 1
+        if self._updates % (64 * self.window) == 0:
+            self._resync()
+        return self._value()
+
+    @property
+    def ready(self) -> bool:
+        return self.buffer.count == self.window
+
+    def variance(self) -> np.ndarray:
+        if not self.ready or self.window < 2:
+            return np.full(self.n, np.nan)
+        return np.maximum(self.m2, 0.0) / (self.window - 1)
+
+    def _value(self) -> np.ndarray:
+        return self.mean.copy() if self.ready else np.full(self.n, np.nan)
+
+
+class OnlineSMA(RollingMoments):
+    """Online `features.sma`."""
+
+
+class OnlineRollingVol(RollingMoments):
+    """Online `features.rolling_vol`: annualized rolling std of returns."""
+
+    def __init__(self, window: int = 20, trading_days: int = 252, n_series: Optional[int] = None):
+        self.trading_days = trading_days
+        super().__init__(window, n_series)
+
+    def _value(self) -> np.ndarray:
+        return np.sqrt(self.variance()) * np.sqrt(self.trading_days)
+
+
+class OnlineZScore(RollingMoments):
+    """Online `features.zscore`: (x - rolling mean) / rolling std, NaN when the std is 0."""
+
+    def _reset(self) -> None:
+        super()._reset()
+        self.last = np.full(self.n, np.nan)
+
+    def _seed(self, hist: np.ndarray) -> None:
+        super()._seed(hist)
+        if len(hist):
+            self.last = hist[-1].copy()
+
+    def _update(self, x: np.ndarray) -> np.ndarray:
+        self.last = x.copy()
+        return super()._update(x)
+
+    def _value(self) -> np.ndarray:
+        sd = np.sqrt(self.variance())
+        sd = np.where(sd == 0, np.nan, sd)
+        return (self.last - self.mean) / sd
+
+
+class OnlineEMA(_Online):
+    """Online `features.ema` (span=window, adjust=False)."""
+
+    def __init__(self, window: int, n_series: Optional[int] = None):
+        self.window = int(window)
+        self.alpha = 2.0 / (window + 1)
+        super().__init__(n_series)
+
+    def _reset(self) -> None:
+        self.state = np.full(self.n, np.nan)
+
+    def _seed(self, hist: np.ndarray) -> None:
+        if len(hist):
+            self.state = pd.DataFrame(hist).ewm(span=self.window, adjust=False).mean().to_numpy()[-1]
+
+    def _update(self, x: np.ndarray) -> np.ndarray:
+        self.state = np.where(np.isnan(self.state), x, (1 - self.alpha) * self.state + self.alpha * x)
+        return self.state
+
+    def _value(self) -> np.ndarray:
+        return self.state
+
+
+class OnlineRSI(_Online):
+    """Online `features.rsi`: Wilder smoothing (alpha = 1/window) of gains and losses."""
+
+    def __init__(self, window: int = 14, n_series: Optional[int] = None):
+        self.window = int(window)
+        self.alpha = 1.0 / window
+        super().__init__(n_series)
+
+    def _reset(self) -> None:
+        self.last = np.full(self.n, np.nan)
+        self.up = np.full(self.n, np.nan)
+        self.down = np.full(self.n, np.nan)
+
+    def _seed(self, hist: np.ndarray) -> None:
+        if len(hist) == 0:
+            return
+        self.last = hist[-1].copy()
+        if len(hist) > 1:
+            delta = pd.DataFrame(np.diff(hist, axis=0))
+            ewm = dict(alpha=self.alpha, adjust=False)
+            self.up = delta.clip(lower=0).ewm(**ewm).mean().to_numpy()[-1]
+            self.down = (-delta.clip(upper=0)).ewm(**ewm).mean().to_numpy()[-1]
+
+    def _update(self, x: np.ndarray) -> np.ndarray:
+        delta = x - self.last
+        self.last = x.copy()
+        up, down = np.maximum(delta, 0.0), -np.minimum(delta, 0.0)
+        a = self.alpha
+        self.up = np.where(np.isnan(self.up), up, (1 - a) * self.up + a * up)
+        self.down = np.where(np.isnan(self.down), down, (1 - a) * self.down + a * down)
+        return self._value()
+
+    def _value(self) -> np.ndarray:
+        rs = self.up / (self.down + 1e-12)
+        return 100 - (100 / (1 + rs))
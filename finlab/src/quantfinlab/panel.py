@@ -0,0 +1,242 @@
+"""
+A compact OHLCV container for many tickers.
+
+`PricePanel` keeps every field of every ticker in one contiguous (field x date x ticker)
+array over a shared date index, optionally as float32. "One field for all tickers" is a
+contiguous (date x ticker) slice and "all fields of one ticker" a strided (field x date)
+slice, so both are views found by dictionary lookup, never copies. Forward-filled values
+are tracked in a bit-packed mask, so the fill stays reversible::
+
+    panel = get_price_panel(["AAPL", "MSFT"], start="2015-01-01", dtype=np.float32)
+    closes = panel.field("Adj Close")        # DataFrame over a view of the array
+    aapl = panel.close("AAPL")               # Series over a view
+    raw = panel.values("Close", filled=False)  # forward-filled values back to NaN
+
+`PricePanel.from_frame` / `to_frame` convert from and to the (Ticker, Field) column
+layout returned by `data.get_price_data`.
+"""
+from __future__ import annotations
+
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ("Open", "High", "Low", "Close", "Adj Close", "Volume")
+
+
+def _ffill_dates(a: np.ndarray) -> np.ndarray:
+    # In-place forward fill of a (date x ticker) array down the dates; returns the mask
+    # of values that were filled (NaN before, a valid value after).
+    nan = np.isnan(a)
+    if not nan.any():
+        return np.zeros(a.shape, dtype=bool)
+    src = np.where(nan, 0, np.arange(1, len(a) + 1)[:, None])
+    np.maximum.accumulate(src, axis=0, out=src)
+    filled = nan & (src > 0)
+    rows, cols = np.nonzero(filled)
+    a[rows, cols] = a[src[rows, cols] - 1, cols]
+    return filled
+
+
+def _keys(index: pd.Index) -> np.ndarray:
+    # sortable values of an index: UTC nanoseconds for datetimes
+    if isinstance(index, pd.DatetimeIndex):
+        return index.as_unit("ns").asi8
+    return index.to_numpy()
+
+
+class PricePanel:
+    """
+    OHLCV for many tickers as one (field x date x ticker) array.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        (fields x dates x tickers) values; made C-contiguous in `dtype`.
+    index : pd.DatetimeIndex
+        The shared dates.
+    tickers, fields : sequence of str
+    filled : np.ndarray, optional
+        Boolean array shaped like `data` marking forward-filled values.
+    dtype : numpy dtype
+        float64 (default) or float32, which halves the memory.
+    """
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        index: pd.Index,
+        tickers: Sequence[str],
+        fields: Sequence[str] = FIELDS,
+        filled: Optional[np.ndarray] = None,
+        dtype=np.float64,
+    ):
+        self.data = np.ascontiguousarray(data, dtype=dtype)
+        self.index = pd.Index(index)
+        self.tickers = list(tickers)
+        self.fields = list(fields)
+        if self.data.shape != (len(self.fields), len(self.index), len(self.tickers)):
+            raise ValueError(f"data has shape {self.data.shape}, expected "
+                             f"{(len(self.fields), len(self.index), len(self.tickers))}.")
+        self._field_pos = {f: i for i, f in enumerate(self.fields)}
+        self._ticker_pos = {t: i for i, t in enumerate(self.tickers)}
+        if filled is None:
+            filled = np.zeros(self.data.shape, dtype=bool)
+        self._filled = np.packbits(filled, axis=2)  # one bit per value
+        self.failed: Dict[str, str] = {}  # tickers that did not load (see get_price_panel)
+
+    # -- construction -------------------------------------------------------------------
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: Mapping[str, pd.DataFrame],
+        fields: Optional[Sequence[str]] = None,
+        dtype=np.float64,
+        ffill: bool = True,
+    ) -> "PricePanel":
+        """
+        Panel from per-ticker OHLCV frames (as read from the `PriceStore`) on the union of
+        their dates. Missing fields are NaN; with `ffill`, gaps are forward-filled per
+        ticker and field and recorded in the fill mask.
+        """
+        if not frames:
+            raise ValueError("No frames to build a panel from.")
+        # one sort of all dates instead of thousands of pairwise unions
+        keys = [_keys(df.index) for df in frames.values()]
+        dates = np.unique(np.concatenate(keys))
+        first = next(iter(frames.values())).index
+        if isinstance(first, pd.DatetimeIndex):
+            index = pd.DatetimeIndex(dates.astype("datetime64[ns]"), name=first.name)
+            if first.tz is not None:
+                index = index.tz_localize("UTC").tz_convert(first.tz)
+        else:
+            index = pd.Index(dates, name=first.name)
+        if fields is None:
+            present = {c for df in frames.values() for c in df.columns}
+            fields = [f for f in FIELDS if f in present] + sorted(present - set(FIELDS))
+        data = np.full((len(fields), len(index), len(frames)), np.nan, dtype=dtype)
+        for j, (df, key) in enumerate(zip(frames.values(), keys)):
+            rows = np.searchsorted(dates, key)
+            if list(df.columns) != list(fields):
+                df = df.reindex(columns=fields)
+            data[:, rows, j] = df.to_numpy(dtype=dtype).T
+        return cls._finish(data, index, list(frames), fields, dtype, ffill)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, dtype=np.float64, ffill: bool = False) -> "PricePanel":
+        """
+        Panel from a wide frame with (Ticker, Field) MultiIndex columns, the layout of
+        `data.get_price_data`. `ffill` fills remaining gaps and marks them; values the
+        frame already forward-filled cannot be told apart and are not marked.
+        """
+        if not isinstance(df.columns, pd.MultiIndex):
+            raise ValueError("Expected (Ticker, Field) MultiIndex columns.")
+        tickers = list(df.columns.get_level_values(0).unique())
+        present = set(df.columns.get_level_values(1))
+        fields = [f for f in FIELDS if f in present] + sorted(present - set(FIELDS))
+        full = pd.MultiIndex.from_product([tickers, fields])
+        wide = df if df.columns.equals(full) else df.reindex(columns=full)
+        # (dates, tickers * fields) -> (fields, dates, tickers)
+        values = wide.to_numpy(dtype=dtype).reshape(len(df), len(tickers), len(fields))
+        data = np.ascontiguousarray(values.transpose(2, 0, 1))
+        return cls._finish(data, df.index, tickers, fields, dtype, ffill)
+
+    @classmethod
+    def _finish(cls, data, index, tickers, fields, dtype, ffill) -> "PricePanel":
+        panel = cls(data, index, tickers, fields, dtype=dtype)
+        if ffill:
+            for i in range(len(fields)):
+                panel._filled[i] = np.packbits(_ffill_dates(panel.data[i]), axis=1)
+        return panel
+
+    # -- views --------------------------------------------------------------------------
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.data.nbytes + self._filled.nbytes)
+
+    def _field(self, field: str) -> int:
+        try:
+            return self._field_pos[field]
+        except KeyError:
+            raise KeyError(f"No field {field!r}; have {self.fields}.") from None
+
+    def _ticker(self, ticker: str) -> int:
+        try:
+            return self._ticker_pos[ticker]
+        except KeyError:
+            raise KeyError(f"No ticker {ticker!r}.") from None
+
+    def values(self, field: str, filled: bool = True) -> np.ndarray:
+        """
+        (date x ticker) array of one field: a view of the panel, or with
+        ``filled=False`` a copy where forward-filled values are NaN again.
+        """
+        out = self.data[self._field(field)]
+        if filled:
+            return out
+        out = out.copy()
+        out[self.filled(field)] = np.nan
+        return out
+
+    def field(self, field: str) -> pd.DataFrame:
+        """(date x ticker) DataFrame of one field over a view of the array."""
+        return pd.DataFrame(self.data[self._field(field)], index=self.index,
+                            columns=pd.Index(self.tickers), copy=False)
+
+    def ticker(self, ticker: str) -> pd.DataFrame:
+        """(date x field) DataFrame of one ticker over a (strided) view of the array."""
+        return pd.DataFrame(self.data[:, :, self._ticker(ticker)].T, index=self.index,
+                            columns=pd.Index(self.fields), copy=False)
+
+    def series(self, field: str, ticker: str) -> pd.Series:
+        """One field of one ticker as a Series over a view."""
+        return pd.Series(self.data[self._field(field), :, self._ticker(ticker)], index=self.index,
+                         name=ticker, copy=False)
+
+    def close(self, ticker: str) -> pd.Series:
+        """Adjusted close when present, else close; what `data.to_close_series` returns."""
+        return self.series("Adj Close" if "Adj Close" in self._field_pos else "Close", ticker)
+
+    def filled(self, field: Optional[str] = None) -> np.ndarray:
+        """
+        Boolean mask of forward-filled values: (date x ticker) for one field, or
+        (field x date x ticker) for all.
+        """
+        n = len(self.tickers)
+        if field is None:
+            return np.unpackbits(self._filled, axis=2, count=n).astype(bool)
+        return np.unpackbits(self._filled[self._field(field)], axis=1, count=n).astype(bool)
+
+    # -- conversion ---------------------------------------------------------------------
+
+    def select(self, tickers: Optional[Sequence[str]] = None, start=None, end=None) -> "PricePanel":
+        """Sub-panel of some tickers and/or a date range (copies the selected part)."""
+        rows = self.index.slice_indexer(start, end)
+        cols = (np.arange(len(self.tickers)) if tickers is None
+                else np.array([self._ticker(t) for t in tickers], dtype=np.intp))
+        names = [self.tickers[j] for j in cols]
+        return PricePanel(self.data[:, rows][:, :, cols], self.index[rows], names, self.fields,
+                          filled=self.filled()[:, rows][:, :, cols], dtype=self.data.dtype)
+
+    def to_frame(self, filled: bool = True) -> pd.DataFrame:
+        """
+        Wide float64 DataFrame with (Ticker, Field) columns, as `get_price_data` returns.
+        ``filled=False`` restores the NaNs the forward fill replaced.
+        """
+        data = self.data.astype(np.float64)
+        if not filled:
+            data[self.filled()] = np.nan
+        values = data.transpose(1, 2, 0).reshape(len(self.index), -1)
+        columns = pd.MultiIndex.from_product([self.tickers, self.fields])
+        return pd.DataFrame(values, index=self.index, columns=columns)
+
+    def __repr__(self) -> str:
+        return (f"PricePanel({len(self.fields)} fields x {len(self.index)} dates x "
+                f"{len(self.tickers)} tickers, {self.data.dtype}, {self.nbytes / 2**20:.1f} MB)")
@@ -1,37 +1,163 @@
+"""
+Equity, drawdown and signal plots, plus headless batch reports.
+
+matplotlib and plotly are imported inside the functions that draw, so importing this
+module (e.g. for `downsample`) does not pay for them.
+"""
 from __future__ import annotations
 
-from typing import Optional
+import os
+import pathlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
 
+if TYPE_CHECKING:
+    from .backtest import BacktestResult
+
+# ---------------------------------------------------------------------------
+# Downsampling
+# ---------------------------------------------------------------------------
+
+
+def _x_values(index: pd.Index) -> np.ndarray:
+    if isinstance(index, pd.DatetimeIndex):
+        return index.asi8.astype(np.float64)
+    if pd.api.types.is_numeric_dtype(index):
+        return index.to_numpy(dtype=np.float64)
+    return np.arange(len(index), dtype=np.float64)
+
+
+def _lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    # Largest-Triangle-Three-Buckets: per bucket, keep the point forming the largest
+    # triangle with the previously kept point and the mean of the next bucket.
+    n = len(x)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        nlo = hi
+        nhi = edges[i + 2] if i + 2 < len(edges) else n
+        nhi = max(nhi, nlo + 1)
+        avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return np.unique(out)
+
+
+def _minmax(y: np.ndarray, n_out: int) -> np.ndarray:
+    # The minimum and maximum of each of n_out / 2 buckets, plus both end points.
+    n = len(y)
+    edges = np.linspace(0, n, max(1, n_out // 2) + 1).astype(np.int64)
+    keep = [0, n - 1]
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if hi > lo:
+            keep += [lo + int(np.argmin(y[lo:hi])), lo + int(np.argmax(y[lo:hi]))]
+    return np.unique(keep)
+
+
+def downsample(series: pd.Series, max_points: int = 2000, method: str = "lttb") -> pd.Series:
+    """
+    Reduce `series` to at most about `max_points` of its own points, keeping its visual shape.
+
+    ``"lttb"`` (Largest-Triangle-Three-Buckets) keeps the points that carry the most
+    visible area; ``"minmax"`` keeps every bucket's extremes, so peaks and troughs (e.g.
+    the maximum drawdown) are never lost. NaNs are dropped; shorter series are returned
+    unchanged.
+    """
+    s = series.dropna()
+    if len(s) <= max_points or max_points < 3:
+        return s
+    y = s.to_numpy(dtype=np.float64)
+    if method == "lttb":
+        keep = _lttb(_x_values(s.index), y, max_points)
+    elif method == "minmax":
+        keep = _minmax(y, max_points)
+    else:
+        raise ValueError(f"Unknown downsampling method {method!r}; use 'lttb' or 'minmax'.")
+    return s.iloc[keep]
+
+
+# ---------------------------------------------------------------------------
+# Plots. With `path`, figures are rendered headless (Agg canvas / HTML file) and nothing
+# is shown; without it they are shown interactively as before.
+# ---------------------------------------------------------------------------
+
+
+def _figure(figsize, path: Optional[str]):
+    if path is None:
+        import matplotlib.pyplot as plt
+
+        return plt.subplots(figsize=figsize)
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
 
-def plot_equity_curve(equity: pd.Series, title: str = "Equity Curve"):
-    fig, ax = plt.subplots(figsize=(10, 4))
-    equity.plot(ax=ax)
+
+def _finish(fig, path: Optional[str], dpi: int = 100) -> None:
+    fig.tight_layout()
+    if path is None:
+        import matplotlib.pyplot as plt
+
+        plt.show()
+    else:
+        fig.savefig(path, dpi=dpi)
+
+
+def _line_figure(series: pd.Series, title: str, ylabel: str, figsize, path: Optional[str],
+                 max_points: Optional[int], method: str):
+    if max_points is not None:
+        series = downsample(series, max_points, method)
+    fig, ax = _figure(figsize, path)
+    series.plot(ax=ax)
     ax.set_title(title)
     ax.set_xlabel("Date")
-    ax.set_ylabel("Equity")
-    plt.tight_layout()
-    plt.show()
+    ax.set_ylabel(ylabel)
+    _finish(fig, path)
+    return fig
+
 
+def plot_equity_curve(equity: pd.Series, title: str = "Equity Curve", path: Optional[str] = None,
+                      max_points: Optional[int] = None):
+    """
+    Equity curve. `path` saves the figure (PNG, SVG, ...) headless instead of showing it;
+    `max_points` LTTB-downsamples long curves first.
+    """
+    return _line_figure(equity, title, "Equity", (10, 4), path, max_points, "lttb")
 
-def plot_drawdown(equity: pd.Series, title: str = "Drawdown"):
+
+def plot_drawdown(equity: pd.Series, title: str = "Drawdown", path: Optional[str] = None,
+                  max_points: Optional[int] = None):
+    """
+    Drawdown from the running peak, computed on the full curve. `max_points` downsamples
+    with min/max bucketing so the deepest troughs survive. `path` as in `plot_equity_curve`.
+    """
     peak = equity.cummax()
     dd = equity / peak - 1.0
-    fig, ax = plt.subplots(figsize=(10, 2.5))
-    dd.plot(ax=ax)
-    ax.set_title(title)
-    ax.set_xlabel("Date")
-    ax.set_ylabel("Drawdown")
-    plt.tight_layout()
-    plt.show()
+    return _line_figure(dd, title, "Drawdown", (10, 2.5), path, max_points, "minmax")
+
 
+def plot_price_with_signals(price: pd.Series, signal: pd.Series, title: str = "Price & Signals",
+                            path: Optional[str] = None, max_points: Optional[int] = None):
+    """
+    Interactive Plotly chart of price and signal x price. `path` writes it instead of
+    showing it: ``.html`` as a standalone page loading plotly.js from the CDN, any other
+    suffix as a static image (needs `kaleido`). `max_points` LTTB-downsamples the price
+    and takes the signal at the kept dates.
+    """
+    import plotly.graph_objects as go
 
-def plot_price_with_signals(price: pd.Series, signal: pd.Series, title: str = "Price & Signals"):
-    # Interactive Plotly chart
     df = pd.DataFrame({"price": price, "signal": signal.reindex(price.index).ffill().fillna(0.0)})
+    if max_points is not None:
+        df = df.loc[downsample(df["price"], max_points).index]
     fig = go.Figure()
     fig.add_trace(go.Scatter(x=df.index, y=df["price"], name="Price", mode="lines"))
     fig.add_trace(go.Scatter(x=df.index, y=(df["signal"] * df["price"]), name="Signal x Price", mode="lines", yaxis="y2"))
@@ -43,4 +169,78 @@ def plot_price_with_signals(price: pd.Series, signal: pd.Series, title: str = "P
         legend=dict(orientation="h"),
         height=500,
     )
-    fig.show()
+    if path is None:
+        fig.show()
+    elif str(path).endswith(".html"):
+        fig.write_html(path, include_plotlyjs="cdn")
+    else:
+        fig.write_image(path)
+    return fig
+
+
+# ---------------------------------------------------------------------------
+# Batch reports
+# ---------------------------------------------------------------------------
+
+
+def render_report(
+    name: str,
+    equity: pd.Series,
+    out_dir: str | os.PathLike,
+    price: Optional[pd.Series] = None,
+    positions: Optional[pd.Series] = None,
+    max_points: int = 2000,
+) -> List[str]:
+    """
+    Write ``{name}_equity.png``, ``{name}_drawdown.png`` and, when `price` and
+    `positions` are given, ``{name}_signals.html`` to `out_dir`. Returns the paths.
+    """
+    out = pathlib.Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    paths = [str(out / f"{name}_equity.png"), str(out / f"{name}_drawdown.png")]
+    plot_equity_curve(equity, title=f"{name} Equity", path=paths[0], max_points=max_points)
+    plot_drawdown(equity, title=f"{name} Drawdown", path=paths[1], max_points=max_points)
+    if price is not None and positions is not None:
+        paths.append(str(out / f"{name}_signals.html"))
+        plot_price_with_signals(price, positions, title=f"{name} Price & Signal", path=paths[2],
+                                max_points=max_points)
+    return paths
+
+
+def render_reports(
+    results: Mapping[str, BacktestResult],
+    out_dir: str | os.PathLike,
+    prices: Optional[Mapping[str, pd.Series]] = None,
+    max_points: int = 2000,
+    n_jobs: int = -1,
+) -> Dict[str, List[str]]:
+    """
+    Render `render_report` for many backtests (name -> `BacktestResult`) on a process pool.
+
+    Parameters
+    ----------
+    results : Mapping[str, BacktestResult]
+    out_dir : str | PathLike
+    prices : Mapping[str, pd.Series], optional
+        Price per name, to add the price & position chart.
+    max_points : int
+        Points per plotted line after downsampling.
+    n_jobs : int
+        Worker processes (1 = in-process, -1 = all cores).
+
+    Returns
+    -------
+    dict
+        Name -> written file paths.
+    """
+    prices = prices or {}
+    jobs = [(name, bt.equity_curve, out_dir, prices.get(name),
+             bt.positions if name in prices else None, max_points)
+            for name, bt in results.items()]
+    if n_jobs == 1 or len(jobs) <= 1:
+        paths = [render_report(*job) for job in jobs]
+    else:
+        workers = os.cpu_count() if n_jobs < 0 else n_jobs
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            paths = list(pool.map(render_report, *zip(*jobs)))
+    return {job[0]: p for job, p in zip(jobs, paths)}
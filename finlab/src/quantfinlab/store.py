@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import re
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+_META_FILE = "meta.json"
+_INDEX_FILE = "index.i8"
+_DTYPE = np.dtype("<f8")
+_INDEX_DTYPE = np.dtype("<i8")
+# A fetch ending this close to today may still be missing bars the source has not
+# published yet, so it only counts as covered up to its last bar.
+_UNSETTLED = pd.Timedelta(days=7)
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._=^-]", "_", name)
+
+
+def _column_file(i: int) -> str:
+    return f"col{i}.f8"
+
+
+def _index_ns(index: pd.DatetimeIndex) -> np.ndarray:
+    # tz-aware indexes are stored as UTC nanoseconds, naive ones as-is.
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.as_unit("ns").asi8.astype(_INDEX_DTYPE, copy=False)
+
+
+def _bound_ns(ts: pd.Timestamp, tz: Optional[str]) -> int:
+    ts = pd.Timestamp(ts)
+    if tz is not None:
+        ts = ts.tz_localize(tz) if ts.tzinfo is None else ts.tz_convert(tz)
+        return ts.tz_convert("UTC").tz_localize(None).as_unit("ns").value
+    if ts.tzinfo is not None:
+        ts = ts.tz_localize(None)
+    return ts.as_unit("ns").value
+
+
+def _fetched_until(df: pd.DataFrame, end: pd.Timestamp) -> pd.Timestamp:
+    # End of the range a non-empty fetch for [.., end) may be recorded as covering.
+    end = pd.Timestamp(end)
+    settled = pd.Timestamp.today().normalize() - _UNSETTLED
+    if end <= settled:
+        return end
+    last = pd.Timestamp(df.index.max())
+    if last.tzinfo is not None:  # bounds are wall times in the data's zone (see _bound_ns)
+        last = last.tz_localize(None)
+    return min(end, max(last, settled))
+
+
+class PriceStore:
+    """
+    Binary columnar price store with one directory per (ticker, interval).
+
+    Each directory holds the datetime index as raw int64 nanoseconds, one raw float64
+    file per OHLCV column and a small JSON header recording the row count and the
+    date range that has already been requested from the data source ("coverage").
+    Reads memory-map the column files and slice them by binary search on the index,
+    so no text is parsed. New bars at the tail are appended to the files in place;
+    only extending the head rewrites them.
+
+    Parameters
+    ----------
+    root : str | os.PathLike
+        Directory under which the per-ticker stores are kept.
+    """
+
+    def __init__(self, root: str | os.PathLike):
+        self.root = pathlib.Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------------ layout
+    def path(self, ticker: str, interval: str) -> pathlib.Path:
+        return self.root / f"{_safe_name(ticker)}_{_safe_name(interval)}"
+
+    def _read_meta(self, ticker: str, interval: str) -> Optional[dict]:
+        meta_file = self.path(ticker, interval) / _META_FILE
+        if not meta_file.exists():
+            return None
+        with open(meta_file, "r", encoding="utf-8") as fh:
+            meta = json.load(fh)
+        return meta if meta.get("covered") else None
+
+    def _write_meta(self, directory: pathlib.Path, meta: dict) -> None:
+        tmp = directory / (_META_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(meta, fh)
+        os.replace(tmp, directory / _META_FILE)
+
+    # ---------------------------------------------------------------- coverage
+    def coverage(self, ticker: str, interval: str) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """Half-open [start, end) range already fetched for this ticker, or None."""
+        meta = self._read_meta(ticker, interval)
+        if meta is None:
+            return None
+        lo, hi = meta["covered"]
+        return pd.Timestamp(lo), pd.Timestamp(hi)
+
+    def missing(
+        self, ticker: str, interval: str, start: pd.Timestamp, end: pd.Timestamp
+    ) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """Sub-ranges of [start, end) that are not yet covered: at most a head and a tail."""
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        if end <= start:
+            return []
+        cov = self.coverage(ticker, interval)
+        if cov is None:
+            return [(start, end)]
+        lo, hi = cov
+        gaps = []
+        if start < lo:
+            gaps.append((start, min(lo, end)))
+        if end > hi:
+            gaps.append((max(hi, start), end))
+        return gaps
+
+    # -------------------------------------------------------------------- read
+    def read(
+        self,
+        ticker: str,
+        interval: str,
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None,
+    ) -> pd.DataFrame:
+        """
+        Return the stored bars in [start, end) as a DataFrame (empty if nothing is stored).
+        """
+        meta = self._read_meta(ticker, interval)
+        if meta is None or meta["rows"] == 0:
+            return pd.DataFrame(columns=meta["columns"] if meta else [])
+        directory = self.path(ticker, interval)
+        rows, tz = meta["rows"], meta["tz"]
+        idx = np.memmap(directory / _INDEX_FILE, dtype=_INDEX_DTYPE, mode="r", shape=(rows,))
+        i0 = 0 if start is None else int(np.searchsorted(idx, _bound_ns(start, tz), side="left"))
+        i1 = rows if end is None else int(np.searchsorted(idx, _bound_ns(end, tz), side="left"))
+        i1 = max(i0, i1)
+
+        index = pd.DatetimeIndex(np.array(idx[i0:i1]).view("M8[ns]"), name=meta["index_name"])
+        if tz is not None:
+            index = index.tz_localize("UTC").tz_convert(tz)
+        cols = {}
+        for i, col in enumerate(meta["columns"]):
+            mm = np.memmap(directory / _column_file(i), dtype=_DTYPE, mode="r", shape=(rows,))
+            cols[col] = np.array(mm[i0:i1])
+        return pd.DataFrame(cols, index=index, columns=meta["columns"])
+
+    def column(self, ticker: str, interval: str, column: str = "Close") -> np.memmap:
+        """
+        Read-only memory map over one stored column (the whole history, oldest first),
+        for streaming consumers such as `backtest.backtest_chunked` that should not load it.
+        """
+        meta = self._read_meta(ticker, interval)
+        if meta is None or column not in meta["columns"]:
+            raise KeyError(f"No stored {column!r} column for {ticker} ({interval}).")
+        if meta["rows"] == 0:
+            return np.zeros(0, dtype=_DTYPE)
+        i = meta["columns"].index(column)
+        return np.memmap(self.path(ticker, interval) / _column_file(i), dtype=_DTYPE, mode="r",
+                         shape=(meta["rows"],))
+
+    # ------------------------------------------------------------------- write
+    def write(
+        self, ticker: str, interval: str, df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp
+    ) -> None:
+        """Replace whatever is stored for this ticker with `df`, covering [start, end)."""
+        directory = self.path(ticker, interval)
+        directory.mkdir(parents=True, exist_ok=True)
+        df = df.sort_index()
+        df = df[~df.index.duplicated(keep="last")]
+        index = pd.DatetimeIndex(df.index)
+        meta = {
+            "columns": [str(c) for c in df.columns],
+            "rows": 0,
+            "tz": None if index.tz is None else str(index.tz),
+            "index_name": index.name or "Date",
+            "covered": None,
+        }
+        # Invalidate first so a crash between file replacements cannot leave a header that
+        # points at a mix of old and new columns.
+        self._write_meta(directory, meta)
+        self._replace(directory / _INDEX_FILE, _index_ns(index))
+        for i, col in enumerate(df.columns):
+            self._replace(directory / _column_file(i), df[col].to_numpy(dtype=_DTYPE))
+        meta["rows"] = len(df)
+        meta["covered"] = [str(pd.Timestamp(start)), str(pd.Timestamp(end))]
+        self._write_meta(directory, meta)
+
+    def merge(
+        self, ticker: str, interval: str, df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp
+    ) -> None:
+        """
+        Add bars fetched for [start, end), which must touch or overlap the stored coverage.
+
+        Bars after the last stored timestamp are appended in place; bars before the first
+        stored timestamp trigger a rewrite. Overlapping bars keep the stored values.
+
+        An empty fetch leaves the coverage alone, so the range is requested again next
+        time, and a fetch ending within `_UNSETTLED` of today is covered only up to its
+        last bar.
+        """
+        if df.empty:
+            return
+        start, end = pd.Timestamp(start), _fetched_until(df, end)
+        meta = self._read_meta(ticker, interval)
+        if meta is None:
+            self.write(ticker, interval, df, start, end)
+            return
+        lo, hi = (pd.Timestamp(x) for x in meta["covered"])
+        if start > hi or end < lo:
+            raise ValueError(
+                f"Range {start}..{end} is not contiguous with stored {lo}..{hi} for {ticker}."
+            )
+        directory = self.path(ticker, interval)
+        new_cov = [str(min(lo, start)), str(max(hi, end))]
+        df = df.sort_index()
+        df = df[~df.index.duplicated(keep="last")].reindex(columns=meta["columns"])
+        new_idx = _index_ns(pd.DatetimeIndex(df.index))
+        rows = meta["rows"]
+        if rows:
+            stored = np.memmap(directory / _INDEX_FILE, dtype=_INDEX_DTYPE, mode="r", shape=(rows,))
+            first, last = int(stored[0]), int(stored[-1])
+            del stored
+        else:
+            first = last = None
+
+        head = new_idx < first if rows else np.zeros(len(df), dtype=bool)
+        tail = new_idx > last if rows else np.ones(len(df), dtype=bool)
+        if head.any():
+            stored_df = self.read(ticker, interval)
+            self.write(ticker, interval, pd.concat([df[head], stored_df, df[tail]]), *new_cov)
+            return
+        if tail.any():
+            self._append(directory / _INDEX_FILE, new_idx[tail], rows)
+            for i, col in enumerate(meta["columns"]):
+                self._append(directory / _column_file(i), df[col].to_numpy(dtype=_DTYPE)[tail], rows)
+            meta["rows"] = rows + int(tail.sum())
+        meta["covered"] = new_cov
+        self._write_meta(directory, meta)
+
+    def delete(self, ticker: str, interval: str) -> None:
+        directory = self.path(ticker, interval)
+        if directory.exists():
+            for f in directory.iterdir():
+                f.unlink()
+            directory.rmdir()
+
+    @staticmethod
+    def _replace(path: pathlib.Path, arr: np.ndarray) -> None:
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(np.ascontiguousarray(arr).tobytes())
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _append(path: pathlib.Path, arr: np.ndarray, rows: int) -> None:
+        with open(path, "r+b") as fh:
+            # Drop bytes from any append that crashed before its header update.
+            fh.truncate(rows * arr.dtype.itemsize)
+            fh.seek(0, os.SEEK_END)
+            fh.write(np.ascontiguousarray(arr).tobytes())
@@ -1 +1,32 @@
-__all__ = ["momentum", "mean_reversion"]
+"""
+Signal generators. `momentum_long_only`, `mean_reversion_panel`, `hysteresis_positions`
+and the cross-sectional portfolio builders are importable from here and loaded on first
+use; ``mean_reversion`` is the submodule (its function of the same name lives in it).
+"""
+import importlib
+
+_FACADE = {
+    "momentum_long_only": "momentum",
+    "mean_reversion_panel": "mean_reversion",
+    "hysteresis_positions": "mean_reversion",
+    "cross_sectional_rank": "cross_sectional",
+    "panel_feature": "cross_sectional",
+    "quantile_weights": "cross_sectional",
+    "top_k_weights": "cross_sectional",
+    "rank_weights": "cross_sectional",
+}
+_SUBMODULES = ("momentum", "mean_reversion", "cross_sectional")
+
+__all__ = [*_SUBMODULES, *_FACADE]
+
+
+def __getattr__(name):
+    if name in _FACADE:
+        return getattr(importlib.import_module(f"{__name__}.{_FACADE[name]}"), name)
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
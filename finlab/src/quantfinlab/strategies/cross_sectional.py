@@ -0,0 +1,246 @@
+"""
+Cross-sectional signals: on every date, rank a universe by a feature and hold the top
+(and short the bottom) names.
+
+Everything works on the whole (dates x assets) panel at once, in row blocks: ranks come
+from one NaN-aware ``argsort`` per block with average ranks for ties (the same numbers
+as ``DataFrame.rank(axis=1)``), and fixed-size top/bottom baskets from ``argpartition``.
+The weights feed straight into `backtest.backtest_panel`; weights formed from data
+through date t are applied to the return after t there, so there is no look-ahead::
+
+    score = panel_feature(prices, "momentum", lookback=252, skip=21)
+    weights = quantile_weights(score, quantiles=5, rebalance=21)
+    result = backtest_panel(prices, weights, allow_short=True)
+
+Assets with a NaN feature on a date are left out of that date's ranking and get weight 0.
+"""
+from __future__ import annotations
+
+from typing import Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ..cache import memoize
+
+Panel = Union[pd.DataFrame, np.ndarray]
+
+# rows per block: about this many cells, so temporaries stay small for wide panels
+_BLOCK_CELLS = 2_000_000
+
+
+def _as_panel(feature: Panel) -> Tuple[np.ndarray, pd.Index, pd.Index]:
+    if isinstance(feature, pd.DataFrame):
+        index, columns = feature.index, feature.columns
+    else:
+        index, columns = None, None
+    x = np.asarray(feature, dtype=np.float64)
+    x = x.reshape(len(x), -1)
+    index = index if index is not None else pd.RangeIndex(x.shape[0])
+    columns = columns if columns is not None else pd.RangeIndex(x.shape[1])
+    return x, index, columns
+
+
+def _blocks(n: int, k: int):
+    step = max(1, _BLOCK_CELLS // max(k, 1))
+    for lo in range(0, n, step):
+        yield lo, min(n, lo + step)
+
+
+def _rank_rows(x: np.ndarray) -> np.ndarray:
+    # 1-based average ranks along each row, NaN where x is NaN: sort once, mark where
+    # each run of equal values starts and ends, and give the run the mean position.
+    n, k = x.shape
+    order = np.argsort(x, axis=1)  # NaNs sort last
+    s = np.take_along_axis(x, order, axis=1)
+    pos = np.broadcast_to(np.arange(k, dtype=np.float64), (n, k))
+    new = np.ones((n, k), dtype=bool)
+    np.not_equal(s[:, 1:], s[:, :-1], out=new[:, 1:])
+    start = np.where(new, pos, 0.0)
+    np.maximum.accumulate(start, axis=1, out=start)
+    last = np.ones((n, k), dtype=bool)
+    last[:, :-1] = new[:, 1:]
+    end = np.where(last, pos, k)[:, ::-1]
+    np.minimum.accumulate(end, axis=1, out=end)
+    avg = (start + end[:, ::-1]) / 2 + 1
+    avg[np.isnan(s)] = np.nan
+    ranks = np.empty_like(avg)
+    np.put_along_axis(ranks, order, avg, axis=1)
+    return ranks
+
+
+def _ranks(x: np.ndarray) -> np.ndarray:
+    out = np.empty_like(x)
+    for lo, hi in _blocks(*x.shape):
+        out[lo:hi] = _rank_rows(x[lo:hi])
+    return out
+
+
+def _held(w: np.ndarray, rebalance: int) -> np.ndarray:
+    # keep each rebalance date's weights until the next rebalance date
+    if rebalance <= 1:
+        return w
+    return w[(np.arange(len(w)) // rebalance) * rebalance]
+
+
+def _frame(w: np.ndarray, index: pd.Index, columns: pd.Index) -> pd.DataFrame:
+    return pd.DataFrame(w, index=index, columns=columns)
+
+
+def cross_sectional_rank(feature: Panel, pct: bool = False, ascending: bool = True) -> pd.DataFrame:
+    """
+    Rank every date's assets by `feature`: ``feature.rank(axis=1, pct=pct,
+    ascending=ascending)`` (average ranks for ties, NaNs left out).
+    """
+    x, index, columns = _as_panel(feature)
+    ranks = _ranks(x if ascending else -x)
+    if pct:
+        ranks /= np.sum(~np.isnan(x), axis=1, keepdims=True)
+    return _frame(ranks, index, columns)
+
+
+@memoize
+def panel_feature(prices: pd.DataFrame, kind: str = "momentum", lookback: int = 252,
+                  skip: int = 21) -> pd.DataFrame:
+    """
+    Common ranking features for a (dates x assets) price frame:
+
+    - ``"momentum"``: return from ``lookback`` to ``skip`` bars ago (12-1 momentum with
+      the defaults);
+    - ``"zscore"``: distance from the `lookback`-bar mean in rolling standard deviations;
+    - ``"vol"``: annualized `lookback`-bar volatility of log returns.
+    """
+    if kind == "momentum":
+        return prices.shift(skip) / prices.shift(lookback) - 1
+    if kind == "zscore":
+        mu = prices.rolling(lookback).mean()
+        sd = prices.rolling(lookback).std().replace(0, np.nan)
+        return (prices - mu) / sd
+    if kind == "vol":
+        return np.log(prices).diff().rolling(lookback).std() * np.sqrt(252)
+    raise ValueError(f"Unknown feature {kind!r}; use 'momentum', 'zscore' or 'vol'.")
+
+
+@memoize
+def quantile_weights(
+    feature: Panel,
+    quantiles: int = 5,
+    long_short: bool = True,
+    gross: float = 1.0,
+    ascending: bool = True,
+    rebalance: int = 1,
+) -> pd.DataFrame:
+    """
+    Equal-weight quantile portfolios.
+
+    On each date the assets with a valid feature are split into `quantiles` buckets by
+    rank (ties share their average rank); the top bucket is held long and, with
+    `long_short`, the bottom bucket short, each leg with half of `gross` (all of it when
+    long-only). ``ascending=False`` flips the ordering (e.g. to buy low volatility).
+    Dates with fewer valid assets than `quantiles` are flat.
+
+    Parameters
+    ----------
+    feature : pd.DataFrame | np.ndarray
+        (dates x assets) scores; higher is better.
+    quantiles : int
+    long_short : bool
+    gross : float
+        Sum of absolute weights per date.
+    ascending : bool
+    rebalance : int
+        Re-form the portfolio every `rebalance` dates and hold it in between.
+
+    Returns
+    -------
+    pd.DataFrame of weights shaped like `feature`.
+    """
+    x, index, columns = _as_panel(feature)
+    x = x if ascending else -x
+    w = np.zeros_like(x)
+    for lo, hi in _blocks(*x.shape):
+        r = _rank_rows(x[lo:hi])
+        count = np.sum(~np.isnan(r), axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            bucket = np.floor((r - 1) * quantiles / count)
+        enough = count >= quantiles
+        top = (bucket == quantiles - 1) & enough
+        leg = gross / 2 if long_short else gross
+        with np.errstate(invalid="ignore", divide="ignore"):
+            block = top * (leg / top.sum(axis=1, keepdims=True))
+            if long_short:
+                bottom = (bucket == 0) & enough
+                block -= bottom * (leg / bottom.sum(axis=1, keepdims=True))
+        w[lo:hi] = np.nan_to_num(block)
+    return _frame(_held(w, rebalance), index, columns)
+
+
+@memoize
+def top_k_weights(
+    feature: Panel,
+    k: int = 50,
+    long_short: bool = True,
+    gross: float = 1.0,
+    ascending: bool = True,
+    rebalance: int = 1,
+) -> pd.DataFrame:
+    """
+    Equal-weight baskets of a fixed size: long the `k` highest-scoring assets and, with
+    `long_short`, short the `k` lowest, found with a partial sort (``argpartition``)
+    instead of a full ranking. Ties at the cut-off are broken arbitrarily. A leg holds
+    every valid asset when fewer than `k` are available; with `long_short`, dates with
+    fewer than ``2 * k`` valid assets are flat so the legs never overlap. Other
+    arguments as in `quantile_weights`.
+    """
+    x, index, columns = _as_panel(feature)
+    x = x if ascending else -x
+    n, m = x.shape
+    k = min(int(k), m)
+    w = np.zeros_like(x)
+    if k < 1:
+        return _frame(w, index, columns)
+    leg = gross / 2 if long_short else gross
+    for lo, hi in _blocks(n, m):
+        blk = x[lo:hi]
+        valid = ~np.isnan(blk)
+        count = valid.sum(axis=1, keepdims=True)
+        rows = np.arange(hi - lo)[:, None]
+        top = np.zeros(blk.shape, dtype=bool)
+        top[rows, np.argpartition(np.where(valid, -blk, np.inf), k - 1, axis=1)[:, :k]] = True
+        top &= valid
+        if long_short:
+            top &= count >= 2 * k
+            bottom = np.zeros(blk.shape, dtype=bool)
+            bottom[rows, np.argpartition(np.where(valid, blk, np.inf), k - 1, axis=1)[:, :k]] = True
+            bottom &= valid & (count >= 2 * k)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            block = top * (leg / top.sum(axis=1, keepdims=True))
+            if long_short:
+                block -= bottom * (leg / bottom.sum(axis=1, keepdims=True))
+        w[lo:hi] = np.nan_to_num(block)
+    return _frame(_held(w, rebalance), index, columns)
+
+
+@memoize
+def rank_weights(
+    feature: Panel,
+    long_short: bool = True,
+    gross: float = 1.0,
+    ascending: bool = True,
+    rebalance: int = 1,
+) -> pd.DataFrame:
+    """
+    Rank-proportional weights: with `long_short`, each asset's weight is its rank minus
+    the date's mean rank (a dollar-neutral book); long-only, it is proportional to the
+    rank itself. Weights are scaled to `gross` per date. Other arguments as in
+    `quantile_weights`.
+    """
+    x, index, columns = _as_panel(feature)
+    r = _ranks(x if ascending else -x)
+    if long_short:
+        count = np.sum(~np.isnan(r), axis=1, keepdims=True)
+        r = r - (count + 1) / 2
+    r = np.nan_to_num(r)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        w = r * (gross / np.abs(r).sum(axis=1, keepdims=True))
+    return _frame(_held(np.nan_to_num(w), rebalance), index, columns)
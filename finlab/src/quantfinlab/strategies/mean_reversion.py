@@ -1,29 +1,139 @@
 from __future__ import annotations
 
+from typing import Union
+
 import numpy as np
 import pandas as pd
 
+from ..cache import memoize
 from ..features import zscore
 
 
+# column count from which the row scan beats the two forward-fills; rows are scanned in
+# blocks of about this many cells so the precomputed masks stay cache-sized
+_ROW_SCAN_MIN_COLUMNS = 128
+_ROW_SCAN_BLOCK_CELLS = 1 << 20
+
+
+def _ffill_take(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    # values at the last row <= t where mask holds, 0 before the first such row
+    idx = np.where(mask, np.arange(len(mask))[:, None], -1)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    taken = np.take_along_axis(values, np.maximum(idx, 0), axis=0)
+    return np.where(idx >= 0, taken, 0).astype(np.int8)
+
+
+def _hysteresis_ffill(z: np.ndarray, entry: np.ndarray, exit_: np.ndarray) -> np.ndarray:
+    long_, short = z <= -entry, z >= entry
+    events = np.where(short, -1, 1).astype(np.int8)
+    state = _ffill_take(events, long_ | short)
+    with np.errstate(invalid="ignore"):
+        live = (state != 0) & ~(np.abs(z) <= exit_)
+    return _ffill_take(state, live)
+
+
+def hysteresis_positions(
+    z: np.ndarray,
+    entry_z: Union[float, np.ndarray],
+    exit_z: Union[float, np.ndarray],
+) -> np.ndarray:
+    """
+    Mean-reversion entry/exit state machine over a (dates x columns) z-score array.
+
+    Columns can be assets, parameter sets, or both; `entry_z` and `exit_z` are scalars or
+    one threshold per column. For each column:
+
+    - the *entry* state becomes +1 on z <= -entry_z and -1 on z >= entry_z (short wins if
+      both hold) and otherwise keeps its last value;
+    - the output takes the entry state on bars outside the exit band (|z| > exit_z) once an
+      entry has happened, and keeps its previous value on bars inside the band.
+
+    This is exactly the behaviour of the original pandas implementation (set entries,
+    forward-fill zeros, zero the exit band, forward-fill zeros again): a bar in the exit
+    band holds the current position, it does not flatten it. NaN z-scores are neither
+    entries nor exits.
+
+    Wide inputs are scanned row by row: the entry, exit-band and NaN tests are
+    precomputed for a block of rows as int8 masks, and each date then updates the state
+    with a few branch-free bitwise ops (``x ^= (x ^ new) & mask``) across all columns.
+    Narrow ones, where that per-row overhead would dominate, run as two index
+    forward-fills down the columns.
+
+    Returns
+    -------
+    np.ndarray of int8 positions in {-1, 0, 1} with the shape of `z`.
+    """
+    z = np.asarray(z)
+    squeeze = z.ndim == 1
+    z = z.reshape(len(z), -1)
+    n, m = z.shape
+    entry = np.broadcast_to(np.asarray(entry_z, dtype=z.dtype), (m,))
+    exit_ = np.broadcast_to(np.asarray(exit_z, dtype=z.dtype), (m,))
+    if m < _ROW_SCAN_MIN_COLUMNS:
+        out = _hysteresis_ffill(z, entry, exit_)
+        return out[:, 0] if squeeze else out
+
+    neg_entry = -entry
+    out = np.empty((n, m), dtype=np.int8)
+    state = np.zeros(m, dtype=np.int8)
+    pos = np.zeros(m, dtype=np.int8)
+    diff = np.empty(m, dtype=np.int8)
+    live = np.empty(m, dtype=np.int8)
+    rows = max(1, _ROW_SCAN_BLOCK_CELLS // m)
+    short = np.empty((min(rows, n), m), dtype=bool)
+    hit = np.empty_like(short)
+    inside = np.empty_like(short)
+    absz = np.empty((min(rows, n), m), dtype=z.dtype)
+    for lo in range(0, n, rows):
+        zb = z[lo:lo + rows]
+        k = len(zb)
+        np.greater_equal(zb, entry, out=short[:k])
+        np.less_equal(zb, neg_entry, out=hit[:k])
+        hit[:k] |= short[:k]
+        event = np.negative(short[:k].view(np.int8))
+        event |= 1  # -1 on a short entry (short wins), +1 on a long one
+        hit_mask = np.negative(hit[:k].view(np.int8))  # -1 on entry bars, else 0
+        np.abs(zb, out=absz[:k])
+        with np.errstate(invalid="ignore"):
+            np.less_equal(absz[:k], exit_, out=inside[:k])
+        out_mask = np.subtract(inside[:k].view(np.int8), 1)  # -1 outside the band or NaN
+        for t in range(k):
+            # state = event where entered; pos = state where live (state != 0 and outside)
+            np.bitwise_xor(state, event[t], out=diff)
+            diff &= hit_mask[t]
+            state ^= diff
+            np.bitwise_and(state, 1, out=live)
+            np.negative(live, out=live)
+            live &= out_mask[t]
+            np.bitwise_xor(pos, state, out=diff)
+            diff &= live
+            pos ^= diff
+            out[lo + t] = pos
+    return out[:, 0] if squeeze else out
+
+
+@memoize
 def mean_reversion(price: pd.Series, window: int = 20, entry_z: float = 1.0, exit_z: float = 0.25) -> pd.Series:
     """
     Symmetric mean-reversion: go long when price is "too low" (z <= -entry),
     short when "too high" (z >= +entry), and flatten near mean (|z| <= exit).
 
-    Returns a position in [-1, 1].
+    Returns a position in [-1, 1]. See `hysteresis_positions` for the exact state machine.
     """
     z = zscore(price, window=window)
-    pos = pd.Series(0.0, index=price.index, name=f"mr_{window}")
-
-    long_cond = z <= -entry_z
-    short_cond = z >= entry_z
-    flat_cond = z.abs() <= exit_z
-
-    pos[long_cond] = 1.0
-    pos[short_cond] = -1.0
-    # Keep previous position until exit
-    pos = pos.replace(to_replace=0.0, method="ffill").fillna(0.0)
-    pos[flat_cond] = 0.0
-    pos = pos.replace(to_replace=0.0, method="ffill").fillna(0.0)
-    return pos
+    pos = hysteresis_positions(z.to_numpy(dtype=np.float64), entry_z, exit_z)
+    return pd.Series(pos.astype(np.float64), index=price.index, name=f"mr_{window}")
+
+
+@memoize
+def mean_reversion_panel(
+    prices: pd.DataFrame, window: int = 20, entry_z: float = 1.0, exit_z: float = 0.25
+) -> pd.DataFrame:
+    """
+    `mean_reversion` for every column of a (dates x assets) price frame at once.
+    """
+    mu = prices.rolling(window).mean()
+    sd = prices.rolling(window).std().replace(0, np.nan)
+    z = ((prices - mu) / sd).to_numpy(dtype=np.float64)
+    pos = hysteresis_positions(z, entry_z, exit_z)
+    return pd.DataFrame(pos.astype(np.float64), index=prices.index, columns=prices.columns)
@@ -3,9 +3,11 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 
+from ..cache import memoize
 from ..features import sma, log_returns, rolling_vol
 
 
+@memoize
 def momentum_long_only(price: pd.Series, lookback: int = 50, vol_target: float = 0.15) -> pd.Series:
     """
     Long-only momentum: hold 1 when price > SMA(lookback), else 0.
@@ -27,7 +29,7 @@ def momentum_long_only(price: pd.Series, lookback: int = 50, vol_target: float =
 
     # Volatility scaling using last 20-day log-return vol
     ret = log_returns(price)
-    vol = rolling_vol(ret, window=20).reindex(price.index).fillna(method="bfill")
+    vol = rolling_vol(ret, window=20).reindex(price.index).bfill()
     # scale factor: vol_target / current_vol, cap at 1.0
     scale = (vol_target / (vol.replace(0.0, np.nan))).clip(upper=1.0)
     scale = scale.fillna(1.0)
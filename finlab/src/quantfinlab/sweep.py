@@ -0,0 +1,284 @@
+"""
+Vectorized parameter sweeps for the bundled strategies.
+
+A sweep evaluates a whole parameter grid for one price series at once: rolling statistics
+are computed once per distinct window and shared by every combination that uses it, the
+signals for all combinations are built as a 2-D (combinations x dates) batch and
+backtested together, and chunks of the grid can be spread over a process pool.
+`sweep_exits` does the same for grids of stop-loss / take-profit / trailing-stop levels
+on a given signal, for one series or a whole universe.
+"""
+from __future__ import annotations
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .backtest import apply_exits
+from .features import log_returns, rolling_vol
+from .metrics import SUMMARY_METRICS, summary_stats
+from .strategies.mean_reversion import hysteresis_positions
+
+# Cells (dates x columns) per `sweep_exits` batch; the exit kernel and the backtest hold
+# several float64 temporaries of that size.
+_EXIT_BLOCK_CELLS = 1 << 21
+
+
+def rolling_mean_std(x: np.ndarray, windows: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rolling mean and sample std of `x` for several windows at once.
+
+    Returns two (len(windows), len(x)) arrays with NaN before each window fills. Uses
+    cumulative sums of the series centered on its own mean, so every window costs O(n).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    w = np.asarray(windows, dtype=np.int64)[:, None]
+    n = len(x)
+    xc = x - x.mean() if n else x
+    cs1 = np.concatenate([[0.0], np.cumsum(xc)])
+    cs2 = np.concatenate([[0.0], np.cumsum(xc * xc)])
+    end = np.arange(1, n + 1)[None, :]
+    begin = end - w
+    valid = begin >= 0
+    begin = np.where(valid, begin, 0)
+    s1 = cs1[end] - cs1[begin]
+    s2 = cs2[end] - cs2[begin]
+    mean_c = s1 / w
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = np.maximum(s2 - s1 * mean_c, 0.0) / (w - 1)
+    mean = np.where(valid, mean_c + (x.mean() if n else 0.0), np.nan)
+    std = np.where(valid & (w > 1), np.sqrt(var), np.nan)
+    return mean, std
+
+
+def _backtest_batch(price: np.ndarray, sig: np.ndarray, lo: float, hi: float, rate: float):
+    # Same arithmetic as backtest_signals, for a (combinations x dates) signal batch.
+    ret = np.zeros_like(price)
+    ret[1:] = price[1:] / price[:-1] - 1
+    sig = np.clip(sig, lo, hi)
+    prev = np.zeros_like(sig)
+    prev[:, 1:] = sig[:, :-1]
+    strat = prev * ret[None, :] - np.abs(sig - prev) * rate
+    return strat, np.cumprod(1 + strat, axis=1)
+
+
+def _summarize(returns: np.ndarray, equity: np.ndarray) -> np.ndarray:
+    stats = summary_stats(returns.T, equity.T)
+    return np.column_stack([stats[m] for m in SUMMARY_METRICS])
+
+
+def _momentum_chunk(combos: List[Tuple[int, float]], price: np.ndarray, vol: np.ndarray,
+                    lo: float, hi: float, rate: float) -> np.ndarray:
+    lookbacks = sorted({lb for lb, _ in combos})
+    row = {lb: i for i, lb in enumerate(lookbacks)}
+    ma, _ = rolling_mean_std(price, lookbacks)
+    with np.errstate(invalid="ignore"):
+        raw = (price[None, :] > ma).astype(float)
+    targets = np.array([vt for _, vt in combos])[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = np.minimum(targets / np.where(vol == 0, np.nan, vol)[None, :], 1.0)
+    scale = np.where(np.isnan(scale), 1.0, scale)
+    sig = raw[[row[lb] for lb, _ in combos]] * scale
+    return _summarize(*_backtest_batch(price, sig, lo, hi, rate))
+
+
+def _mean_reversion_chunk(combos: List[Tuple[int, float, float]], price: np.ndarray,
+                          lo: float, hi: float, rate: float) -> np.ndarray:
+    windows = sorted({w for w, _, _ in combos})
+    row = {w: i for i, w in enumerate(windows)}
+    mu, sd = rolling_mean_std(price, windows)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = (price[None, :] - mu) / np.where(sd == 0, np.nan, sd)
+    z = z[[row[w] for w, _, _ in combos]]
+    entry = np.array([e for _, e, _ in combos])
+    exit_ = np.array([x for _, _, x in combos])
+    pos = hysteresis_positions(np.ascontiguousarray(z.T), entry, exit_).T.astype(np.float64)
+    return _summarize(*_backtest_batch(price, pos, lo, hi, rate))
+
+
+def _exits_chunk(combos: List[Tuple[Optional[float], ...]], price: np.ndarray, sig: np.ndarray,
+                 lo: float, hi: float, rate: float) -> np.ndarray:
+    # Columns are (combination, asset) pairs, combination-major; the price of each asset
+    # is repeated once per combination so the exit kernel sees one column per pair.
+    c, m = len(combos), price.shape[1]
+    levels = np.repeat(np.array(combos, dtype=np.float64), m, axis=0)  # None -> NaN: off
+    held = np.clip(sig, lo, hi)
+    pos = apply_exits(np.tile(price, (1, c)), np.tile(held, (1, c)),
+                      levels[:, 0], levels[:, 1], levels[:, 2])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret = np.zeros_like(price)
+        ret[1:] = price[1:] / price[:-1] - 1
+    ret[~np.isfinite(ret)] = 0.0
+    prev = np.zeros_like(pos)
+    prev[1:] = pos[:-1]
+    strat = prev * np.tile(ret, (1, c)) - np.abs(pos - prev) * rate
+    stats = summary_stats(strat, np.cumprod(1 + strat, axis=0))
+    return np.column_stack([stats[name] for name in SUMMARY_METRICS])
+
+
+def _run_chunks(fn, combos: list, args: tuple, chunk_size: int, n_jobs: int) -> np.ndarray:
+    # Combinations are generated window-major, so a chunk touches only a few windows.
+    chunks = [combos[i:i + chunk_size] for i in range(0, len(combos), chunk_size)]
+    if n_jobs == 1 or len(chunks) <= 1:
+        parts = [fn(c, *args) for c in chunks]
+    else:
+        workers = os.cpu_count() if n_jobs < 0 else n_jobs
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(fn, chunks, *[[a] * len(chunks) for a in args]))
+    return np.vstack(parts) if parts else np.empty((0, len(SUMMARY_METRICS)))
+
+
+def _table(combos: list, names: List[str], metrics: np.ndarray) -> pd.DataFrame:
+    df = pd.DataFrame(combos, columns=names)
+    for j, m in enumerate(SUMMARY_METRICS):
+        df[m] = metrics[:, j]
+    return df
+
+
+def sweep_momentum(
+    price: pd.Series,
+    lookbacks: Iterable[int],
+    vol_targets: Iterable[float],
+    fee_bps: float = 1.0,
+    slippage_bps: float = 2.0,
+    allow_short: bool = False,
+    position_cap: float = 1.0,
+    n_jobs: int = 1,
+    chunk_size: int = 256,
+) -> pd.DataFrame:
+    """
+    Evaluate `momentum_long_only` + `backtest_signals` + `summary()` over a parameter grid.
+
+    Parameters
+    ----------
+    price : pd.Series
+        Price series; NaNs are dropped first, as `backtest_signals` does.
+    lookbacks, vol_targets : iterable
+        Grid axes; every (lookback, vol_target) combination is evaluated.
+    fee_bps, slippage_bps, allow_short, position_cap
+        Backtest settings, as in `backtest_signals`.
+    n_jobs : int
+        Worker processes for the grid chunks (1 = in-process, -1 = all cores).
+    chunk_size : int
+        Combinations evaluated per batch; bounds memory at about
+        ``chunk_size * len(price) * 8`` bytes per temporary.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per combination: the parameters followed by the `summary()` metrics.
+    """
+    price = price.dropna()
+    p = price.to_numpy(dtype=np.float64)
+    vol = rolling_vol(log_returns(price), window=20).bfill().to_numpy()
+    combos = list(itertools.product(lookbacks, vol_targets))
+    lo = -position_cap if allow_short else 0.0
+    rate = (fee_bps + slippage_bps) / 1e4
+    metrics = _run_chunks(_momentum_chunk, combos, (p, vol, lo, position_cap, rate),
+                          chunk_size, n_jobs)
+    return _table(combos, ["lookback", "vol_target"], metrics)
+
+
+def sweep_mean_reversion(
+    price: pd.Series,
+    windows: Iterable[int],
+    entry_zs: Iterable[float],
+    exit_zs: Iterable[float],
+    fee_bps: float = 1.0,
+    slippage_bps: float = 2.0,
+    allow_short: bool = True,
+    position_cap: float = 1.0,
+    n_jobs: int = 1,
+    chunk_size: int = 256,
+) -> pd.DataFrame:
+    """
+    Evaluate `mean_reversion` + `backtest_signals` + `summary()` over a parameter grid.
+
+    Every (window, entry_z, exit_z) combination is evaluated; the rolling mean and std of
+    each distinct window are computed once. Other parameters as in `sweep_momentum`.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per combination: the parameters followed by the `summary()` metrics.
+    """
+    price = price.dropna()
+    p = price.to_numpy(dtype=np.float64)
+    combos = list(itertools.product(windows, entry_zs, exit_zs))
+    lo = -position_cap if allow_short else 0.0
+    rate = (fee_bps + slippage_bps) / 1e4
+    metrics = _run_chunks(_mean_reversion_chunk, combos, (p, lo, position_cap, rate),
+                          chunk_size, n_jobs)
+    return _table(combos, ["window", "entry_z", "exit_z"], metrics)
+
+
+def sweep_exits(
+    price: Union[pd.Series, pd.DataFrame],
+    signal: Union[pd.Series, pd.DataFrame],
+    stop_losses: Iterable[Optional[float]] = (None,),
+    take_profits: Iterable[Optional[float]] = (None,),
+    trailing_stops: Iterable[Optional[float]] = (None,),
+    fee_bps: float = 1.0,
+    slippage_bps: float = 2.0,
+    allow_short: bool = False,
+    position_cap: float = 1.0,
+    n_jobs: int = 1,
+    chunk_size: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Evaluate a signal under a grid of exit levels (see `backtest.apply_exits`).
+
+    With a Series `price` every (stop_loss, take_profit, trailing_stop) combination is
+    scored as ``backtest_signals(price, signal, ..., stop_loss=, take_profit=,
+    trailing_stop=).summary()``. With a (dates x assets) DataFrame each asset is scored
+    separately, as a one-asset `backtest_panel` with those exits would be, so a stop grid
+    can be searched across a universe. All combinations and assets of a chunk go through
+    the exit kernel and the backtest as the columns of one array. None in a grid axis
+    means "no such exit".
+
+    Parameters
+    ----------
+    price : pd.Series | pd.DataFrame
+    signal : pd.Series | pd.DataFrame
+        Positions, aligned to `price` and forward-filled as the backtests do.
+    stop_losses, take_profits, trailing_stops : iterable
+        Grid axes, as fractions (0.05 = 5%) or None.
+    fee_bps, slippage_bps, allow_short, position_cap, n_jobs
+        As in `sweep_momentum`.
+    chunk_size : int, optional
+        Combinations per batch; a batch holds ``chunk_size * n_assets`` columns. Defaults
+        to roughly 2M (dates x columns) cells per batch, and at least one combination.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per combination (and asset, for a universe): the exit levels (NaN for
+        None), the asset, and the `summary()` metrics.
+    """
+    universe = isinstance(price, pd.DataFrame)
+    if universe:
+        sig = signal.reindex(index=price.index, columns=price.columns)
+        p = price.ffill().to_numpy(dtype=np.float64)
+    else:
+        price = price.dropna()
+        sig = signal.reindex(price.index)
+        p = price.to_numpy(dtype=np.float64)[:, None]
+    s = sig.ffill().fillna(0.0).to_numpy(dtype=np.float64).reshape(p.shape)
+    combos = list(itertools.product(stop_losses, take_profits, trailing_stops))
+    lo = -position_cap if allow_short else 0.0
+    rate = (fee_bps + slippage_bps) / 1e4
+    chunk_size = chunk_size or max(1, _EXIT_BLOCK_CELLS // max(p.size, 1))
+    metrics = _run_chunks(_exits_chunk, combos, (p, s, lo, position_cap, rate),
+                          chunk_size, n_jobs)
+    names = ["stop_loss", "take_profit", "trailing_stop"]
+    if universe:
+        table = _table([c + (a,) for c in combos for a in price.columns], names + ["asset"],
+                       metrics)
+    else:
+        table = _table(combos, names, metrics)
+    table[names] = table[names].astype(np.float64)
+    return table
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from quantfinlab.models.arima import ArimaForecaster
+
+
+def test_walk_forward_forecasts_are_out_of_sample():
+    rng = np.random.default_rng(0)
+    e = rng.normal(0, 0.01, 260)
+    y = np.zeros(260)
+    for t in range(1, 260):
+        y[t] = 0.5 * y[t - 1] + e[t]
+    y = pd.Series(y, index=pd.bdate_range("2020-01-01", periods=260))
+
+    fc = ArimaForecaster(order=(1, 0, 0)).walk_forward(y, min_train=200, refit_every=10)
+    assert fc.index.equals(y.index[200:])
+    assert np.isfinite(fc).all()
+    # The forecast for date t only uses data up to t-1, so changing y[t] must not move it.
+    y2 = y.copy()
+    y2.iloc[230] += 1.0
+    fc2 = ArimaForecaster(order=(1, 0, 0)).walk_forward(y2, min_train=200, refit_every=10)
+    assert fc2.iloc[30] == fc.iloc[30]
+    assert fc2.iloc[31] != fc.iloc[31]
+
+
+def test_select_order_recovers_ar1_and_caches_fits():
+    from quantfinlab.cache import MemoCache
+    from quantfinlab.models.arima import select_order, select_orders
+
+    rng = np.random.default_rng(1)
+    e = rng.normal(0, 0.01, 400)
+    y = np.zeros(400)
+    for t in range(1, 400):
+        y[t] = 0.6 * y[t - 1] + e[t]
+    y = pd.Series(y)
+
+    fits = MemoCache()
+    sel = select_order(y, max_p=2, max_q=1, criterion="bic", fit_cache=fits)
+    assert sel.order == (1, 0, 0) and sel.n_fits > 0
+    assert sel.score == min(sel.scores.values())
+    again = select_order(y, max_p=2, max_q=1, criterion="bic", fit_cache=fits)
+    assert again.order == sel.order and again.n_fits == 0
+
+    table = select_orders({"a": y, "short": y.iloc[:3]}, max_p=2, max_q=1, criterion="bic",
+                          n_jobs=1, fit_cache=fits)
+    assert list(table.index) == ["a"] and tuple(table.loc["a", ["p", "d", "q"]]) == (1, 0, 0)
+    assert table.loc["a", "n_fits"] == 0
+    assert "short" in table.attrs["failed"]
+    assert ArimaForecaster("auto", max_p=2, max_q=1, criterion="bic", fit_cache=fits).fit(y).order == (1, 0, 0)
+
+
+def test_failed_fit_scores_inf(monkeypatch):
+    from quantfinlab.models import arima
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("optimizer blew up")
+
+    monkeypatch.setattr(arima, "ARIMA", broken)
+    assert arima._fit_criteria(np.zeros(50), (1, 0, 0), None) == (np.inf, np.inf)
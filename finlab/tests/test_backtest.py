@@ -1,7 +1,9 @@
 import numpy as np
 import pandas as pd
 
-from quantfinlab.backtest import backtest_signals
+from quantfinlab.backtest import apply_exits, backtest_chunked, backtest_panel, backtest_signals
+from quantfinlab.metrics import max_drawdown
+from quantfinlab.store import PriceStore
 
 
 def test_backtest_shapes():
@@ -11,3 +13,86 @@ def test_backtest_shapes():
     bt = backtest_signals(price, signal, fee_bps=0.5, slippage_bps=1.0)
     assert len(bt.returns) == len(price)
     assert len(bt.equity_curve) == len(price)
+
+
+def test_backtest_panel_matches_single_asset_engine():
+    rng = np.random.default_rng(1)
+    prices = pd.DataFrame(100 * np.cumprod(1 + rng.normal(0, 0.01, (300, 4)), axis=0))
+    weights = pd.DataFrame(rng.uniform(-1.5, 1.5, (300, 4)))
+    weights.iloc[::7, 2] = np.nan
+
+    res = backtest_panel(prices, weights, allow_short=True, block_size=64)
+    for col in prices.columns:
+        single = backtest_signals(prices[col], weights[col], allow_short=True)
+        view = res.asset(col)
+        pd.testing.assert_series_equal(view.returns, single.returns)
+        pd.testing.assert_series_equal(view.positions, single.positions)
+    np.testing.assert_allclose(res.returns, res.asset_returns.sum(axis=1))
+    np.testing.assert_allclose(res.gross_exposure, res.positions.abs().sum(axis=1))
+
+
+def test_chunked_backtest_is_bit_identical_on_memmaps(tmp_path):
+    rng = np.random.default_rng(3)
+    n = 5_000
+    idx = pd.date_range("2020-01-01", periods=n, freq="min", name="Datetime")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 1e-3, n)))
+    close[rng.random(n) < 0.01] = np.nan
+    signal = np.where(rng.random(n) < 0.2, np.nan, rng.uniform(-1, 1, n))
+    store = PriceStore(tmp_path / "store")
+    bars = pd.DataFrame({"Close": close, "Signal": signal}, index=idx)
+    store.write("AAA", "1m", bars, idx[0], idx[-1] + pd.Timedelta("1min"))
+
+    ref = backtest_signals(pd.Series(close, idx), pd.Series(signal, idx), allow_short=True)
+    res = backtest_chunked(store.column("AAA", "1m", "Close"), store.column("AAA", "1m", "Signal"),
+                           allow_short=True, block_size=777, out_dir=tmp_path / "out")
+    assert np.array_equal(res.returns, ref.returns.to_numpy())
+    assert np.array_equal(res.equity_curve, ref.equity_curve.to_numpy())
+    assert np.array_equal(res.positions, ref.positions.to_numpy())
+    assert res.max_drawdown == max_drawdown(ref.equity_curve)
+    assert np.load(tmp_path / "out" / "equity.npy", mmap_mode="r")[-1] == ref.equity_curve.iloc[-1]
+
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 1e-3, (2_000, 6)), axis=0))
+    weights = rng.uniform(-0.2, 0.2, prices.shape)
+    panel = backtest_panel(prices, weights, allow_short=True)
+    chunked = backtest_chunked(prices, weights, allow_short=True, block_size=300)
+    assert np.array_equal(chunked.equity_curve, panel.equity_curve.to_numpy())
+
+
+def _exits_loop(price, sig, stop_loss, take_profit, trailing_stop):
+    # Bar-by-bar reference for apply_exits.
+    out, side_prev, stopped, entry, best = sig.copy(), 0.0, False, np.nan, np.nan
+    for t in range(len(sig)):
+        side = np.sign(sig[t])
+        if side != side_prev:
+            stopped, entry, best = False, price[t], price[t]
+        side_prev = side
+        if side == 0:
+            continue
+        best = max(best, price[t]) if side > 0 else min(best, price[t])
+        gain = side * (price[t] / entry - 1)
+        stopped = stopped or (stop_loss is not None and gain <= -stop_loss) \
+            or (take_profit is not None and gain >= take_profit) \
+            or (trailing_stop is not None and side * (price[t] / best - 1) <= -trailing_stop)
+        if stopped:
+            out[t] = 0.0
+    return out
+
+
+def test_apply_exits_matches_bar_by_bar_loop_and_panel():
+    rng = np.random.default_rng(4)
+    n = 2_000
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (n, 3)), axis=0))
+    sig = np.repeat(rng.choice([-1.0, 0.0, 0.5, 1.0], (n // 40, 3)), 40, axis=0)
+    levels = [(0.02, None, None), (None, 0.05, None), (None, None, 0.03), (0.04, 0.08, 0.02)]
+    for sl, tp, tr in levels:
+        got = apply_exits(prices, sig, sl, tp, tr)
+        for j in range(3):
+            np.testing.assert_array_equal(got[:, j], _exits_loop(prices[:, j], sig[:, j], sl, tp, tr))
+    # per-column levels, and the panel engine equal to the single-asset one
+    res = backtest_panel(prices, sig, allow_short=True, stop_loss=[0.02, None, 0.05],
+                         trailing_stop=0.03)
+    for j, sl in enumerate([0.02, None, 0.05]):
+        single = backtest_signals(pd.Series(prices[:, j]), pd.Series(sig[:, j]), allow_short=True,
+                                  stop_loss=sl, trailing_stop=0.03)
+        np.testing.assert_allclose(res.asset(j).returns, single.returns, rtol=1e-12)
+    assert (res.positions.to_numpy() == 0).sum() > (sig == 0).sum()
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from quantfinlab.bootstrap import METHODS, bootstrap_indices, bootstrap_metrics, probabilistic_sharpe
+from quantfinlab.metrics import SUMMARY_METRICS
+
+
+def test_indices_are_in_range_and_blocks_are_contiguous():
+    rng = np.random.default_rng(0)
+    for method in METHODS:
+        idx = bootstrap_indices(200, 5, method, 10, rng)
+        assert idx.shape == (5, 200) and idx.min() >= 0 and idx.max() < 200
+    block = bootstrap_indices(200, 3, "block", 10, rng)
+    steps = np.diff(block.reshape(3, 20, 10), axis=2) % 200
+    assert (steps == 1).all()
+
+
+def test_bootstrap_metrics_intervals_and_determinism():
+    rng = np.random.default_rng(1)
+    returns = pd.DataFrame({"good": rng.normal(0.002, 0.01, 1000), "flat": rng.normal(0, 0.01, 1000)})
+    res = bootstrap_metrics(returns, n_samples=400, seed=7, max_memory=2**20)
+    again = bootstrap_metrics(returns, n_samples=400, seed=7, max_memory=2**20, n_jobs=2)
+    for m in SUMMARY_METRICS:
+        np.testing.assert_array_equal(res.samples[m], again.samples[m])
+
+    ci = res.ci(0.1)
+    assert list(ci.index.get_level_values("metric")[:6]) == SUMMARY_METRICS
+    sharpe = ci.loc[("good", "Sharpe")]
+    assert sharpe["lower"] < sharpe["point"] < sharpe["upper"]
+    assert res.psr[0] > 0.99 and 0 < res.psr[1] < res.psr[0]
+    assert probabilistic_sharpe(returns["good"]) == res.psr[0]
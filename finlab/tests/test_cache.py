@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from quantfinlab import cache, features
+from quantfinlab.strategies.momentum import momentum_long_only
+
+
+def _price(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, n))),
+                     index=pd.bdate_range("2020-01-01", periods=n))
+
+
+def test_memoized_results_match_and_hit_on_equal_content(tmp_path):
+    price = _price()
+    expected = momentum_long_only(price, lookback=30)
+    cache.enable(disk_dir=tmp_path)
+    try:
+        first = momentum_long_only(price, lookback=30)
+        again = momentum_long_only(price.copy(), 30)  # equal content, other object
+        pd.testing.assert_series_equal(first, expected)
+        pd.testing.assert_series_equal(again, expected)
+        assert cache.stats()["hits"] == 1
+
+        again.iloc[:] = 0.0  # callers get copies
+        pd.testing.assert_series_equal(momentum_long_only(price, 30), expected)
+
+        # a different input or parameter is a miss
+        misses = cache.stats()["misses"]
+        momentum_long_only(_price(seed=1), 30)
+        momentum_long_only(price, 31)
+        assert cache.stats()["misses"] > misses
+
+        # the disk tier survives a fresh in-memory cache; invalidation clears both
+        cache.enable(disk_dir=tmp_path)
+        pd.testing.assert_series_equal(momentum_long_only(price, 30), expected)
+        assert cache.stats()["disk_hits"] == 1
+        cache.invalidate(momentum_long_only)
+        assert not list(tmp_path.glob("quantfinlab.strategies.momentum.*"))
+    finally:
+        cache.clear()
+        cache.disable()
+
+
+def test_disk_entries_are_not_served_after_the_code_changes(tmp_path, monkeypatch):
+    import importlib
+
+    src = tmp_path / "memo_edited.py"
+    body = "from quantfinlab.cache import memoize\n\n@memoize\ndef f(x):\n    return x {}\n"
+    src.write_text(body.format("+ 1"))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module("memo_edited")
+    cache.enable(disk_dir=tmp_path / "cache")
+    try:
+        assert module.f(np.ones(3)).tolist() == [2.0, 2.0, 2.0]
+        src.write_text(body.format("* 10 + 3"))
+        module = importlib.reload(module)
+        cache.enable(disk_dir=tmp_path / "cache")
+        assert module.f(np.ones(3)).tolist() == [13.0, 13.0, 13.0]
+        assert cache.stats()["disk_hits"] == 0
+    finally:
+        cache.clear()
+        cache.disable()
+
+
+def test_lru_is_bounded_by_bytes():
+    price = _price()
+    entry = features.sma(price, 5).memory_usage(index=True)
+    cache.enable(max_bytes=3 * entry)
+    try:
+        for w in range(2, 8):
+            features.sma(price, w)
+        stats = cache.stats()
+        assert stats["entries"] == 3 and stats["evictions"] == 3
+        assert stats["bytes"] <= 3 * entry
+        features.sma(price, 7)
+        assert cache.stats()["hits"] == 1
+    finally:
+        cache.disable()
@@ -0,0 +1,60 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+from quantfinlab import backtest, cli, models
+from quantfinlab.backtest import backtest_signals
+from quantfinlab.strategies.momentum import momentum_long_only
+
+HEAVY = ("torch", "statsmodels", "arch", "matplotlib", "plotly")
+
+
+def _write_csv(root, ticker="AAA", n=400):
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    idx = pd.bdate_range("2015-01-01", periods=n, name="Date")
+    df = pd.DataFrame({c: close for c in ("Open", "High", "Low", "Close", "Adj Close")}, index=idx)
+    df["Volume"] = 1e6
+    df.to_csv(root / f"{ticker}.csv")
+    return df["Adj Close"].rename(ticker)
+
+
+def test_backtest_command_matches_library(tmp_path, capsys):
+    price = _write_csv(tmp_path)
+    code = cli.main(["backtest", "AAA", "--csv-dir", str(tmp_path), "--cache-dir", str(tmp_path / "cache"),
+                     "--start", "2015-01-01", "--end", "2017-01-01", "--json"])
+    assert code == 0
+    out = json.loads(capsys.readouterr().out)
+    expected = backtest_signals(price, momentum_long_only(price, 50, 0.15)).summary()
+    assert out.keys() == expected.keys()
+    for k in expected:
+        assert np.isclose(out[k], expected[k], equal_nan=True)
+
+
+def test_simple_commands_skip_heavy_dependencies():
+    code = ("import sys, quantfinlab, quantfinlab.cli, quantfinlab.data, quantfinlab.backtest, "
+            "quantfinlab.strategies.momentum, quantfinlab.sweep; quantfinlab.features; "
+            "quantfinlab.models; quantfinlab.plotting.downsample; "
+            f"print([m for m in {HEAVY!r} if m in sys.modules])")
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(p for p in sys.path if p)}
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+    assert out.stdout.strip() == "[]"
+
+
+def test_lazy_facades():
+    assert models.ArimaForecaster.__module__ == "quantfinlab.models.arima"
+    assert "ArimaForecaster" in dir(models)
+    assert backtest.backtest_signals is backtest_signals
+
+
+def test_fetch_command_ignores_repeated_tickers(tmp_path, capsys):
+    _write_csv(tmp_path)
+    code = cli.main(["fetch", "AAA", "AAA", "--csv-dir", str(tmp_path),
+                     "--cache-dir", str(tmp_path / "cache"), "--start", "2015-01-01",
+                     "--end", "2016-01-01"])
+    assert code == 0
+    assert capsys.readouterr().out.count("AAA:") == 1
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantfinlab.data import get_price_data
+from quantfinlab.fetchers import CSVFetcher, with_retry
+
+
+def _write_csv(path, start, periods):
+    idx = pd.bdate_range(start, periods=periods, name="Date")
+    close = 100 + np.arange(periods, dtype=float)
+    pd.DataFrame({"Close": close, "Adj Close": close, "Volume": 1e6}, index=idx).to_csv(path)
+
+
+def test_get_price_data_collects_partial_failures(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    _write_csv(src / "AAA.csv", "2020-01-01", 60)
+    _write_csv(src / "BBB.csv", "2020-01-15", 40)
+
+    with pytest.warns(UserWarning, match="MISSING"):
+        df = get_price_data(
+            ["AAA", "MISSING", "BBB"],
+            start="2020-01-01",
+            end="2020-04-01",
+            cache_dir=tmp_path / "cache",
+            fetcher=CSVFetcher(src),
+            retries=1,
+            backoff=0.0,
+        )
+    assert list(df.columns.get_level_values(0).unique()) == ["AAA", "BBB"]
+    assert set(df.attrs["failed"]) == {"MISSING"}
+    assert df.index.is_monotonic_increasing
+    # BBB starts later: leading rows stay NaN, the rest lines up with its own file.
+    assert df[("BBB", "Close")].first_valid_index() == pd.Timestamp("2020-01-15")
+
+    with pytest.raises(ValueError):
+        get_price_data("MISSING", cache_dir=tmp_path / "cache", fetcher=CSVFetcher(src), retries=0)
+
+
+def test_repeated_ticker_is_synced_once(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    _write_csv(src / "AAA.csv", "2020-01-01", 60)
+    calls = []
+
+    class Counting(CSVFetcher):
+        def fetch(self, ticker, start, end, interval):
+            calls.append(ticker)
+            return super().fetch(ticker, start, end, interval)
+
+    df = get_price_data(["AAA", "AAA"], start="2020-01-01", end="2020-04-01",
+                        cache_dir=tmp_path / "cache", fetcher=Counting(src))
+    assert calls == ["AAA"]
+    assert list(df.columns.get_level_values(0).unique()) == ["AAA"]
+
+
+def test_with_retry_backs_off_then_succeeds():
+    attempts, sleeps = [], []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("transient")
+        return "ok"
+
+    assert with_retry(flaky, retries=3, backoff=0.5, sleep=sleeps.append) == "ok"
+    assert sleeps == [0.5, 1.0]
+
+
+def test_price_panel_matches_frame_and_shares_memory(tmp_path):
+    from quantfinlab.data import get_price_panel, to_close_series
+    from quantfinlab.panel import PricePanel
+
+    src = tmp_path / "src"
+    src.mkdir()
+    _write_csv(src / "AAA.csv", "2020-01-01", 60)
+    _write_csv(src / "BBB.csv", "2020-01-15", 40)
+    kw = dict(start="2020-01-01", end="2020-04-01", cache_dir=tmp_path / "cache",
+              fetcher=CSVFetcher(src))
+    frame = get_price_data(["AAA", "BBB"], **kw)
+    panel = get_price_panel(["AAA", "BBB"], **kw)
+
+    pd.testing.assert_frame_equal(panel.to_frame(), frame, check_names=False, check_freq=False)
+    pd.testing.assert_series_equal(to_close_series(panel, "BBB"), to_close_series(frame, "BBB"),
+                                   check_names=False, check_freq=False)
+    # field and ticker slices are views of the one array
+    assert np.shares_memory(panel.field("Close").to_numpy(), panel.data)
+    assert np.shares_memory(panel.ticker("AAA").to_numpy(), panel.data)
+
+    # drop BBB's last rows so the forward fill has something to fill and mark
+    frames = {t: frame[t].dropna(how="all") for t in ("AAA", "BBB")}
+    frames["BBB"] = frames["BBB"].iloc[:-5]
+    small = PricePanel.from_frames(frames, dtype=np.float32)
+    assert small.data.dtype == np.float32
+    assert small.filled("Close")[:, 1].sum() == 5
+    assert np.isnan(small.values("Close", filled=False)[-5:, 1]).all()
+    assert small.values("Close")[-1, 1] == small.values("Close")[-6, 1]
+    back = PricePanel.from_frame(small.to_frame())
+    np.testing.assert_array_equal(back.data, small.data.astype(np.float64))
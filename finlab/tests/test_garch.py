@@ -0,0 +1,54 @@
+import gc
+
+import numpy as np
+import pandas as pd
+
+from quantfinlab.models.garch import GarchFilter, GarchVolModel, garch_variance_path
+
+
+def test_garch_filter_matches_fitted_model():
+    rng = np.random.default_rng(0)
+    r = pd.Series(rng.standard_t(5, 600) * 0.01)
+    model = GarchVolModel().fit(r)
+    filt = GarchFilter.from_model(model)
+    for h in (1, 5, 20):
+        np.testing.assert_allclose(filt.forecast_vol(h), model.forecast_vol(h), rtol=1e-10)
+
+    # O(1) updates equal the batch recursion on the same parameters.
+    new = rng.normal(0, 0.01, 50)
+    for x in new:
+        filt.update(x)
+    omega, alpha, beta = model.params()
+    path = garch_variance_path(new, omega, alpha, beta, sigma2_0=model.next_variance())
+    np.testing.assert_allclose(filt.variance, path[-1], rtol=1e-12)
+
+
+def test_garch_variance_path_panel_shapes():
+    r = np.random.default_rng(1).normal(0, 0.01, (100, 7))
+    path = garch_variance_path(r, 1e-6, np.full(7, 0.05), 0.9)
+    assert path.shape == (101, 7)
+    filt = GarchFilter(1e-6, 0.05, 0.9, path[-1])
+    assert filt.term_structure(10).shape == (10, 7)
+    assert filt.update(r[-1]).shape == (7,)
+
+
+def _refitting_filter():
+    r = np.random.default_rng(2).normal(0, 0.01, 60)
+    filt = GarchFilter(1e-6, 0.05, 0.9, 1e-4, refit_every=60)
+    for x in r:
+        filt.update(x)
+    return filt, next(iter(filt._executor._threads))
+
+
+def test_garch_filter_refit_thread_stops():
+    filt, thread = _refitting_filter()
+    with filt:
+        pass
+    assert not thread.is_alive() and filt._executor is None
+
+    # a filter that is dropped without close() does not leave its thread behind
+    filt, thread = _refitting_filter()
+    del filt
+    gc.collect()
+    thread.join(timeout=30)
+    assert not thread.is_alive()
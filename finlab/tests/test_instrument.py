@@ -0,0 +1,47 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from quantfinlab import data, instrument
+from quantfinlab.models.garch import GarchVolModel
+
+
+class _Fetcher:
+    def fetch(self, ticker, start, end, interval):
+        idx = pd.bdate_range(start, end, inclusive="left", name="Date")
+        return pd.DataFrame({"Close": np.linspace(100, 110, len(idx))}, index=idx)
+
+
+def test_disabled_records_nothing(tmp_path):
+    instrument.reset()
+    data.get_price_data("AAA", "2020-01-01", "2020-03-01", cache_dir=tmp_path, fetcher=_Fetcher())
+    assert instrument.snapshot()["spans"] == {} and instrument.snapshot()["counters"] == {}
+
+
+def test_spans_counters_and_exports(tmp_path):
+    instrument.reset()
+    instrument.enable()
+    try:
+        kw = dict(cache_dir=tmp_path, fetcher=_Fetcher())
+        data.get_price_data(["AAA", "BBB"], "2020-01-01", "2020-03-01", **kw)
+        data.get_price_data(["AAA", "BBB"], "2020-01-01", "2020-03-01", **kw)
+        GarchVolModel().fit(pd.Series(np.random.default_rng(0).normal(0, 0.01, 300)))
+    finally:
+        instrument.disable()
+
+    snap = json.loads(instrument.to_json())
+    assert snap["counters"]["data.cache_misses"] == 2
+    assert snap["counters"]["data.cache_hits"] == 2
+    # both tickers fetched once, then read back from the store on each of the two calls:
+    # an int64 index and one float64 column per row
+    rows = len(pd.bdate_range("2020-01-01", "2020-03-01", inclusive="left"))
+    assert snap["counters"]["data.bytes_read"] == (2 + 2 * 2) * rows * 16
+    assert snap["counters"]["models.garch.fit_iterations"] > 0
+    assert snap["spans"]["data.get_price_data"]["count"] == 2
+    assert snap["spans"]["data.fetch"]["count"] == 2
+
+    prom = instrument.to_prometheus()
+    assert 'quantfinlab_span_seconds_count{span="data.fetch"} 2' in prom
+    assert "quantfinlab_data_cache_hits_total 2" in prom
+    instrument.reset()
@@ -0,0 +1,63 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from quantfinlab.backtest import backtest_signals
+from quantfinlab.live import OnlineMeanReversion, OnlineMomentum, PaperTrader, ReplayFeed, run_replay
+from quantfinlab.store import PriceStore
+from quantfinlab.strategies.mean_reversion import mean_reversion
+from quantfinlab.strategies.momentum import momentum_long_only
+
+
+def test_replay_reproduces_vectorized_backtest(tmp_path):
+    rng = np.random.default_rng(0)
+    idx = pd.bdate_range("2020-01-01", periods=400, name="Date")
+    store = PriceStore(tmp_path)
+    for t in ("AAA", "BBB", "CCC"):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(idx))))
+        store.write(t, "1d", pd.DataFrame({"Close": close}, index=idx), idx[0], idx[-1] + pd.Timedelta("1D"))
+    feed = ReplayFeed.from_store(store, ["AAA", "BBB", "CCC"], "1d")
+
+    cases = [
+        (OnlineMomentum(30, 0.15, n_series=3), lambda p: momentum_long_only(p, 30, 0.15), False),
+        (OnlineMeanReversion(20, 1.0, 0.25, n_series=3), lambda p: mean_reversion(p, 20, 1.0, 0.25), True),
+    ]
+    for strategy, batch, allow_short in cases:
+        trader = PaperTrader(strategy, feed.symbols, allow_short=allow_short)
+        updates = trader.subscribe()
+        asyncio.run(run_replay(feed, trader))
+        assert updates.qsize() == len(idx)
+        for t in feed.symbols:
+            price = feed.prices[t]
+            ref = backtest_signals(price, batch(price), allow_short=allow_short)
+            res = trader.result(t)
+            np.testing.assert_allclose(res.returns, ref.returns, atol=1e-12)
+            np.testing.assert_allclose(res.positions, ref.positions, atol=1e-12)
+            np.testing.assert_allclose(res.equity_curve, ref.equity_curve, rtol=1e-12)
+
+
+def test_slow_bounded_subscriber_drops_oldest_updates():
+    idx = pd.bdate_range("2021-01-01", periods=50)
+    prices = pd.DataFrame({"A": 100 + np.arange(50.0), "B": 50 + np.arange(50.0)}, index=idx)
+    feed = ReplayFeed(prices)
+    trader = PaperTrader(OnlineMomentum(5, 0.15, n_series=2), feed.symbols)
+    slow = trader.subscribe(maxsize=3)
+    seen = []
+
+    async def consume():
+        # takes one update per 10 bars, far slower than the feed
+        while len(seen) < 3:
+            seen.append(await slow.get())
+            for _ in range(10):
+                await asyncio.sleep(0)
+
+    async def main():
+        await asyncio.gather(run_replay(feed, trader), consume())
+
+    asyncio.run(main())
+    assert len(trader.latencies) == 50  # the trading loop ran to the end
+    assert slow.qsize() == 3 and trader.dropped > 0
+    latest = [slow.get_nowait().time for _ in range(3)]
+    assert latest == list(idx[-3:])  # the newest updates survive
+    assert seen == sorted(seen, key=lambda u: u.time)
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import torch
+
+from quantfinlab.models.lstm import (
+    LSTMConfig,
+    _SeqDataset,
+    forecast_many,
+    forecast_one,
+    load_checkpoint,
+    train_lstm,
+    walk_forward_lstm,
+    walk_forward_lstm_many,
+)
+
+
+def test_windows_do_not_cross_series_boundaries():
+    a, b = pd.Series(np.arange(30.0)), pd.Series(100 + np.arange(25.0))
+    ds = _SeqDataset([a, b], lookback=20)
+    assert len(ds) == 10 + 5
+    x, y, sid = ds[np.arange(len(ds))]
+    assert x.shape == (15, 20, 1)
+    np.testing.assert_array_equal(y.numpy(), np.r_[20:30, 120:125])
+    np.testing.assert_array_equal(x[10, :, 0].numpy(), 100 + np.arange(20.0))
+    np.testing.assert_array_equal(sid.numpy(), [0] * 10 + [1] * 5)
+
+
+def test_forecast_many_matches_forecast_one():
+    rng = np.random.default_rng(0)
+    torch.manual_seed(0)
+    universe = pd.DataFrame(rng.normal(0, 0.01, (200, 3)), columns=["A", "B", "C"])
+    model, _ = train_lstm(universe["A"], LSTMConfig(epochs=1))
+    batch = forecast_many(model, universe)
+    for k in universe:
+        assert np.isclose(batch[k], forecast_one(model, universe[k]), atol=1e-6)
+
+    multi, _ = train_lstm({k: universe[k] for k in universe}, LSTMConfig(epochs=1))
+    assert multi.series_index == {"A": 0, "B": 1, "C": 2}
+    assert forecast_many(multi, universe, batch_size=2).notna().all()
+
+
+def test_walk_forward_resumes_from_checkpoint(tmp_path):
+    rng = np.random.default_rng(1)
+    y = pd.Series(rng.normal(0, 0.01, 400), index=pd.bdate_range("2020-01-01", periods=400))
+    cfg = LSTMConfig(epochs=2, hidden_size=8, val_frac=0.2, patience=1, finetune_epochs=2)
+    kw = dict(cfg=cfg, min_train=200, refit_every=30, seed=0)
+    full = walk_forward_lstm(y, **kw)
+    assert full.index.equals(y.index[200:]) and full.notna().all()
+
+    # an interrupted run (less data so far) picks up where its checkpoint left off
+    ckpt = tmp_path / "AAA.pt"
+    walk_forward_lstm(y.iloc[:300], checkpoint=ckpt, **kw)
+    model, opt_state, meta = load_checkpoint(ckpt)
+    assert meta["position"] == 290 and opt_state is not None
+    pd.testing.assert_series_equal(walk_forward_lstm(y, checkpoint=ckpt, **kw), full)
+
+    # warm start keeps the architecture; the many-ticker runner collects failures
+    tuned, _ = train_lstm(y, cfg, init=model)
+    assert tuned is not model and tuned.lstm.hidden_size == 8
+    out = walk_forward_lstm_many({"A": y, "B": y.iloc[:150]}, n_jobs=1, **kw)
+    assert list(out.columns) == ["A"] and set(out.attrs["failed"]) == {"B"}
+    pd.testing.assert_series_equal(out["A"], full.rename("A"))
+
+
+def test_walk_forward_trains_on_every_held_out_tail(monkeypatch):
+    from quantfinlab.models import lstm
+
+    rng = np.random.default_rng(2)
+    y = pd.Series(rng.normal(0, 0.01, 330), index=pd.bdate_range("2020-01-01", periods=330))
+    cfg = LSTMConfig(epochs=1, hidden_size=4, val_frac=0.2, patience=1, finetune_epochs=1)
+    trained, calls = set(), []
+    real = lstm._train
+
+    def spy(series, cfg, *args, **kw):
+        out = real(series, cfg, *args, **kw)
+        targets = series.index[cfg.lookback:]
+        trained.update(targets[:len(targets) - out[3]])
+        calls.append((targets, out[3]))
+        return out
+
+    monkeypatch.setattr(lstm, "_train", spy)
+    walk_forward_lstm(y, cfg, min_train=200, refit_every=30, seed=0)
+    # only the last refit's held-out tail, with no refit after it, goes untrained
+    targets, held = calls[-1]
+    assert len(calls) == 5 and held > 0
+    seen = y.index[cfg.lookback:y.index.get_loc(targets[-1]) + 1]
+    assert seen.difference(trained).equals(targets[len(targets) - held:])
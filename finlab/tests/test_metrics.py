@@ -1,7 +1,20 @@
 import numpy as np
 import pandas as pd
 
-from quantfinlab.metrics import cagr, sharpe_ratio, sortino_ratio, max_drawdown, hit_ratio, calmar_ratio
+from quantfinlab.metrics import (
+    cagr,
+    calmar_ratio,
+    hit_ratio,
+    max_drawdown,
+    rolling_max_drawdown,
+    rolling_sharpe,
+    rolling_stats,
+    rolling_table,
+    sharpe_ratio,
+    sortino_ratio,
+    summary_stats,
+    summary_table,
+)
 
 
 def test_metrics_run_without_error():
@@ -14,3 +27,65 @@ def test_metrics_run_without_error():
     assert not np.isnan(max_drawdown(eq))
     assert not np.isnan(hit_ratio(r))
     assert not np.isnan(calmar_ratio(r, eq))
+
+
+def test_summary_table_matches_scalar_metrics():
+    rng = np.random.default_rng(1)
+    r = pd.DataFrame(rng.normal(0.0002, 0.01, (500, 4)), columns=list("abcd"))
+    r.iloc[::13, 1] = np.nan
+    eq = (1 + r.fillna(0.0)).cumprod()
+    table = summary_table(r, eq)
+    assert list(table.index) == list("abcd")
+    for c in r:
+        expected = {
+            "CAGR": cagr(eq[c]),
+            "Sharpe": sharpe_ratio(r[c]),
+            "Sortino": sortino_ratio(r[c]),
+            "MaxDrawdown": max_drawdown(eq[c]),
+            "Calmar": calmar_ratio(r[c], eq[c]),
+            "HitRatio": hit_ratio(r[c]),
+        }
+        for k, v in expected.items():
+            np.testing.assert_allclose(table.loc[c, k], v, rtol=1e-12)
+    # Reference values computed the pandas way for one column.
+    x = r["b"].dropna()
+    np.testing.assert_allclose(table.loc["b", "Sharpe"], x.mean() * 252 / (x.std() * np.sqrt(252)))
+    np.testing.assert_allclose(table.loc["b", "Sortino"], x.mean() * 252 / (x[x < 0].std() * np.sqrt(252)))
+    np.testing.assert_allclose(table.loc["b", "MaxDrawdown"], (eq["b"] / eq["b"].cummax() - 1).min())
+
+
+def test_rolling_stats_match_summary_stats_on_each_window():
+    rng = np.random.default_rng(2)
+    r = rng.normal(0.0003, 0.01, (400, 3))
+    r[::11, 1] = np.nan
+    eq = np.cumprod(1 + np.nan_to_num(r), axis=0)
+    stats = rolling_stats(r, windows=[5, 63], min_periods=3)
+    for w, res in stats.items():
+        for t in [0, 1, 2, 4, 62, 63, 64, 125, 126, 200, 399]:
+            lo = max(0, t - w + 1)
+            n = (~np.isnan(r[lo:t + 1])).sum(axis=0)
+            expected = summary_stats(r[lo:t + 1], eq[lo:t + 1])
+            for m, v in expected.items():
+                np.testing.assert_allclose(res[m][t], np.where(n >= 3, v, np.nan), rtol=1e-8)
+    # Against pandas' rolling windows on labelled data.
+    s = pd.Series(r[:, 0])
+    ref = s.rolling(63).apply(lambda x: x.mean() / x.std(ddof=1) * np.sqrt(252), raw=True)
+    pd.testing.assert_series_equal(rolling_sharpe(s, 63), ref, rtol=1e-8)
+    np.testing.assert_allclose(rolling_table(s, 63)[(63, "Sharpe")], ref, rtol=1e-8)
+    e = pd.Series(eq[:, 2])
+    ref = e.rolling(50).apply(lambda x: (x / np.maximum.accumulate(x)).min() - 1, raw=True)
+    pd.testing.assert_series_equal(rolling_max_drawdown(e, 50), ref, rtol=1e-12)
+    table = rolling_table(pd.DataFrame(r, columns=list("abc")), windows=(21, 63))
+    assert table.shape == (400, 2 * 7 * 3)
+    np.testing.assert_allclose(table[(21, "HitRatio", "c")],
+                               pd.Series(r[:, 2] > 0).rolling(21).mean())
+
+
+def test_rolling_windows_longer_than_the_series():
+    r = pd.Series(np.random.default_rng(3).normal(0.0003, 0.01, 200))
+    assert rolling_sharpe(r, 252).isna().all() and rolling_sharpe(r, 401).isna().all()
+    # a window covering the whole history sees exactly what a window of its length sees
+    long = rolling_table(r, (252, 401), min_periods=2)
+    full = rolling_table(r, 200, min_periods=2)
+    for w in (252, 401):
+        np.testing.assert_allclose(long[w].to_numpy(), full[200].to_numpy(), rtol=1e-12)
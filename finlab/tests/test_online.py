@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantfinlab import features
+from quantfinlab.online import OnlineEMA, OnlineRollingVol, OnlineRSI, OnlineSMA, OnlineZScore
+
+CASES = [
+    (lambda: OnlineSMA(10), lambda p: features.sma(p, 10)),
+    (lambda: OnlineEMA(10), lambda p: features.ema(p, 10)),
+    (lambda: OnlineRollingVol(20), lambda p: features.rolling_vol(p, 20)),
+    (lambda: OnlineZScore(15), lambda p: features.zscore(p, 15)),
+    (lambda: OnlineRSI(14), lambda p: features.rsi(p, 14)),
+]
+
+
+def _price(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.Series(100 * np.cumprod(1 + rng.normal(0, 0.01, n)))
+
+
+@pytest.mark.parametrize("make, batch", CASES)
+def test_online_matches_batch(make, batch):
+    price = _price()
+    expected = batch(price).to_numpy()
+    # Updating bar by bar from scratch ...
+    ind = make()
+    got = np.array([ind.update(x) for x in price])
+    np.testing.assert_allclose(got, expected, rtol=1e-9, atol=1e-9)
+    # ... and seeding from history then continuing give the batch values.
+    ind = make().seed(price[:250])
+    got = np.array([ind.update(x) for x in price[250:]])
+    np.testing.assert_allclose(got, expected[250:], rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize("make, batch", CASES)
+def test_online_updates_many_symbols(make, batch):
+    panel = pd.DataFrame({i: _price(seed=i) for i in range(5)})
+    ind = make().seed(panel.iloc[:300])
+    for _, row in panel.iloc[300:].iterrows():
+        out = ind.update(row.to_numpy())
+    expected = [batch(panel[c]).iloc[-1] for c in panel]
+    np.testing.assert_allclose(out, expected, rtol=1e-9, atol=1e-9)
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from quantfinlab.backtest import backtest_signals
+from quantfinlab.plotting import downsample, render_reports
+
+
+def _walk(n=20_000):
+    rng = np.random.default_rng(0)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.002, n))),
+                     index=pd.date_range("2021-01-01", periods=n, freq="min"))
+
+
+def test_downsample_keeps_shape():
+    s = _walk()
+    for method in ("lttb", "minmax"):
+        d = downsample(s, 500, method)
+        assert len(d) <= 502 and d.index.is_monotonic_increasing
+        assert d.index[0] == s.index[0] and d.index[-1] == s.index[-1]
+        assert d.index.isin(s.index).all()
+    mm = downsample(s, 500, "minmax")
+    assert mm.min() == s.min() and mm.max() == s.max()
+    assert downsample(s.iloc[:100], 500).equals(s.iloc[:100])
+
+
+def test_render_reports_headless(tmp_path):
+    price = _walk()
+    bt = backtest_signals(price, (price > price.rolling(200).mean()).astype(float))
+    paths = render_reports({"a": bt, "b": bt}, tmp_path, prices={"a": price}, max_points=300, n_jobs=1)
+    assert [p.rsplit("_", 1)[-1] for p in paths["a"]] == ["equity.png", "drawdown.png", "signals.html"]
+    assert len(paths["b"]) == 2
+    for p in paths["a"] + paths["b"]:
+        assert (tmp_path / p.split("/")[-1]).stat().st_size > 0
+    assert (tmp_path / "a_signals.html").stat().st_size < 200_000
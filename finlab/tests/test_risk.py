@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantfinlab.risk import RollingCovariance, covariance, portfolio_vol, vol_target_weights
+
+
+def _returns(n=400, k=6, seed=0):
+    rng = np.random.default_rng(seed)
+    mix = rng.normal(size=(k, k)) * 0.005
+    return pd.DataFrame(rng.normal(size=(n, k)) @ mix + 2e-4,
+                        index=pd.bdate_range("2020-01-01", periods=n), columns=list("abcdef")[:k])
+
+
+def test_rolling_and_ewma_match_pandas():
+    r = _returns()
+    cov = covariance(r, window=50, every=7)
+    assert cov.packed.dtype == np.float32 and cov.packed.shape == (len(cov), 21)
+    for i in (0, len(cov) // 2, len(cov) - 1):
+        ref = r.loc[:cov.index[i]].iloc[-50:].cov()
+        assert np.allclose(cov.matrix(i), ref, rtol=1e-5, atol=1e-12)
+
+    ewma = covariance(r, method="ewma", halflife=10)
+    last = ewma.index[-1]
+    ref = np.array([[(r[a] * r[b]).ewm(halflife=10).mean().loc[last] for b in r] for a in r])
+    assert np.allclose(ewma.dense(last), ref, rtol=1e-5, atol=1e-12)
+    np.testing.assert_array_equal(ewma.dense(-1), ewma.dense(last))
+    np.testing.assert_array_equal(ewma.dense(-len(ewma)), ewma.dense(0))
+    with pytest.raises(IndexError):
+        ewma.dense(len(ewma))
+    with pytest.raises(KeyError):
+        ewma.dense("1990-01-01")
+
+
+def test_ledoit_wolf_intensity_and_long_run_stability():
+    r = _returns(n=3000).to_numpy()
+    est = RollingCovariance(r.shape[1], window=40)
+    for x in r:
+        est.update(x)
+    assert np.allclose(est.covariance(), np.cov(r[-40:].T), rtol=1e-10, atol=1e-16)
+
+    x = r[-40:] - r[-40:].mean(axis=0)
+    n, p = x.shape
+    emp = x.T @ x / n
+    mu = np.trace(emp) / p
+    beta = ((x ** 2).T @ (x ** 2)).sum() / n - (emp ** 2).sum()
+    delta = (emp ** 2).sum() - p * mu ** 2
+    assert np.isclose(est.shrinkage_intensity(), min(beta / n, delta) / delta)
+
+
+def test_vol_target_weights_hit_target():
+    r = _returns()
+    w = pd.DataFrame(1 / r.shape[1], index=r.index, columns=r.columns)
+    vol = portfolio_vol(r, w, window=60)
+    assert vol.iloc[:59].isna().all()
+    assert np.isclose(vol.iloc[-1], np.sqrt(w.iloc[-1] @ r.iloc[-60:].cov() @ w.iloc[-1] * 252))
+    scaled = vol_target_weights(w, r, target=0.02, window=60)
+    assert np.allclose(portfolio_vol(r, scaled, window=60).iloc[59:], 0.02)
+    assert (scaled.iloc[:59] == w.iloc[:59]).all().all()
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from quantfinlab import data
+from quantfinlab.store import PriceStore
+
+
+def _bars(start, end):
+    idx = pd.bdate_range(start, end, inclusive="left", name="Date")
+    close = 100 + np.arange(len(idx), dtype=float)
+    return pd.DataFrame({"Open": close, "Close": close, "Adj Close": close, "Volume": 1e6}, index=idx)
+
+
+def test_store_appends_and_slices(tmp_path):
+    store = PriceStore(tmp_path)
+    store.merge("AAA", "1d", _bars("2020-01-01", "2020-03-01"), "2020-01-01", "2020-03-01")
+    store.merge("AAA", "1d", _bars("2020-03-01", "2020-04-01"), "2020-03-01", "2020-04-01")
+    store.merge("AAA", "1d", _bars("2019-12-01", "2020-01-01"), "2019-12-01", "2020-01-01")
+
+    full = store.read("AAA", "1d")
+    assert full.index.is_monotonic_increasing and full.index.is_unique
+    assert full.index[0] == pd.Timestamp("2019-12-02")
+    assert store.coverage("AAA", "1d") == (pd.Timestamp("2019-12-01"), pd.Timestamp("2020-04-01"))
+
+    sub = store.read("AAA", "1d", "2020-02-03", "2020-02-10")
+    assert list(sub.index) == list(pd.bdate_range("2020-02-03", "2020-02-07"))
+    assert store.missing("AAA", "1d", "2020-01-15", "2020-05-01") == [
+        (pd.Timestamp("2020-04-01"), pd.Timestamp("2020-05-01"))
+    ]
+
+
+class _RecordingFetcher:
+    def __init__(self):
+        self.calls = []
+
+    def fetch(self, ticker, start, end, interval):
+        self.calls.append((start, end))
+        return _bars(start, end)
+
+
+def test_get_price_data_fetches_only_missing_ranges(tmp_path):
+    fetcher = _RecordingFetcher()
+    calls = fetcher.calls
+    kw = dict(cache_dir=tmp_path, fetcher=fetcher)
+    df1 = data.get_price_data("AAA", start="2020-01-01", end="2020-06-01", **kw)
+    df2 = data.get_price_data("AAA", start="2020-02-01", end="2020-07-01", **kw)
+    assert calls == [
+        (pd.Timestamp("2020-01-01"), pd.Timestamp("2020-06-01")),
+        (pd.Timestamp("2020-06-01"), pd.Timestamp("2020-07-01")),
+    ]
+    assert df2.index[0] == pd.Timestamp("2020-02-03")
+    pd.testing.assert_frame_equal(df1.loc["2020-02-03":], df2.loc[:"2020-05-29"], check_freq=False)
+
+
+def test_empty_or_unpublished_bars_are_fetched_again(tmp_path):
+    store = PriceStore(tmp_path)
+    store.merge("AAA", "1d", _bars("2020-01-01", "2020-03-01"), "2020-01-01", "2020-03-01")
+    # an empty response (e.g. a transient source failure) does not mark the range fetched
+    store.merge("AAA", "1d", _bars("2020-03-01", "2020-03-01"), "2020-03-01", "2020-04-01")
+    assert store.missing("AAA", "1d", "2020-01-01", "2020-04-01") == [
+        (pd.Timestamp("2020-03-01"), pd.Timestamp("2020-04-01"))
+    ]
+
+    # near today, coverage stops at the last bar actually returned
+    today = pd.Timestamp.today().normalize()
+    recent = PriceStore(tmp_path / "recent")
+    recent.merge("AAA", "1d", _bars(today - pd.Timedelta(days=30), today - pd.Timedelta(days=3)),
+                 today - pd.Timedelta(days=30), today)
+    last = recent.read("AAA", "1d").index[-1]
+    assert recent.missing("AAA", "1d", today - pd.Timedelta(days=30), today) == [(last, today)]
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantfinlab.features import zscore
+from quantfinlab.strategies.mean_reversion import (
+    _ROW_SCAN_MIN_COLUMNS,
+    _hysteresis_ffill,
+    hysteresis_positions,
+    mean_reversion,
+    mean_reversion_panel,
+)
+
+
+def _reference_mean_reversion(price, window, entry_z, exit_z):
+    # The original implementation, with replace(0, method="ffill") spelled for pandas >= 2.
+    z = zscore(price, window=window)
+    pos = pd.Series(0.0, index=price.index)
+    pos[z <= -entry_z] = 1.0
+    pos[z >= entry_z] = -1.0
+    pos = pos.mask(pos == 0.0).ffill().fillna(0.0)
+    pos[z.abs() <= exit_z] = 0.0
+    return pos.mask(pos == 0.0).ffill().fillna(0.0)
+
+
+@pytest.mark.parametrize("entry_z, exit_z", [(1.0, 0.25), (0.5, 0.75), (2.0, 0.0)])
+def test_mean_reversion_preserves_original_semantics(entry_z, exit_z):
+    rng = np.random.default_rng(7)
+    price = pd.Series(100 * np.cumprod(1 + rng.normal(0, 0.01, 1000)))
+    got = mean_reversion(price, window=20, entry_z=entry_z, exit_z=exit_z)
+    expected = _reference_mean_reversion(price, 20, entry_z, exit_z)
+    np.testing.assert_array_equal(got.to_numpy(), expected.to_numpy())
+
+
+def test_hysteresis_over_assets_and_parameter_sets():
+    rng = np.random.default_rng(8)
+    prices = pd.DataFrame(100 * np.cumprod(1 + rng.normal(0, 0.01, (500, 3)), axis=0))
+    panel = mean_reversion_panel(prices, window=15, entry_z=1.2, exit_z=0.3)
+    for c in prices:
+        pd.testing.assert_series_equal(
+            panel[c], mean_reversion(prices[c], 15, 1.2, 0.3), check_names=False
+        )
+
+    z = np.tile(zscore(prices[0], 15).to_numpy()[:, None], (1, 4))
+    entry, exit_ = np.array([0.5, 1.0, 1.5, 2.0]), np.array([0.1, 0.2, 0.3, 0.4])
+    pos = hysteresis_positions(z, entry, exit_)
+    for k in range(4):
+        expected = mean_reversion(prices[0], 15, entry[k], exit_[k])
+        np.testing.assert_array_equal(pos[:, k], expected.to_numpy())
+
+
+def test_hysteresis_wide_row_scan_matches_narrow_path():
+    rng = np.random.default_rng(10)
+    prices = pd.DataFrame(100 * np.cumprod(1 + rng.normal(0, 0.01, (400, 8)), axis=0))
+    z = np.column_stack([zscore(prices[c], 15).to_numpy() for c in prices])
+    # 8 assets x 40 (entry, exit) pairs = 320 columns, above the row-scan threshold
+    exits = (0.0, 0.1, 0.25, 0.4, 0.5, 0.6, 0.75, 0.9)
+    pairs = [(e, x) for e in (0.5, 1.0, 1.5, 2.0, 2.5) for x in exits]
+    wide = np.tile(z, (1, len(pairs)))
+    entry = np.repeat([e for e, _ in pairs], 8)
+    exit_ = np.repeat([x for _, x in pairs], 8)
+    assert wide.shape[1] >= _ROW_SCAN_MIN_COLUMNS
+    pos = hysteresis_positions(wide, entry, exit_)
+    np.testing.assert_array_equal(pos, _hysteresis_ffill(wide, entry, exit_))
+    for j in range(0, wide.shape[1], 7):
+        expected = mean_reversion(prices[j % 8], 15, entry[j], exit_[j])
+        np.testing.assert_array_equal(pos[:, j], expected.to_numpy())
+
+
+def test_cross_sectional_ranks_and_portfolios():
+    from quantfinlab.backtest import backtest_panel
+    from quantfinlab.strategies.cross_sectional import (
+        cross_sectional_rank,
+        quantile_weights,
+        rank_weights,
+        top_k_weights,
+    )
+
+    rng = np.random.default_rng(9)
+    feature = pd.DataFrame(np.round(rng.normal(size=(200, 30)), 1))
+    feature[feature.abs() > 1.8] = np.nan
+    feature.iloc[3] = np.nan
+    for pct in (False, True):
+        pd.testing.assert_frame_equal(cross_sectional_rank(feature, pct=pct, ascending=False),
+                                      feature.rank(axis=1, pct=pct, ascending=False))
+
+    w = quantile_weights(feature, quantiles=5)
+    bucket = np.floor((feature.rank(axis=1) - 1) * 5 / feature.count(axis=1).to_numpy()[:, None])
+    assert ((w > 0) == (bucket == 4)).all().all() and ((w < 0) == (bucket == 0)).all().all()
+    assert np.allclose(w.sum(axis=1), 0) and (w.iloc[3] == 0).all()
+    assert np.allclose(w.abs().sum(axis=1).drop(3), 1.0)
+
+    clean = pd.DataFrame(rng.normal(size=(50, 30)))
+    top = top_k_weights(clean, k=4)
+    for i in range(len(clean)):
+        assert set(clean.iloc[i].nlargest(4).index) == set(top.columns[top.iloc[i] > 0])
+        assert set(clean.iloc[i].nsmallest(4).index) == set(top.columns[top.iloc[i] < 0])
+    held = rank_weights(clean, rebalance=10)
+    assert np.allclose(held.sum(axis=1), 0) and held.iloc[10:20].eq(held.iloc[10], axis=1).all().all()
+
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (50, 30)), axis=0))
+    result = backtest_panel(pd.DataFrame(prices), top, allow_short=True)
+    assert np.isfinite(result.returns).all()
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+from quantfinlab.backtest import backtest_signals
+from quantfinlab.strategies.mean_reversion import mean_reversion
+from quantfinlab.strategies.momentum import momentum_long_only
+from quantfinlab.sweep import rolling_mean_std, sweep_exits, sweep_mean_reversion, sweep_momentum
+
+
+def _price(n=800, seed=3):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range("2015-01-01", periods=n)
+    return pd.Series(100 * np.cumprod(1 + rng.normal(0.0003, 0.012, n)), index=idx)
+
+
+def test_rolling_mean_std_matches_pandas():
+    price = _price()
+    mean, std = rolling_mean_std(price.to_numpy(), [5, 20])
+    for i, w in enumerate([5, 20]):
+        np.testing.assert_allclose(mean[i], price.rolling(w).mean(), rtol=1e-10)
+        np.testing.assert_allclose(std[i], price.rolling(w).std(), rtol=1e-8)
+
+
+def test_sweep_momentum_matches_strategy_backtest():
+    price = _price()
+    table = sweep_momentum(price, lookbacks=[20, 50], vol_targets=[0.1, 0.2])
+    assert len(table) == 4
+    for row in table.itertuples():
+        sig = momentum_long_only(price, row.lookback, row.vol_target)
+        expected = backtest_signals(price, sig).summary()
+        for k, v in expected.items():
+            np.testing.assert_allclose(getattr(row, k), v, rtol=1e-9, atol=1e-12)
+
+
+def test_sweep_mean_reversion_matches_strategy_backtest():
+    price = _price()
+    table = sweep_mean_reversion(price, windows=[10, 30], entry_zs=[1.0, 2.0], exit_zs=[0.25])
+    for row in table.itertuples():
+        sig = mean_reversion(price, row.window, row.entry_z, row.exit_z)
+        expected = backtest_signals(price, sig, allow_short=True).summary()
+        for k, v in expected.items():
+            np.testing.assert_allclose(getattr(row, k), v, rtol=1e-9, atol=1e-12)
+
+
+def test_sweep_exits_matches_backtest_with_exits():
+    price = _price()
+    sig = mean_reversion(price, window=20, entry_z=1.0, exit_z=0.25)
+    table = sweep_exits(price, sig, [None, 0.02], [None, 0.05], [0.03], allow_short=True,
+                        chunk_size=3)
+    assert len(table) == 4
+    for _, row in table.iterrows():
+        kw = {k: None if np.isnan(row[k]) else row[k]
+              for k in ("stop_loss", "take_profit", "trailing_stop")}
+        ref = backtest_signals(price, sig, allow_short=True, **kw).summary()
+        for k, v in ref.items():
+            np.testing.assert_allclose(row[k], v, rtol=1e-10)
+    # a universe: one row per combination and asset
+    prices = pd.concat({"a": price, "b": _price(seed=4)}, axis=1)
+    signals = pd.concat({"a": sig, "b": mean_reversion(prices["b"])}, axis=1)
+    universe = sweep_exits(prices, signals, [0.02, 0.05], allow_short=True)
+    assert list(universe["asset"]) == ["a", "b", "a", "b"]
+    ref = backtest_signals(price, sig, allow_short=True, stop_loss=0.02).summary()
+    np.testing.assert_allclose(universe.loc[0, "Sharpe"], ref["Sharpe"], rtol=1e-10)
+
+
+def test_sweep_exits_sizes_chunks_by_cells(monkeypatch):
+    from quantfinlab import sweep
+
+    sizes = []
+    real = sweep._run_chunks
+
+    def spy(fn, combos, args, chunk_size, n_jobs):
+        sizes.append(chunk_size)
+        return real(fn, combos, args, chunk_size, n_jobs)
+
+    monkeypatch.setattr(sweep, "_run_chunks", spy)
+    monkeypatch.setattr(sweep, "_EXIT_BLOCK_CELLS", 10_000)
+    prices = pd.concat({k: _price(seed=k) for k in range(5)}, axis=1)
+    signals = prices.pct_change(20).gt(0).astype(float)
+    grid = ([None, 0.02, 0.05], [None, 0.1])
+    table = sweep_exits(prices, signals, *grid)
+    assert sizes == [2]  # 10,000 cells // (800 dates x 5 assets)
+    pd.testing.assert_frame_equal(table, sweep_exits(prices, signals, *grid, chunk_size=6))